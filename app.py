@@ -2,24 +2,41 @@ import math
 import re
 import os
 import sys
+import time
+from functools import lru_cache, partial
 
 import streamlit as st
 from streamlit.runtime.scriptrunner import get_script_run_ctx
 
+from catalog import get_loader
+from courses import CourseIndex, canonical_code
+from deadline import DEFAULT_REQUEST_SECONDS, Deadline
+from equivalencies import get_equivalencies
 from optimizer import (
+    DEFAULT_COURSES_PER_SEMESTER,
+    DEFAULT_LAST_SEMESTER,
+    SearchIndex,
+    catalog_course_codes,
     clean_notes,
     format_course,
-    major_restriction_applies,
+    plan_semesters,
+    rank_minors,
     residency_requirement,
-    section_blocks_to_result,
-    sort_minor_results,
-    summarize_minor,
 )
-from scraper import (
-    _get_requirements_from_minor_page,
-    get_majors_list,
-    get_minor_list,
+from prereqs import Scheduler, get_prereq_graph, rank_by_finish
+from profiling import DEFAULT_PROFILE_DIR, profile_call
+from refresher import DEFAULT_FOLLOW_SECONDS, DEFAULT_REFRESH_SECONDS, CatalogRefresher
+from result_cache import (
+    DEFAULT_MAX_ENTRIES,
+    ResultCache,
+    load_profiles,
+    profile_key,
+    rank_catalog,
+    ranked_results,
+    warm_in_background,
 )
+from share import QUERY_PARAM, decode_profile, encode_profile
+from work_queue import Overloaded, get_work_queue
 
 st.set_page_config(
     page_title="Purdue University Minor Optimizer",
@@ -39,6 +56,444 @@ st.set_page_config(
 )
 
 
+# Styles for the results page, built once per process.
+RESULTS_CSS = """
+<style>
+.boilerplate-wrap {
+    margin-top: 0.75rem;
+}
+.rank-rail {
+    display: grid;
+    grid-template-columns: repeat(auto-fit, minmax(180px, 1fr));
+    gap: 0.75rem;
+    margin: 0.75rem 0 1.5rem 0;
+}
+.rank-card {
+    border-radius: 18px;
+    padding: 0.9rem 1rem;
+    border: 1px solid rgba(255,255,255,0.08);
+    background: linear-gradient(180deg, rgba(255,255,255,0.06), rgba(255,255,255,0.03));
+    box-shadow: 0 12px 30px rgba(0,0,0,0.18);
+}
+.rank-card.active {
+    border-color: rgba(255,184,0,0.6);
+    box-shadow: 0 18px 36px rgba(255,184,0,0.18);
+}
+.rank-num {
+    font-size: 0.8rem;
+    text-transform: uppercase;
+    letter-spacing: 0.08em;
+    opacity: 0.75;
+}
+.rank-title {
+    font-size: 1rem;
+    font-weight: 700;
+    margin-top: 0.35rem;
+}
+.rank-sub {
+    font-size: 0.88rem;
+    opacity: 0.75;
+    margin-top: 0.25rem;
+}
+.minor-card {
+    border-radius: 28px;
+    padding: 1.5rem;
+    background: radial-gradient(circle at top right, rgba(255,184,0,0.16), transparent 28%),
+                linear-gradient(180deg, rgba(20,20,20,0.96), rgba(8,8,8,0.98));
+    border: 1px solid rgba(255,255,255,0.08);
+    box-shadow: 0 24px 60px rgba(0,0,0,0.35);
+    margin: 0.5rem 0 1rem 0;
+}
+.minor-card h2 {
+    margin: 0;
+    color: #fff;
+    font-size: 2rem;
+    line-height: 1.15;
+}
+.minor-card .meta-row {
+    display: flex;
+    flex-wrap: wrap;
+    gap: 0.5rem;
+    margin-top: 0.85rem;
+    margin-bottom: 0.8rem;
+}
+.pill {
+    display: inline-flex;
+    align-items: center;
+    padding: 0.35rem 0.7rem;
+    border-radius: 999px;
+    background: rgba(255,255,255,0.08);
+    color: #fff;
+    font-size: 0.8rem;
+    font-weight: 600;
+}
+.pill.gold { background: rgba(255,184,0,0.18); color: #ffd77a; }
+.pill.green { background: rgba(90,200,120,0.18); color: #8ef0ae; }
+.pill.blue { background: rgba(90,155,255,0.18); color: #9fc3ff; }
+.progress-shell {
+    width: 100%;
+    height: 12px;
+    border-radius: 999px;
+    background: rgba(255,255,255,0.08);
+    overflow: hidden;
+    margin: 0.75rem 0 1rem 0;
+}
+.progress-fill {
+    height: 100%;
+    border-radius: 999px;
+    background: linear-gradient(90deg, #ffb800, #ffd77a);
+}
+.stats-grid {
+    display: grid;
+    grid-template-columns: repeat(auto-fit, minmax(140px, 1fr));
+    gap: 0.75rem;
+    margin-top: 0.8rem;
+    margin-bottom: 1rem;
+}
+.stat-card {
+    border-radius: 18px;
+    padding: 0.9rem 1rem;
+    background: rgba(255,255,255,0.05);
+    border: 1px solid rgba(255,255,255,0.08);
+}
+.stat-label {
+    font-size: 0.75rem;
+    text-transform: uppercase;
+    letter-spacing: 0.08em;
+    opacity: 0.65;
+}
+.stat-value {
+    font-size: 1.35rem;
+    font-weight: 800;
+    margin-top: 0.2rem;
+    color: #fff;
+}
+.section-card {
+    border-radius: 18px;
+    padding: 0.9rem 1rem;
+    margin: 0.6rem 0;
+    background: rgba(255,255,255,0.05);
+    border: 1px solid rgba(255,255,255,0.08);
+}
+.section-card.complete { border-color: rgba(90,200,120,0.35); }
+.section-card.partial { border-color: rgba(255,184,0,0.35); }
+.section-card.manual { border-color: rgba(120,160,255,0.35); }
+.section-title { font-weight: 700; color: #fff; }
+.section-detail { margin-top: 0.35rem; opacity: 0.88; }
+</style>
+"""
+
+
+@st.cache_resource
+def get_refresher():
+    # One refresher per server process: warm-starts from the snapshot file and
+    # keeps the catalog fresh so no user request waits on scraping.
+    return CatalogRefresher(
+        interval=float(os.environ.get("MINOR_OPTIMIZER_REFRESH_SECONDS", DEFAULT_REFRESH_SECONDS)),
+        snapshot_path=os.environ.get("MINOR_OPTIMIZER_SNAPSHOT", "catalog_snapshot.json"),
+        store_path=os.environ.get("MINOR_OPTIMIZER_STORE"),
+        compiled_path=os.environ.get("MINOR_OPTIMIZER_COMPILED"),
+        follow=os.environ.get("MINOR_OPTIMIZER_FOLLOW") == "1",
+        follow_interval=float(os.environ.get("MINOR_OPTIMIZER_FOLLOW_SECONDS", DEFAULT_FOLLOW_SECONDS)),
+    ).start()
+
+
+@st.cache_resource
+def get_result_cache():
+    return ResultCache(int(os.environ.get("MINOR_OPTIMIZER_RESULT_CACHE_SIZE", DEFAULT_MAX_ENTRIES)))
+
+
+@st.cache_resource(max_entries=8)
+def get_search_index(catalog_version, _catalog):
+    # Keyed by version; catalog year views have versions of their own.
+    return SearchIndex(_catalog.minors)
+
+
+@st.cache_resource(max_entries=8)
+def get_course_index(catalog_version, _catalog):
+    # Courses the minors list plus their prerequisites, titled where the
+    # prerequisite scrape found a title.
+    graph = get_prereq_graph()
+    codes = catalog_course_codes(_catalog.minors) | set(graph.codes())
+    return CourseIndex(codes, {code: graph.title(code) for code in codes})
+
+
+@st.cache_resource
+def get_common_profiles():
+    path = os.environ.get("MINOR_OPTIMIZER_PROFILES", "common_profiles.json")
+    return load_profiles(path) if os.path.exists(path) else []
+
+
+def apply_shared_profile():
+    # Load the profile from a shared link once; later reruns keep the user's edits.
+    token = st.query_params.get(QUERY_PARAM)
+    if not token or token == st.session_state.get("shared_profile"):
+        return
+    st.session_state.shared_profile = token
+    try:
+        profile = decode_profile(token)
+    except ValueError:
+        st.warning("This link's course profile could not be read.")
+        return
+    st.session_state.courses = profile["courses"]
+    st.session_state.current_sem = profile["current_sem"]
+    st.session_state.major = profile["major"]
+    st.session_state.study_abroad = "study_abroad" in profile["experiences"]
+    st.session_state.intl_internship = "intl_internship" in profile["experiences"]
+    if profile["year"]:
+        st.session_state.catalog_year = profile["year"]
+    else:
+        st.session_state.pop("catalog_year", None)
+    st.session_state.optimize = True
+
+
+def profiling_requested():
+    # Profiling is on for every request via the environment, or per request for
+    # admins who pass ?profile=<MINOR_OPTIMIZER_ADMIN_TOKEN>.
+    if os.environ.get("MINOR_OPTIMIZER_PROFILE") == "1":
+        return True
+    token = os.environ.get("MINOR_OPTIMIZER_ADMIN_TOKEN")
+    return bool(token) and st.query_params.get("profile") == token
+
+
+def load_and_rank(catalog, taken, major, cached=True):
+    """
+    Return (results, skipped_minors, not_loaded), or None if no catalog could be
+    loaded at all. `cached=False` always scores the catalog, so a profiled
+    request measures the ranking and not a cache lookup.
+    """
+    if catalog is not None:
+        if cached:
+            results, skipped_minors = ranked_results(get_result_cache(), catalog, taken, major)
+        else:
+            results, skipped_minors = rank_catalog(catalog, taken, major)
+        return results, skipped_minors, []
+
+    # Nothing published yet (cold start without a snapshot): rank whatever
+    # loads within the request budget rather than waiting for the full scrape.
+    deadline = Deadline(float(os.environ.get("MINOR_OPTIMIZER_DEADLINE_SECONDS", DEFAULT_REQUEST_SECONDS)))
+    try:
+        minors, not_loaded = get_loader().minors_within(deadline)
+    except Exception:
+        return None
+    results, skipped_minors = rank_minors(minors, taken, major)
+    return results, skipped_minors, not_loaded
+
+
+# Rendered HTML is cached on exactly the result values it shows, so a card is
+# rebuilt only when its minor's result changes.
+@lru_cache(maxsize=1024)
+def rank_card_html(rank, name, percent):
+    active_class = " active" if rank == 1 else ""
+    return f"""
+    <div class="rank-card{active_class}">
+        <div class="rank-num">Rank {rank}</div>
+        <div class="rank-title">{name}</div>
+        <div class="rank-sub">{percent:.1f}% complete</div>
+    </div>
+    """
+
+
+@lru_cache(maxsize=1024)
+def minor_card_html(rank, name, percent, completed, total, finish_label):
+    finish_pill = f'<span class="pill">{finish_label}</span>' if finish_label else ""
+    return f"""
+    <div class="minor-card">
+        <div class="meta-row">
+            <span class="pill gold">Rank #{rank}</span>
+            <span class="pill green">{percent:.1f}% complete</span>
+            <span class="pill blue">{completed} of {total} courses</span>
+            {finish_pill}
+        </div>
+        <h2>{name}</h2>
+        <div class="progress-shell"><div class="progress-fill" style="width:{percent:.1f}%"></div></div>
+    </div>
+    """
+
+
+@lru_cache(maxsize=4096)
+def section_card_html(title, status_label, status_class):
+    return f"""
+    <div class="section-card {status_class}">
+        <div class="section-title">{title}</div>
+        <div class="section-detail">Status: {status_label}</div>
+    </div>
+    """
+
+
+@lru_cache(maxsize=4096)
+def pills_html(codes):
+    return " ".join(f'<span class="pill">{format_course(code)}</span>' for code in codes)
+
+
+def show_section_detail(section_result):
+    if section_result["kind"] == "manual":
+        st.write(section_result.get("description", ""))
+    elif section_result["kind"] == "pool":
+        remaining = section_result.get("remaining_options", [])
+        if remaining:
+            st.write("Options still available:")
+            st.markdown(pills_html(tuple(remaining)), unsafe_allow_html=True)
+        if section_result.get("children"):
+            st.write("Grouped options:")
+            for child in section_result["children"]:
+                child_codes = child.get("codes", []) or child.get("options", [])
+                if child_codes:
+                    st.write(f"- {child.get('title', 'Option')}: {', '.join(format_course(code) for code in child_codes)}")
+    else:
+        pending_groups = section_result.get("pending_groups", [])
+        if pending_groups:
+            for group in pending_groups:
+                options = group.get("options", [])
+                missing = group.get("missing", [])
+                if options:
+                    st.write(f"- {', '.join(format_course(code) for code in options)}")
+                elif missing:
+                    st.write(f"- {', '.join(format_course(code) for code in missing)}")
+        else:
+            st.write("All grouped options are satisfied.")
+
+
+@st.fragment
+def show_ranked_minor(results, finish_by_name, history, semester, token, prereq_graph):
+    # Slider, detail card, requirement breakdown and semester plan. As a
+    # fragment, moving the slider reruns only this, not the whole page.
+    # st.slider rejects min_value == max_value, so a single match gets no slider.
+    selected_rank = 1
+    if len(results) > 1:
+        selected_rank = st.slider(
+            "Browse ranked minors",
+            min_value=1,
+            max_value=len(results),
+            value=1,
+            help="Rank 1 is the closest completion match.",
+        )
+    selected = results[selected_rank - 1]
+    notes = selected.get("notes", [])
+    residency = residency_requirement(selected["total"], notes)
+    finish_label = None
+    if selected["name"] in finish_by_name:
+        finish = finish_by_name[selected["name"]]
+        finish_label = f"Earliest finish: semester {finish}" if finish is not None else "Cannot finish from listed options"
+
+    st.markdown(
+        minor_card_html(
+            selected_rank, selected["name"], selected["percent"], selected["completed"], selected["total"], finish_label
+        ),
+        unsafe_allow_html=True,
+    )
+
+    c1, c2, c3 = st.columns(3)
+    with c1:
+        st.metric("Progress", f"{selected['percent']:.1f}%")
+    with c2:
+        st.metric("Completed", f"{selected['completed']} / {selected['total']}")
+    with c3:
+        st.metric("Taken courses", len(selected['taken_codes']))
+
+    st.markdown(f"[View catalog page]({selected['link']})")
+
+    if residency:
+        req_pcnt, req_courses, allowed_ext = residency
+        st.info(
+            f"Residency requirement: at least {req_courses}/{selected['total']} courses at Purdue ({req_pcnt}%), up to {allowed_ext} external."
+        )
+
+    c_left, c_right = st.columns([1.05, 0.95])
+    with c_left:
+        st.markdown("**Courses already taken**")
+        if selected["taken_codes"]:
+            st.markdown(pills_html(tuple(selected["taken_codes"])), unsafe_allow_html=True)
+        else:
+            st.caption("No completed courses overlap this minor yet.")
+
+    with c_right:
+        st.markdown("**What is left**")
+        st.caption("Open any section below for a compact breakdown.")
+
+    st.markdown("**Requirement breakdown**")
+    for idx, section_result in enumerate(selected["section_results"]):
+        if section_result["kind"] == "manual":
+            status_label = "Manual"
+            status_class = "manual"
+        else:
+            status_label = f"{section_result['completed']} / {section_result['total']}"
+            status_class = "complete" if section_result["completed"] >= section_result["total"] else "partial"
+        st.markdown(section_card_html(section_result["title"], status_label, status_class), unsafe_allow_html=True)
+
+        expander = st.expander(
+            section_result["title"],
+            expanded=section_result["completed"] < section_result["total"],
+            key=f"section_{selected['name']}_{idx}",
+            on_change="rerun",
+        )
+        # Only open sections are built; opening one reruns the fragment.
+        if expander.open:
+            with expander:
+                show_section_detail(section_result)
+
+    st.markdown("**Semester plan**")
+    plan_cols = st.columns([1, 2])
+    with plan_cols[0]:
+        cap = st.number_input(
+            "Minor courses per semester",
+            min_value=1,
+            max_value=6,
+            value=DEFAULT_COURSES_PER_SEMESTER,
+        )
+    with plan_cols[1]:
+        together = st.multiselect(
+            "Plan together with",
+            [result["name"] for result in results if result["name"] != selected["name"]],
+            help="Finish several minors in the same plan; shared courses count for each.",
+        )
+    planned = [selected] + [result for result in results if result["name"] in together]
+    # Slider moves rerun this fragment; keep each plan for the session.
+    plan_key = (token, tuple(result["name"] for result in planned), cap)
+    plans = st.session_state.setdefault("plans", {})
+    if len(plans) > 32:
+        plans.clear()
+    if plan_key not in plans:
+        plans[plan_key] = plan_semesters(
+            planned,
+            history,
+            semester,
+            prerequisites=prereq_graph if len(prereq_graph) else None,
+            cap=cap,
+        )
+    plan = plans[plan_key]
+    if plan["finish"] is None:
+        st.caption(
+            f"These requirements cannot be finished by semester {DEFAULT_LAST_SEMESTER} "
+            f"with {cap} minor courses per semester."
+        )
+    else:
+        rows = [
+            {"Semester": sem, "Courses": ", ".join(format_course(code) for code in codes), "Status": "Taken"}
+            for sem, codes in plan["history"].items()
+        ]
+        rows += [
+            {
+                "Semester": entry["semester"],
+                "Courses": ", ".join(
+                    format_course(code) + (" (prerequisite)" if code in plan["prerequisites"] else "")
+                    for code in entry["courses"]
+                ),
+                "Status": "Planned",
+            }
+            for entry in plan["semesters"]
+        ]
+        st.caption(f"Earliest finish with this plan: semester {plan['finish']}.")
+        st.table(rows)
+        if plan["greedy"]:
+            st.caption("This plan was built greedily; a faster one may exist.")
+
+    if notes:
+        with st.expander("Notes", expanded=False):
+            for cn in clean_notes(notes):
+                st.write(f"- {cn}")
+
+
 def main():
     # Reset optimization flag
     def reset_optimize():
@@ -51,6 +506,17 @@ def main():
         st.session_state.courses.pop(idx)
         st.session_state.optimize = False
 
+    def replace_course(code, replacement):
+        # Swap a mistyped course for the suggestion the student picked.
+        codes = [c["code"] for c in st.session_state.courses]
+        idx = codes.index(code)
+        if replacement in codes:
+            st.session_state.courses.pop(idx)
+        else:
+            st.session_state.courses[idx]["code"] = replacement
+        st.session_state.course_hints = [hint for hint in st.session_state.course_hints if hint[0] != code]
+        st.session_state.optimize = False
+
     def clear_all():
         st.session_state.courses = []
         # reset optimization flag and inputs
@@ -69,13 +535,38 @@ def main():
         "**Important:** This app has been tested with my courses and credits, but with over 100 Purdue minors, not everything has been fully tested. Please check the official Purdue minor page for each recommendation to ensure accuracy. If you find any issues or have suggestions, please report them on the [GitHub repository](https://github.com/arnavsiva/Purdue-University-Minor-Optimizer)."
     )
 
+    apply_shared_profile()
+
+    refresher = get_refresher()
+    # One snapshot per run: a background refresh never changes it mid-request.
+    catalog = refresher.holder.current()
+    if catalog is not None and get_common_profiles():
+        warm_in_background(get_result_cache(), catalog, get_common_profiles())
+
     # Sidebar - user information input and course management
     st.sidebar.header("Your Information")
+    # Requirements follow the catalog year the student entered under.
+    years = list(catalog.years) if catalog is not None else []
+    if len(years) > 1:
+        if st.session_state.get("catalog_year") not in years:
+            st.session_state.catalog_year = years[0]
+        st.sidebar.selectbox(
+            "Catalog year",
+            years,
+            key="catalog_year",
+            on_change=reset_optimize,
+            help="Use the catalog year you entered Purdue under.",
+        )
+        catalog = catalog.for_year(st.session_state.catalog_year)
+    course_index = get_course_index(catalog.version, catalog) if catalog is not None else None
     # select current major (used only for explicit catalog restrictions)
-    majors = get_majors_list()
+    majors = list(catalog.majors) if catalog is not None else []
     major_options = ["None"] + majors
     if "major" not in st.session_state:
         st.session_state.major = "None"
+    elif st.session_state.major not in major_options:
+        # A shared link can name a major before the catalog has loaded.
+        major_options.append(st.session_state.major)
     st.sidebar.selectbox(
         "Current major (optional)",
         major_options,
@@ -107,17 +598,34 @@ def main():
         )
         add_btn = st.form_submit_button("Add Courses", on_click=reset_optimize)
     if add_btn and new_input:
+        hints = []
         for code in [
-            c.strip().upper().replace(" ", "")
+            canonical_code(c)
             for c in new_input.split(",")
             if c.strip()
         ]:
             if code not in [c["code"] for c in st.session_state.courses]:
                 # default to semester 1 until user updates
                 st.session_state.courses.append({"code": code, "sem": 1})
+                # Flag likely typos now rather than as missing matches later.
+                if course_index is not None and len(course_index) and code not in course_index:
+                    hints.append((code, course_index.suggest(code)))
+        st.session_state.course_hints = hints
         # clear the form input and rerun
         st.session_state.clear_input = True
         st.rerun()
+    taken_codes = {c["code"] for c in st.session_state.courses}
+    for code, suggestions in st.session_state.get("course_hints", []):
+        if code not in taken_codes:
+            continue
+        st.sidebar.warning(f"No minor lists {format_course(code)}." + (" Did you mean:" if suggestions else ""))
+        for suggestion, title in suggestions:
+            st.sidebar.button(
+                f"{format_course(suggestion)}" + (f" — {title}" if title else ""),
+                key=f"hint_{code}_{suggestion}",
+                on_click=replace_course,
+                args=(code, suggestion),
+            )
     # initialize and handle clearing the external input field before widget
     if "clear_external" not in st.session_state:
         st.session_state.clear_external = False
@@ -134,11 +642,12 @@ def main():
         ext_input = st.text_input(
             "Type your external (transfer/test) courses (comma-separated)",
             key="external_courses_input",
+            help="Add test credits with their score, e.g. AP Calculus BC: 5",
         )
         add_ext = st.form_submit_button("Add External Credits", on_click=reset_optimize)
     if add_ext and ext_input:
         for code in [
-            c.strip().upper().replace(" ", "")
+            canonical_code(c)
             for c in ext_input.split(",")
             if c.strip()
         ]:
@@ -191,6 +700,7 @@ def main():
                         key=f"sem_{idx}",
                         index=(course.get("sem", 1) - 1),
                         on_change=reset_optimize,
+                        help=(course_index.title(course["code"]) or None) if course_index is not None else None,
                     )
                     st.session_state.courses[idx]["sem"] = sem_val
                 with cols[1]:
@@ -204,8 +714,13 @@ def main():
                 course = st.session_state.courses[idx]
                 code_fmt = re.sub(r"([A-Za-z]+)(\d+)", r"\1 \2", course["code"])
                 cols = st.sidebar.columns([3, 1])
+                label = get_equivalencies().label(course["code"])
+                equivalents = get_equivalencies().lookup(course["code"])
                 with cols[0]:
-                    st.markdown(f"**{code_fmt}** (External)")
+                    st.markdown(
+                        (f"**{label}** (External, {code_fmt})" if label else f"**{code_fmt}** (External)")
+                        + (f"  \nCounts as {', '.join(format_course(code) for code in equivalents)}" if equivalents else "")
+                    )
                 with cols[1]:
                     st.button(
                         "🗑️", key=f"del_{idx}", on_click=delete_course, args=(idx,)
@@ -213,8 +728,9 @@ def main():
         # button to clear all entered courses
         st.sidebar.button("🧹 Reset Inputs", on_click=clear_all)
 
-    # build taken set from stored courses
-    taken = {c["code"] for c in st.session_state.courses}
+    # build taken set from stored courses; test and transfer credits also
+    # count as their Purdue equivalents
+    taken = get_equivalencies().expand(c["code"] for c in st.session_state.courses)
     # add spacing after input forms
     st.sidebar.write("")
     # optimization trigger
@@ -222,180 +738,119 @@ def main():
     if "optimize" not in st.session_state:
         st.session_state.optimize = False
     _ = st.sidebar.button("Find minor optimization", on_click=set_optimize)
+    with st.sidebar.expander("Catalog status", expanded=False):
+        stats = refresher.stats()
+        if stats["last_refresh_at"]:
+            st.caption(
+                f"Version {stats['catalog_version']}, refreshed "
+                f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(stats['last_refresh_at']))} "
+                f"in {stats['last_duration']:.1f}s"
+            )
+        elif catalog is not None:
+            st.caption(f"Version {stats['catalog_version']}, loaded from snapshot")
+        else:
+            st.caption("Loading catalog...")
+        if stats["failures"]:
+            st.caption(f"Refresh failures: {stats['failures']} (last: {stats['last_error']})")
+        cache_stats = get_result_cache().stats()
+        st.caption(
+            f"Result cache: {cache_stats['entries']} entries, {cache_stats['hit_rate']:.0%} hit rate, "
+            f"{cache_stats['evictions']} evictions"
+        )
+    query = st.text_input(
+        "Search minors",
+        key="search_query",
+        placeholder="Topic or course code, e.g. data science or STAT 35000",
+    )
+    if query.strip():
+        if catalog is None:
+            st.caption("The catalog is still loading.")
+        else:
+            hits = get_search_index(catalog.version, catalog).search(query, limit=10)
+            if not hits:
+                st.caption("No minors match that search.")
+            for hit in hits:
+                st.markdown(f"**[{hit['name']}]({hit['link']})** — matched in {', '.join(hit['fields'])}")
     # require at least one course and the optimization button pressed
     if not taken:
         st.sidebar.warning("Add at least one course to proceed.")
         return
     if not st.session_state.optimize:
+        st.query_params.pop(QUERY_PARAM, None)
         st.info(
             "Click 'Find minor optimization' in the sidebar to get recommendations."
         )
         return
 
-    st.markdown(
-        """
-        <style>
-        .boilerplate-wrap {
-            margin-top: 0.75rem;
-        }
-        .rank-rail {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(180px, 1fr));
-            gap: 0.75rem;
-            margin: 0.75rem 0 1.5rem 0;
-        }
-        .rank-card {
-            border-radius: 18px;
-            padding: 0.9rem 1rem;
-            border: 1px solid rgba(255,255,255,0.08);
-            background: linear-gradient(180deg, rgba(255,255,255,0.06), rgba(255,255,255,0.03));
-            box-shadow: 0 12px 30px rgba(0,0,0,0.18);
-        }
-        .rank-card.active {
-            border-color: rgba(255,184,0,0.6);
-            box-shadow: 0 18px 36px rgba(255,184,0,0.18);
-        }
-        .rank-num {
-            font-size: 0.8rem;
-            text-transform: uppercase;
-            letter-spacing: 0.08em;
-            opacity: 0.75;
-        }
-        .rank-title {
-            font-size: 1rem;
-            font-weight: 700;
-            margin-top: 0.35rem;
-        }
-        .rank-sub {
-            font-size: 0.88rem;
-            opacity: 0.75;
-            margin-top: 0.25rem;
-        }
-        .minor-card {
-            border-radius: 28px;
-            padding: 1.5rem;
-            background: radial-gradient(circle at top right, rgba(255,184,0,0.16), transparent 28%),
-                        linear-gradient(180deg, rgba(20,20,20,0.96), rgba(8,8,8,0.98));
-            border: 1px solid rgba(255,255,255,0.08);
-            box-shadow: 0 24px 60px rgba(0,0,0,0.35);
-            margin: 0.5rem 0 1rem 0;
-        }
-        .minor-card h2 {
-            margin: 0;
-            color: #fff;
-            font-size: 2rem;
-            line-height: 1.15;
-        }
-        .minor-card .meta-row {
-            display: flex;
-            flex-wrap: wrap;
-            gap: 0.5rem;
-            margin-top: 0.85rem;
-            margin-bottom: 0.8rem;
-        }
-        .pill {
-            display: inline-flex;
-            align-items: center;
-            padding: 0.35rem 0.7rem;
-            border-radius: 999px;
-            background: rgba(255,255,255,0.08);
-            color: #fff;
-            font-size: 0.8rem;
-            font-weight: 600;
-        }
-        .pill.gold { background: rgba(255,184,0,0.18); color: #ffd77a; }
-        .pill.green { background: rgba(90,200,120,0.18); color: #8ef0ae; }
-        .pill.blue { background: rgba(90,155,255,0.18); color: #9fc3ff; }
-        .progress-shell {
-            width: 100%;
-            height: 12px;
-            border-radius: 999px;
-            background: rgba(255,255,255,0.08);
-            overflow: hidden;
-            margin: 0.75rem 0 1rem 0;
-        }
-        .progress-fill {
-            height: 100%;
-            border-radius: 999px;
-            background: linear-gradient(90deg, #ffb800, #ffd77a);
-        }
-        .stats-grid {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(140px, 1fr));
-            gap: 0.75rem;
-            margin-top: 0.8rem;
-            margin-bottom: 1rem;
-        }
-        .stat-card {
-            border-radius: 18px;
-            padding: 0.9rem 1rem;
-            background: rgba(255,255,255,0.05);
-            border: 1px solid rgba(255,255,255,0.08);
-        }
-        .stat-label {
-            font-size: 0.75rem;
-            text-transform: uppercase;
-            letter-spacing: 0.08em;
-            opacity: 0.65;
-        }
-        .stat-value {
-            font-size: 1.35rem;
-            font-weight: 800;
-            margin-top: 0.2rem;
-            color: #fff;
-        }
-        .section-card {
-            border-radius: 18px;
-            padding: 0.9rem 1rem;
-            margin: 0.6rem 0;
-            background: rgba(255,255,255,0.05);
-            border: 1px solid rgba(255,255,255,0.08);
-        }
-        .section-card.complete { border-color: rgba(90,200,120,0.35); }
-        .section-card.partial { border-color: rgba(255,184,0,0.35); }
-        .section-card.manual { border-color: rgba(120,160,255,0.35); }
-        .section-title { font-weight: 700; color: #fff; }
-        .section-detail { margin-top: 0.35rem; opacity: 0.88; }
-        </style>
-        """,
-        unsafe_allow_html=True,
+    # Keep the URL in sync with the inputs so it can be shared as-is.
+    token = encode_profile(
+        st.session_state.courses,
+        semester,
+        st.session_state.get("major"),
+        [name for name in ("study_abroad", "intl_internship") if st.session_state.get(name)],
+        catalog.year if catalog is not None and catalog.year != years[0] else None,
     )
+    st.session_state.shared_profile = token
+    st.query_params[QUERY_PARAM] = token
+
+    # Full reruns re-send the stylesheet (Streamlit drops elements a run does
+    # not repeat); slider moves rerun only the detail fragment and skip it.
+    st.markdown(RESULTS_CSS, unsafe_allow_html=True)
 
     # proceed once optimization triggered
-    with st.spinner("Loading minor requirements..."):
-        status = st.empty()
-        minors_data = []
-        for name, link in get_minor_list():
-            status.text(f"Loading requirements for {name}...")
-            try:
-                sections, notes, restriction_text = _get_requirements_from_minor_page(link)
-            except Exception:
-                sections, notes, restriction_text = [], [], ""
-            minors_data.append(
-                {
-                    "name": name,
-                    "link": link,
-                    "sections": sections,
-                    "notes": notes,
-                    "restriction_text": restriction_text,
-                }
+    major = st.session_state.get("major")
+    profiling = profiling_requested()
+    if catalog is not None and not profiling and profile_key(taken, major, catalog.version) in get_result_cache():
+        # Cached rankings cost nothing, so they skip the queue.
+        ranked = load_and_rank(catalog, taken, major)
+    else:
+        if profiling:
+            job = partial(
+                profile_call,
+                load_and_rank,
+                cached=False,
+                directory=os.environ.get("MINOR_OPTIMIZER_PROFILE_DIR", DEFAULT_PROFILE_DIR),
             )
-        status.empty()
-
-    with st.spinner("Computing top recommendations..."):
+        else:
+            job = load_and_rank
+        try:
+            ticket = get_work_queue().submit(
+                get_script_run_ctx().session_id,
+                (profiling, catalog.version if catalog else None, major, tuple(sorted(taken))),
+                job,
+                catalog,
+                taken,
+                major,
+            )
+        except Overloaded as exc:
+            st.error(
+                f"Too many students are optimizing right now. Please try again in about {math.ceil(exc.retry_after)} seconds."
+            )
+            return
         status = st.empty()
-        results = []
-        skipped_minors = []
-        for minor in minors_data:
-            status.text(f"Checking {minor['name']} minor...")
-            if major_restriction_applies(st.session_state.get("major"), minor.get("restriction_text", "")):
-                skipped_minors.append(minor["name"])
-                continue
-
-            summary = summarize_minor(minor, taken, st.session_state.get("major"))
-            if summary is not None:
-                results.append(summary)
+        with st.spinner("Computing top recommendations..."):
+            while not ticket.wait(0.25):
+                position = ticket.position()
+                if position:
+                    status.info(f"Waiting for a free optimizer: position {position} in the queue.")
+                else:
+                    status.empty()
         status.empty()
+        ranked = ticket.result()
+        if profiling:
+            ranked, profile_path, profile_rows = ranked
+            with st.expander("Profile (debug)", expanded=False):
+                st.caption(f"Saved to {profile_path}")
+                st.table(profile_rows)
+    if ranked is None:
+        st.info("The minor catalog is still loading in the background. Please try again in a minute.")
+        return
+    results, skipped_minors, not_loaded = ranked
+    if not_loaded:
+        st.warning(
+            f"Partial ranking: {len(not_loaded)} minors did not load in time and are not ranked yet: "
+            + ", ".join(sorted(not_loaded))
+        )
 
     if skipped_minors:
         st.info(
@@ -403,143 +858,42 @@ def main():
             + ", ".join(sorted(skipped_minors))
         )
 
-    results = sort_minor_results(results)
-
     if not results:
         st.info("No minors found with requirements.")
         return
 
     st.subheader("Recommended Minors")
-    st.caption(f"{len(results)} minors match your completed coursework. Rank 1 is the closest match.")
+    # Without scraped prerequisites every remaining course looks one semester away.
+    prereq_graph = get_prereq_graph()
+    finish_by_name = {}
+    rank_hint = "Rank 1 is the closest match."
+    if len(prereq_graph):
+        scheduled = rank_by_finish(results, Scheduler(prereq_graph, taken, semester))
+        finish_by_name = {result["name"]: finish for finish, result in scheduled}
+        order = st.radio(
+            "Order by",
+            ["Closest match", "Earliest finish"],
+            horizontal=True,
+            help="Earliest finish follows prerequisite chains from your current semester.",
+        )
+        if order == "Earliest finish":
+            results = [result for _, result in scheduled]
+            rank_hint = "Rank 1 can be finished soonest."
+    st.caption(f"{len(results)} minors match your completed coursework. {rank_hint}")
 
     preview_count = min(3, len(results))
     preview_cols = st.columns(preview_count)
     for idx, (col, result) in enumerate(zip(preview_cols, results[:preview_count]), start=1):
         with col:
-            active_class = " active" if idx == 1 else ""
-            st.markdown(
-                f"""
-                <div class="rank-card{active_class}">
-                    <div class="rank-num">Rank {idx}</div>
-                    <div class="rank-title">{result['name']}</div>
-                    <div class="rank-sub">{result['percent']:.1f}% complete</div>
-                </div>
-                """,
-                unsafe_allow_html=True,
-            )
-
-    selected_rank = st.slider(
-        "Browse ranked minors",
-        min_value=1,
-        max_value=len(results),
-        value=1,
-        help="Rank 1 is the closest completion match.",
-    )
-    selected = results[selected_rank - 1]
-    notes = selected.get("notes", [])
-    residency = residency_requirement(selected["total"], notes)
-
-    st.markdown(
-        f"""
-        <div class="minor-card">
-            <div class="meta-row">
-                <span class="pill gold">Rank #{selected_rank}</span>
-                <span class="pill green">{selected['percent']:.1f}% complete</span>
-                <span class="pill blue">{selected['completed']} of {selected['total']} courses</span>
-            </div>
-            <h2>{selected['name']}</h2>
-            <div class="progress-shell"><div class="progress-fill" style="width:{selected['percent']:.1f}%"></div></div>
-        </div>
-        """,
-        unsafe_allow_html=True,
-    )
-
-    c1, c2, c3 = st.columns(3)
-    with c1:
-        st.metric("Progress", f"{selected['percent']:.1f}%")
-    with c2:
-        st.metric("Completed", f"{selected['completed']} / {selected['total']}")
-    with c3:
-        st.metric("Taken courses", len(selected['taken_codes']))
-
-    st.markdown(f"[View catalog page]({selected['link']})")
-
-    if residency:
-        req_pcnt, req_courses, allowed_ext = residency
-        st.info(
-            f"Residency requirement: at least {req_courses}/{selected['total']} courses at Purdue ({req_pcnt}%), up to {allowed_ext} external."
-        )
-
-    c_left, c_right = st.columns([1.05, 0.95])
-    with c_left:
-        st.markdown("**Courses already taken**")
-        if selected["taken_codes"]:
-            chips = " ".join(
-                f'<span class="pill">{format_course(code)}</span>' for code in selected["taken_codes"]
-            )
-            st.markdown(chips, unsafe_allow_html=True)
-        else:
-            st.caption("No completed courses overlap this minor yet.")
-
-    with c_right:
-        st.markdown("**What is left**")
-        st.caption("Open any section below for a compact breakdown.")
-
-    st.markdown("**Requirement breakdown**")
-    for section_result in selected["section_results"]:
-        if section_result["kind"] == "manual":
-            status_label = "Manual"
-            status_class = "manual"
-        else:
-            status_label = f"{section_result['completed']} / {section_result['total']}"
-            status_class = "complete" if section_result["completed"] >= section_result["total"] else "partial"
-
-        st.markdown(
-            f"""
-            <div class="section-card {status_class}">
-                <div class="section-title">{section_result['title']}</div>
-                <div class="section-detail">Status: {status_label}</div>
-            </div>
-            """,
-            unsafe_allow_html=True,
-        )
-
-        with st.expander(section_result["title"], expanded=section_result["completed"] < section_result["total"]):
-            if section_result["kind"] == "manual":
-                st.write(section_result.get("description", ""))
-            elif section_result["kind"] == "pool":
-                remaining = section_result.get("remaining_options", [])
-                if remaining:
-                    st.write("Options still available:")
-                    st.markdown(
-                        " ".join(
-                            f'<span class="pill">{format_course(code)}</span>' for code in remaining
-                        ),
-                        unsafe_allow_html=True,
-                    )
-                if section_result.get("children"):
-                    st.write("Grouped options:")
-                    for child in section_result["children"]:
-                        child_codes = child.get("codes", []) or child.get("options", [])
-                        if child_codes:
-                            st.write(f"- {child.get('title', 'Option')}: {', '.join(format_course(code) for code in child_codes)}")
-            else:
-                pending_groups = section_result.get("pending_groups", [])
-                if pending_groups:
-                    for group in pending_groups:
-                        options = group.get("options", [])
-                        missing = group.get("missing", [])
-                        if options:
-                            st.write(f"- {', '.join(format_course(code) for code in options)}")
-                        elif missing:
-                            st.write(f"- {', '.join(format_course(code) for code in missing)}")
-                else:
-                    st.write("All grouped options are satisfied.")
-
-    if notes:
-        with st.expander("Notes", expanded=False):
-            for cn in clean_notes(notes):
-                st.write(f"- {cn}")
+            st.markdown(rank_card_html(idx, result["name"], result["percent"]), unsafe_allow_html=True)
+
+    # Equivalents of test and transfer credits are planned as already done,
+    # the same as the ranking counts them.
+    listed = {course["code"] for course in st.session_state.courses}
+    history = st.session_state.courses + [
+        {"code": code, "sem": None, "origin": "external"} for code in sorted(taken - listed)
+    ]
+    show_ranked_minor(results, finish_by_name, history, semester, token, prereq_graph)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,137 @@
+import contextlib
+import hashlib
+import os
+import tempfile
+import threading
+import zipfile
+
+
+class ArchiveMiss(LookupError):
+    pass
+
+
+def _member_name(url):
+    return hashlib.sha1(url.encode("utf-8")).hexdigest() + ".html"
+
+
+class HtmlArchive:
+    """
+    Single-file, compressed archive of fetched pages with random access by URL.
+
+    Pages are stored as deflated zip members named by the SHA-1 of their URL, so
+    the zip central directory doubles as the index. Writes made inside `batch()`
+    are buffered and written with one open of the file; recording a URL that is
+    already archived rewrites the file so each URL is stored once.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._reader = None
+        self._pending = {}
+        self._batch_depth = 0
+
+    def put(self, url, html):
+        with self._lock:
+            self._pending[url] = html
+            if not self._batch_depth:
+                self._flush()
+
+    @contextlib.contextmanager
+    def batch(self):
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                if not self._batch_depth:
+                    self._flush()
+
+    def get(self, url):
+        with self._lock:
+            if url in self._pending:
+                return self._pending[url]
+            try:
+                reader = self._open_reader()
+                return reader.read(_member_name(url)).decode("utf-8")
+            except (FileNotFoundError, KeyError):
+                raise ArchiveMiss(url) from None
+
+    def __contains__(self, url):
+        try:
+            self.get(url)
+        except ArchiveMiss:
+            return False
+        return True
+
+    def urls(self):
+        with self._lock:
+            urls = set(self._pending)
+            try:
+                reader = self._open_reader()
+            except FileNotFoundError:
+                return sorted(urls)
+            urls.update(info.comment.decode("utf-8") for info in reader.infolist())
+            return sorted(urls)
+
+    def close(self):
+        with self._lock:
+            self._flush()
+            self._close_reader()
+
+    def _flush(self):
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        names = {_member_name(url): url for url in pending}
+        try:
+            existing = set(self._open_reader().namelist())
+        except FileNotFoundError:
+            existing = set()
+        self._close_reader()
+
+        if existing & set(names):
+            self._rewrite(pending, names)
+            return
+        with zipfile.ZipFile(self.path, "a", compression=zipfile.ZIP_DEFLATED) as archive:
+            for url, html in pending.items():
+                self._write_member(archive, url, html)
+
+    def _rewrite(self, pending, names):
+        # Copy every page that is not being replaced into a fresh file, then
+        # swap it in, so re-recording never grows the archive with duplicates.
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(suffix=".zip", dir=directory)
+        os.close(fd)
+        try:
+            with zipfile.ZipFile(self.path, "r") as source, zipfile.ZipFile(
+                tmp_path, "w", compression=zipfile.ZIP_DEFLATED
+            ) as target:
+                for info in source.infolist():
+                    if info.filename not in names:
+                        target.writestr(info, source.read(info))
+                for url, html in pending.items():
+                    self._write_member(target, url, html)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    @staticmethod
+    def _write_member(archive, url, html):
+        info = zipfile.ZipInfo(_member_name(url))
+        info.compress_type = zipfile.ZIP_DEFLATED
+        info.comment = url.encode("utf-8")
+        archive.writestr(info, html.encode("utf-8"))
+
+    def _open_reader(self):
+        if self._reader is None:
+            self._reader = zipfile.ZipFile(self.path, "r")
+        return self._reader
+
+    def _close_reader(self):
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
@@ -0,0 +1,71 @@
+"""
+Memory for several catalog years with and without shared section storage.
+
+    python benchmarks/bench_catalog_years.py --minors 150 --years 5
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from catalog import CatalogHolder, load_snapshot_years, save_snapshot  # noqa: E402
+from synthetic import make_catalog, make_years  # noqa: E402
+
+
+def measure(build):
+    """
+    Return (object, bytes still allocated once `build` returns).
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        value = build()
+        gc.collect()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return value, size
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--minors", type=int, default=150)
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--change-rate", type=float, default=0.1, help="Share of sections that change each year")
+    args = parser.parse_args()
+
+    years = make_years(make_catalog(args.minors), args.years, args.change_rate)
+    blobs = {label: json.dumps(minors) for label, minors in years.items()}
+    labels = list(blobs)
+
+    def publish(count):
+        loaded = {label: json.loads(blobs[label]) for label in labels[:count]}
+        default = loaded.pop(labels[0])
+        return CatalogHolder().publish(default, years=loaded, year=labels[0])
+
+    _, one_year = measure(lambda: publish(1))
+    _, separate = measure(lambda: [CatalogHolder().publish(json.loads(blob)) for blob in blobs.values()])
+    catalog, pooled = measure(lambda: publish(args.years))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "snapshot.json")
+        save_snapshot(catalog, path)
+        snapshot_size = os.path.getsize(path)
+        _, reloaded = measure(lambda: load_snapshot_years(path))
+    inline_size = sum(len(blob) for blob in blobs.values())
+
+    print(f"{args.years} catalog years of {args.minors} minors, {args.change_rate:.0%} of sections changing each year")
+    print(f"{'one year':<34} {one_year / 1024:10.0f} KB")
+    print(f"{'every year, sections not shared':<34} {separate / 1024:10.0f} KB")
+    print(f"{'every year, sections shared':<34} {pooled / 1024:10.0f} KB ({pooled / one_year:.2f}x one year)")
+    print(f"{'snapshot load, sections shared':<34} {reloaded / 1024:10.0f} KB")
+    print(f"{'snapshot file':<34} {snapshot_size / 1024:10.0f} KB (inline: {inline_size / 1024:.0f} KB)")
+
+
+if __name__ == "__main__":
+    main()
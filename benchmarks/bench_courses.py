@@ -0,0 +1,65 @@
+"""
+Course registry lookups, course completion per keystroke, and ranking on
+interned integer IDs vs. code strings.
+
+    python benchmarks/bench_courses.py --minors 150 --profiles 200
+"""
+import argparse
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import optimizer  # noqa: E402
+from courses import CourseIndex, CourseRegistry  # noqa: E402
+from synthetic import SUBJECTS, course_code, make_catalog, make_taken  # noqa: E402
+
+
+def report(label, seconds, count, unit):
+    print(f"{label:<38} {seconds / count * 1e6:10.2f} us/{unit}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--minors", type=int, default=150)
+    parser.add_argument("--profiles", type=int, default=200)
+    parser.add_argument("--lookups", type=int, default=100_000)
+    parser.add_argument("--index-courses", type=int, default=30_000, help="Courses in the completion index")
+    args = parser.parse_args()
+
+    minors = make_catalog(args.minors)
+    registry = CourseRegistry()
+    interned = [optimizer.intern_minor(minor, registry) for minor in minors]
+    rng = random.Random(1)
+    profiles = [make_taken(rng) for _ in range(args.profiles)]
+    typed = [f"{code[:-5]} {code[-5:-2]}" for code in (course_code(rng) for _ in range(args.lookups))]
+    canonical = [registry.canonical(code) for code in typed]
+
+    for taken in profiles[:20]:
+        assert optimizer.rank_interned(interned, taken, registry) == optimizer.rank_minors(minors, taken)
+
+    def timed(fn, items):
+        return timeit.timeit(lambda: [fn(item) for item in items], number=1)
+
+    print(f"{len(registry)} interned courses across {args.minors} minors")
+    report("canonical('CS 180') alias resolution", timed(registry.canonical, typed), len(typed), "lookup")
+    report("id_of(canonical code)", timed(registry.id_of, canonical), len(canonical), "lookup")
+    index = CourseIndex(f"{rng.choice(SUBJECTS)}{rng.randint(10000, 99999)}" for _ in range(args.index_courses))
+    # Every prefix of a typed code, as the student types it.
+    keystrokes = [code[:end] for code in typed[:2000] for end in range(1, len(code) + 1)]
+    print(f"{len(index)} courses in the completion index")
+    report("complete(typed prefix)", timed(index.complete, keystrokes), len(keystrokes), "keystroke")
+    report("intern catalog", timeit.timeit(lambda: [optimizer.intern_minor(m, registry) for m in minors], number=1), 1, "catalog")
+    report("rank profile: code strings", timed(lambda t: optimizer.rank_minors(minors, t), profiles), len(profiles), "profile")
+    report(
+        "rank profile: interned IDs",
+        timed(lambda t: optimizer.rank_interned(interned, t, registry), profiles),
+        len(profiles),
+        "profile",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Time the results page reruns that follow moving the rank slider.
+
+    python benchmarks/bench_rerun.py --minors 150 --moves 30
+
+Starts `streamlit run app.py` against a synthetic snapshot the way
+load_test.py does, optimizes once for a random student over one websocket,
+then moves the slider through the ranked minors. Each move is sent twice: as
+the browser sends it (rerunning only the fragment the slider lives in) and as
+a full page rerun. Reports the mean and median rerun time and how many deltas
+each rerun sends, so rendering changes can be compared offline.
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from load_test import Session, start_server  # noqa: E402
+from synthetic import make_taken  # noqa: E402
+
+SLIDER = "Browse ranked minors"
+
+
+async def measure(port, courses, moves):
+    session = Session(port)
+    await session.connect()
+    try:
+        await session.rerun()
+        await session.rerun(
+            [
+                session.state(
+                    "Type all your courses taken at Purdue (separated by commas)", string_value=", ".join(courses)
+                ),
+                session.state("Add Courses", trigger_value=True),
+            ]
+        )
+        await session.rerun([session.state("Find minor optimization", trigger_value=True)])
+        if SLIDER not in session.widgets:
+            raise SystemExit("No ranked minors to browse; try more --courses")
+        ranks = session.slider_max[SLIDER]
+        results = {"fragment": ([], []), "full page": ([], [])}
+        for move in range(moves):
+            rank = (move + 1) % ranks + 1
+            for mode, (times, deltas) in results.items():
+                fragment_id = session.fragments.get(SLIDER) if mode == "fragment" else None
+                times.append(await session.rerun([session.state(SLIDER, double_array_value=[rank])], fragment_id))
+                deltas.append(session.deltas)
+        if session.errors:
+            raise SystemExit(f"App error: {session.errors[0]}")
+        return ranks, results
+    finally:
+        await session.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--minors", type=int, default=150)
+    parser.add_argument("--courses", type=int, default=25)
+    parser.add_argument("--moves", type=int, default=30)
+    args = parser.parse_args()
+
+    server_args = argparse.Namespace(
+        snapshot=None, archive=None, minors=args.minors, profiles=None, workers=2, queue_depth=32
+    )
+    courses = sorted(make_taken(random.Random(0), args.courses))
+    with tempfile.TemporaryDirectory() as workdir:
+        server, port = start_server(server_args, workdir)
+        try:
+            ranks, results = asyncio.run(measure(port, courses, args.moves))
+        finally:
+            server.terminate()
+            server.wait(10)
+
+    print(f"{args.moves} slider moves over {ranks} ranked minors")
+    print(f"{'rerun':<10} {'mean ms':>9} {'median ms':>10} {'deltas':>7}")
+    for mode, (times, deltas) in results.items():
+        print(
+            f"{mode:<10} {statistics.mean(times) * 1e3:9.1f} {statistics.median(times) * 1e3:10.1f} "
+            f"{statistics.mean(deltas):7.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Minor search: building the index, and query latency against a linear scan.
+
+    python benchmarks/bench_search.py --minors 150
+"""
+import argparse
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import optimizer  # noqa: E402
+from synthetic import make_catalog  # noqa: E402
+
+QUERIES = ["stat 35000", "cs", "choose list", "required courses 3", "policy", "p", "synthetic 12 minor", "zzz"]
+
+
+def scan(minors, query):
+    # What searching without an index costs: every word against every minor.
+    words = query.lower().split()
+    return [minor["name"] for minor in minors if all(word in json.dumps(minor).lower() for word in words)]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--minors", type=int, default=150)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    minors = make_catalog(args.minors)
+    build = timeit.timeit(lambda: optimizer.SearchIndex(minors), number=5) / 5
+    index = optimizer.SearchIndex(minors)
+
+    print(f"{len(index)} terms across {args.minors} minors, built in {build * 1e3:.1f} ms")
+    print(f"{'query':<22} {'hits':>5} {'index':>12} {'scan':>12}")
+    for query in QUERIES:
+        indexed = timeit.timeit(lambda: index.search(query), number=args.repeat) / args.repeat
+        scanned = timeit.timeit(lambda: scan(minors, query), number=5) / 5
+        hits = len(index.search(query, limit=args.minors))
+        print(f"{query!r:<22} {hits:>5} {indexed * 1e3:>9.3f} ms {scanned * 1e3:>9.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
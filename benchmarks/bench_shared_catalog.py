@@ -0,0 +1,98 @@
+"""
+Per-worker memory with a private JSON catalog vs. a shared memory-mapped one.
+
+    python benchmarks/bench_shared_catalog.py --minors 2000 --workers 1 4 8
+
+RSS counts shared pages in every worker; PSS splits them between the workers
+that map them, so PSS shows what each extra worker really costs. "pass ms" is
+one later recommendation pass over every minor: the mapped catalog decodes
+each minor again on every pass, which is the price of not keeping a private
+copy.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from catalog import CatalogHolder  # noqa: E402
+from shared_catalog import MappedCatalog, compile_catalog  # noqa: E402
+from synthetic import make_catalog  # noqa: E402
+
+
+def memory_kb():
+    values = {}
+    with open("/proc/self/smaps_rollup") as handle:
+        for line in handle:
+            key, _, rest = line.partition(":")
+            if key in ("Rss", "Pss"):
+                values[key] = int(rest.split()[0])
+    return values["Rss"], values["Pss"]
+
+
+def worker(mode, path, ready, go, results):
+    import optimizer
+
+    base_rss, _ = memory_kb()
+    if mode == "private":
+        with open(path, encoding="utf-8") as handle:
+            minors = json.load(handle)["minors"]
+    else:
+        minors = MappedCatalog(path).minors
+    # One recommendation pass touches every minor, as a request would.
+    for minor in minors:
+        optimizer.summarize_minor(minor, {"CS18000", "MA16100"})
+    started = time.perf_counter()
+    for minor in minors:
+        optimizer.summarize_minor(minor, {"CS18000", "MA16100"})
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    ready.wait()
+    rss, pss = memory_kb()
+    results.put((rss - base_rss, rss, pss, elapsed_ms))
+    go.wait()
+
+
+def measure(mode, path, count):
+    ctx = multiprocessing.get_context("spawn")
+    ready, go = ctx.Barrier(count + 1), ctx.Barrier(count + 1)
+    results = ctx.Queue()
+    procs = [ctx.Process(target=worker, args=(mode, path, ready, go, results)) for _ in range(count)]
+    for proc in procs:
+        proc.start()
+    ready.wait()
+    samples = [results.get() for _ in procs]
+    go.wait()
+    for proc in procs:
+        proc.join()
+    avg = [sum(sample[i] for sample in samples) / count for i in range(4)]
+    # Memory is reported in KiB; the pass time is already in ms.
+    return [value / 1024 for value in avg[:3]] + avg[3:]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--minors", type=int, default=2000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    args = parser.parse_args()
+
+    catalog = CatalogHolder().publish(make_catalog(args.minors))
+    with tempfile.TemporaryDirectory() as tmpdir:
+        snapshot = os.path.join(tmpdir, "snapshot.json")
+        compiled = os.path.join(tmpdir, "catalog.bin")
+        with open(snapshot, "w", encoding="utf-8") as handle:
+            json.dump({"minors": [dict(minor) for minor in catalog.minors]}, handle)
+        compile_catalog(catalog, compiled)
+        print(f"catalog: {args.minors} minors, compiled file {os.path.getsize(compiled) / 1024 / 1024:.1f} MiB")
+        print(f"{'mode':<8} {'workers':>7} {'catalog MiB':>12} {'RSS MiB':>9} {'PSS MiB':>9} {'pass ms':>8}")
+        for mode, path in (("private", snapshot), ("mapped", compiled)):
+            for count in args.workers:
+                delta, rss, pss, elapsed = measure(mode, path, count)
+                print(f"{mode:<8} {count:>7} {delta:>12.1f} {rss:>9.1f} {pss:>9.1f} {elapsed:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
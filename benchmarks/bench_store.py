@@ -0,0 +1,71 @@
+"""
+Compare indexed SQLite catalog queries with scanning the in-memory catalog.
+
+    python benchmarks/bench_store.py --minors 150 --queries 500
+"""
+import argparse
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import optimizer  # noqa: E402
+from store import CatalogStore  # noqa: E402
+from synthetic import course_code, make_catalog, make_taken  # noqa: E402
+
+
+def scan_minors_accepting(minors, code):
+    names = set()
+    for minor in minors:
+        for section in minor["sections"]:
+            if code in section.get("excluded_codes", []):
+                continue
+            if section.get("kind") == "pool" and code in section.get("options", []):
+                names.add(minor["name"])
+            for group in section.get("groups", []):
+                if any(code in optimizer.flatten_course_codes(alt) for alt in group):
+                    names.add(minor["name"])
+    return sorted(names)
+
+
+def scan_rank(minors, taken):
+    results = [optimizer.summarize_minor(minor, taken) for minor in minors]
+    return optimizer.sort_minor_results([result for result in results if result])
+
+
+def report(label, seconds, count):
+    print(f"{label:<38} {seconds / count * 1e6:10.1f} us/query")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--minors", type=int, default=150)
+    parser.add_argument("--queries", type=int, default=500)
+    args = parser.parse_args()
+
+    minors = make_catalog(args.minors)
+    store = CatalogStore()
+    store.populate(minors)
+    rng = random.Random(1)
+    codes = [course_code(rng) for _ in range(args.queries)]
+    profiles = [make_taken(rng) for _ in range(max(1, args.queries // 10))]
+
+    for code in codes[:50]:
+        assert store.minors_accepting(code) == scan_minors_accepting(minors, code)
+
+    def timed(fn, items):
+        return timeit.timeit(lambda: [fn(item) for item in items], number=1)
+
+    report("minors accepting code: in-memory scan", timed(lambda c: scan_minors_accepting(minors, c), codes), len(codes))
+    report("minors accepting code: sqlite index", timed(store.minors_accepting, codes), len(codes))
+    report("rank profile: in-memory scan", timed(lambda t: scan_rank(minors, t), profiles), len(profiles))
+    report(
+        "rank profile: sqlite prefilter",
+        timed(lambda t: optimizer.rank_minors_from_store(store, t)[0], profiles),
+        len(profiles),
+    )
+
+if __name__ == "__main__":
+    main()
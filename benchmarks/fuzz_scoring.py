@@ -0,0 +1,233 @@
+"""
+Differential fuzzing of interned scoring against the reference evaluators.
+
+    python benchmarks/fuzz_scoring.py --cases 2000 --seed 0
+
+Generates random minors (nested groups and alternatives, pools with
+subsections, exclusions, missing or zero `required` counts, major
+restrictions) and random taken sets, then scores each case with both
+summarize_minor() and summarize_interned(), and whole batches with
+rank_minors() and rank_interned(). The first mismatch is shrunk to a minimal
+repro, printed as JSON, and the script exits with status 1. Otherwise it
+reports how many summaries per second each path scores.
+"""
+import argparse
+import copy
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import optimizer  # noqa: E402
+from courses import CourseRegistry  # noqa: E402
+
+# A small course universe so taken sets overlap requirements often.
+SUBJECTS = ("CS", "MA", "STAT")
+MAJORS = (None, "None", "Computer Science", "Statistics")
+RESTRICTIONS = ("", "Not available to Computer Science students.", "Statistics majors are not eligible.")
+
+
+def make_code(rng):
+    return f"{rng.choice(SUBJECTS)}{rng.randint(10, 25)}000"
+
+
+def make_alternative(rng, depth):
+    # A single course, or courses taken together, possibly nested.
+    if depth > 1 or rng.random() < 0.6:
+        return [make_code(rng)]
+    return [make_code(rng) if rng.random() < 0.7 else make_alternative(rng, depth + 1) for _ in range(rng.randint(1, 3))]
+
+
+def make_section(rng, depth=0):
+    roll = rng.random()
+    if roll < 0.1:
+        return {"title": "Policy", "kind": "manual", "description": "See advisor.", "excluded_codes": []}
+    required = rng.choice([None, 0, 1, 2, 3, 5])
+    if roll < 0.5:
+        options = [make_code(rng) for _ in range(rng.randint(0, 8))]
+        children = [make_section(rng, depth + 1) for _ in range(rng.randint(0, 2))] if depth < 2 else []
+        section = {"title": f"Pool {depth}", "kind": "pool", "required": required, "options": options}
+        section.update(children=children, notes=[], excluded_codes=rng.sample(options, k=rng.randint(0, len(options) // 2)))
+        return section
+    groups = [[make_alternative(rng, 0) for _ in range(rng.randint(0, 3))] for _ in range(rng.randint(0, 4))]
+    codes = sorted(optimizer.flatten_course_codes(groups))
+    return {
+        "title": f"Required {depth}",
+        # Sections the scraper could not classify have no kind and score as formulas.
+        "kind": rng.choice(["formula", "formula", None]),
+        "required": required,
+        "groups": groups,
+        "codes": codes,
+        "notes": [],
+        "excluded_codes": rng.sample(codes, k=rng.randint(0, len(codes) // 2)),
+    }
+
+
+def make_case(rng, idx=0):
+    """
+    Return one random case: {"minor", "taken", "major"}.
+    """
+    minor = {
+        "name": f"Fuzz {idx} Minor",
+        "link": f"https://catalog.example/fuzz/{idx}",
+        "sections": [make_section(rng) for _ in range(rng.randint(0, 4))],
+        "notes": [],
+        "restriction_text": rng.choice(RESTRICTIONS),
+    }
+    taken = sorted({make_code(rng) for _ in range(rng.randint(0, 12))})
+    return {"minor": minor, "taken": taken, "major": rng.choice(MAJORS)}
+
+
+def first_difference(expected, actual, path="summary"):
+    """
+    Return a description of the first place `actual` differs from `expected`,
+    or None if they are equal.
+    """
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        for key in sorted(expected.keys() | actual.keys(), key=str):
+            if key not in actual or key not in expected:
+                return f"{path}.{key}: only in {'expected' if key in expected else 'actual'}"
+            found = first_difference(expected[key], actual[key], f"{path}.{key}")
+            if found:
+                return found
+        return None
+    if isinstance(expected, list) and isinstance(actual, list) and len(expected) == len(actual):
+        for idx, (left, right) in enumerate(zip(expected, actual)):
+            found = first_difference(left, right, f"{path}[{idx}]")
+            if found:
+                return found
+        return None
+    if expected != actual:
+        return f"{path}: expected {expected!r}, got {actual!r}"
+    return None
+
+
+def check(case):
+    """
+    Score `case` on both paths. Returns a description of the first difference,
+    or None when the interned path matches the reference.
+    """
+    # A fresh registry has no aliases, so both paths compare the same codes.
+    registry = CourseRegistry()
+    interned = optimizer.intern_minor(case["minor"], registry)
+    taken = set(case["taken"])
+    expected = optimizer.summarize_minor(case["minor"], taken, case["major"])
+    actual = optimizer.summarize_interned(interned, registry.ids(taken), registry, case["major"])
+    return first_difference(expected, actual)
+
+
+def _shrinks(value):
+    # Every copy of `value` with one list element removed or one integer made
+    # smaller, smallest changes to the outermost structure first.
+    if isinstance(value, list):
+        for idx in range(len(value)):
+            yield value[:idx] + value[idx + 1:]
+        for idx, item in enumerate(value):
+            for smaller in _shrinks(item):
+                yield value[:idx] + [smaller] + value[idx + 1:]
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            for smaller in _shrinks(item):
+                shrunk = dict(value)
+                shrunk[key] = smaller
+                yield shrunk
+    elif isinstance(value, int) and not isinstance(value, bool) and value > 0:
+        yield value - 1
+
+
+def minimize(case, failing=check):
+    """
+    Shrink a failing case greedily until no single removal still fails.
+    """
+    case = copy.deepcopy(case)
+    shrunk = True
+    while shrunk:
+        shrunk = False
+        for candidate in _shrinks(case):
+            try:
+                still_fails = failing(candidate)
+            except Exception:
+                # A shrink that breaks the input shape is not a smaller repro.
+                continue
+            if still_fails:
+                case = candidate
+                shrunk = True
+                break
+    return case
+
+
+def fuzz(cases, seed=0, batch=50):
+    """
+    Check `cases` random cases, and rank each batch of `batch` minors on both
+    paths. Returns (minimized failing case, its difference) for the first
+    mismatch, or None.
+    """
+    rng = random.Random(seed)
+    generated = []
+    for idx in range(cases):
+        case = make_case(rng, idx)
+        if check(case):
+            case = minimize(case)
+            return case, check(case)
+        generated.append(case)
+        if len(generated) == batch or idx == cases - 1:
+            registry = CourseRegistry()
+            minors = [item["minor"] for item in generated]
+            interned = [optimizer.intern_minor(minor, registry) for minor in minors]
+            taken, major = set(case["taken"]), case["major"]
+            found = first_difference(
+                optimizer.rank_minors(minors, taken, major), optimizer.rank_interned(interned, taken, registry, major)
+            )
+            if found:
+                return {"minors": minors, "taken": sorted(taken), "major": major}, found
+            generated = []
+    return None
+
+
+def throughput(cases, seed=0):
+    """
+    Return (reference, interned) summaries per second over `cases` random cases.
+    """
+    rng = random.Random(seed)
+    generated = [make_case(rng, idx) for idx in range(cases)]
+    registry = CourseRegistry()
+    interned = [optimizer.intern_minor(case["minor"], registry) for case in generated]
+    taken = [set(case["taken"]) for case in generated]
+
+    started = time.perf_counter()
+    for case, codes in zip(generated, taken):
+        optimizer.summarize_minor(case["minor"], codes, case["major"])
+    reference = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for case, minor, codes in zip(generated, interned, taken):
+        optimizer.summarize_interned(minor, registry.ids(codes), registry, case["major"])
+    accelerated = time.perf_counter() - started
+    return cases / reference, cases / accelerated
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cases", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    failure = fuzz(args.cases, args.seed)
+    if failure:
+        case, difference = failure
+        print(f"Mismatch: {difference}")
+        print(json.dumps(case, indent=2))
+        return 1
+    print(f"{args.cases} cases matched in {time.perf_counter() - started:.1f}s (seed {args.seed})")
+    reference, accelerated = throughput(args.cases, args.seed)
+    print(f"{'reference summaries':<22} {reference:12,.0f}/s")
+    print(f"{'interned summaries':<22} {accelerated:12,.0f}/s ({accelerated / reference:.2f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,330 @@
+"""
+Drive a running app.py with many simulated browser sessions, fully offline.
+
+    python benchmarks/load_test.py --sessions 40 --concurrency 8 --slides 5
+    python benchmarks/load_test.py --archive catalog.zip
+
+Starts `streamlit run app.py` on a local port and opens one websocket per
+simulated student, speaking the same protocol as the browser. Each session
+loads the page, submits its courses through the sidebar form, clicks "Find
+minor optimization" and moves the rank slider. The app serves a synthetic
+catalog snapshot by default, a saved one with --snapshot, or one built from a
+recorded page archive with --archive, so nothing touches the network.
+
+Reports throughput, per-step latency percentiles and server memory per live
+session. Needs the `websockets` package, which Streamlit's server installs.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from synthetic import make_catalog, make_taken  # noqa: E402
+
+APP_PATH = os.path.join(ROOT, "app.py")
+STEPS = ("load", "add_courses", "optimize", "slide")
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def rss_kb(pid):
+    try:
+        with open(f"/proc/{pid}/status") as handle:
+            for line in handle:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def build_snapshot(args, workdir, env):
+    """
+    Return the snapshot path the server should warm-start from.
+    """
+    if args.snapshot:
+        return args.snapshot
+    path = os.path.join(workdir, "snapshot.json")
+    if args.archive:
+        replay = dict(env, MINOR_OPTIMIZER_ARCHIVE=args.archive, MINOR_OPTIMIZER_ARCHIVE_MODE="replay")
+        subprocess.run(
+            [sys.executable, os.path.join(ROOT, "cli.py"), "refresh", "--once", "--snapshot", path],
+            env=replay,
+            cwd=workdir,
+            check=True,
+        )
+        return path
+
+    from catalog import CatalogHolder, save_snapshot
+
+    majors = ["Biology", "Computer Science", "Economics"]
+    save_snapshot(CatalogHolder().publish(make_catalog(args.minors), majors=majors), path)
+    return path
+
+
+def start_server(args, workdir):
+    env = dict(os.environ)
+    snapshot = build_snapshot(args, workdir, env)
+    env.update(
+        MINOR_OPTIMIZER_SNAPSHOT=snapshot,
+        MINOR_OPTIMIZER_REFRESH_SECONDS=str(24 * 60 * 60),
+        MINOR_OPTIMIZER_PROFILES=args.profiles or os.path.join(workdir, "no-profiles.json"),
+        MINOR_OPTIMIZER_WORKERS=str(args.workers),
+        MINOR_OPTIMIZER_QUEUE_DEPTH=str(args.queue_depth),
+    )
+    port = free_port()
+    log = open(os.path.join(workdir, "server.log"), "w")
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "streamlit", "run", APP_PATH,
+            "--server.headless", "true",
+            "--server.port", str(port),
+            "--server.address", "127.0.0.1",
+            "--server.enableCORS", "false",
+            "--server.enableXsrfProtection", "false",
+            "--browser.gatherUsageStats", "false",
+        ],
+        env=env,
+        cwd=workdir,
+        stdout=log,
+        stderr=subprocess.STDOUT,
+    )
+    deadline = time.monotonic() + 60
+    while True:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1):
+                return server, port
+        except OSError:
+            if server.poll() is not None or time.monotonic() > deadline:
+                server.kill()
+                with open(log.name) as handle:
+                    raise SystemExit("Streamlit did not start:\n" + handle.read()[-2000:])
+            time.sleep(0.2)
+
+
+class Session:
+    """
+    One simulated browser tab: sends widget changes, waits for the rerun.
+    """
+
+    def __init__(self, port):
+        self.url = f"ws://127.0.0.1:{port}/_stcore/stream"
+        self.widgets = {}
+        self.slider_max = {}
+        # Fragment each widget was drawn in; changing it reruns only that.
+        self.fragments = {}
+        self.errors = []
+        self.deltas = 0
+        self.ws = None
+
+    async def connect(self):
+        import websockets
+
+        self.ws = await websockets.connect(self.url, subprotocols=["streamlit"], max_size=None)
+
+    async def close(self):
+        await self.ws.close()
+
+    async def rerun(self, states=(), fragment_id=None):
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        message = BackMsg()
+        message.rerun_script.query_string = ""
+        if fragment_id:
+            message.rerun_script.fragment_id = fragment_id
+        for state in states:
+            message.rerun_script.widget_states.widgets.append(state)
+        self.deltas = 0
+        started = time.perf_counter()
+        await self.ws.send(message.SerializeToString())
+        while True:
+            forward = ForwardMsg()
+            forward.ParseFromString(await self.ws.recv())
+            kind = forward.WhichOneof("type")
+            if kind == "delta":
+                self.deltas += 1
+                if forward.delta.WhichOneof("type") == "new_element":
+                    self._record(forward.delta.new_element, forward.delta.fragment_id)
+            elif kind == "script_finished":
+                # st.rerun() ends the run early and the server starts the next one.
+                if forward.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    return time.perf_counter() - started
+
+    def _record(self, element, fragment_id=""):
+        kind = element.WhichOneof("type")
+        if kind == "exception":
+            self.errors.append(element.exception.message)
+        widget = getattr(element, kind)
+        label = getattr(widget, "label", None)
+        if label and getattr(widget, "id", None):
+            self.widgets[label] = widget.id
+            self.fragments[label] = fragment_id
+            if kind == "slider":
+                self.slider_max[label] = int(widget.max)
+
+    async def slide(self, label, value):
+        """
+        Move a slider the way the browser does: a slider inside a fragment
+        reruns only that fragment.
+        """
+        return await self.rerun([self.state(label, double_array_value=[value])], self.fragments.get(label))
+
+    def state(self, label, **value):
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        state = WidgetState(id=self.widgets[label])
+        for field, field_value in value.items():
+            if field == "double_array_value":
+                state.double_array_value.data.extend(field_value)
+            else:
+                setattr(state, field, field_value)
+        return state
+
+
+async def run_session(port, courses, slides, timings, active):
+    """
+    Play one student's visit. Returns the still-connected Session, like a
+    browser tab left open, so memory can be measured with every session live.
+    """
+    async with active:
+        session = Session(port)
+        await session.connect()
+        try:
+            timings["load"].append(await session.rerun())
+            courses_input = "Type all your courses taken at Purdue (separated by commas)"
+            timings["add_courses"].append(
+                await session.rerun(
+                    [
+                        session.state(courses_input, string_value=", ".join(courses)),
+                        session.state("Add Courses", trigger_value=True),
+                    ]
+                )
+            )
+            timings["optimize"].append(
+                await session.rerun([session.state("Find minor optimization", trigger_value=True)])
+            )
+            if "Browse ranked minors" in session.widgets:
+                for rank in range(2, min(slides + 1, session.slider_max["Browse ranked minors"]) + 1):
+                    timings["slide"].append(await session.slide("Browse ranked minors", rank))
+        except BaseException:
+            await session.close()
+            raise
+    return session
+
+
+async def drive(args, port, server):
+    rng = random.Random(args.seed)
+    profiles = [sorted(make_taken(rng, args.courses)) for _ in range(args.distinct_profiles or args.sessions)]
+    timings = {step: [] for step in STEPS}
+
+    # One untimed session starts the refresher and warms imports, so measured
+    # sessions see a warmed-up server the way steady traffic would.
+    warm = await run_session(port, profiles[0], 0, {step: [] for step in STEPS}, asyncio.Semaphore(1))
+    await warm.close()
+    base_rss = rss_kb(server.pid)
+
+    active = asyncio.Semaphore(args.concurrency)
+    started = time.perf_counter()
+    sessions = await asyncio.gather(
+        *(
+            run_session(port, profiles[idx % len(profiles)], args.slides, timings, active)
+            for idx in range(args.sessions)
+        )
+    )
+    wall = time.perf_counter() - started
+    rss = rss_kb(server.pid)
+    for session in sessions:
+        await session.close()
+    errors = [error for session in sessions for error in session.errors]
+    return timings, wall, base_rss, rss, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sessions", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=8, help="Sessions interacting at the same time")
+    parser.add_argument("--slides", type=int, default=5, help="Slider moves per session")
+    parser.add_argument("--courses", type=int, default=12, help="Courses per simulated student")
+    parser.add_argument(
+        "--distinct-profiles", type=int, help="Cycle through this many course lists (default: one per session)"
+    )
+    parser.add_argument("--minors", type=int, default=150, help="Synthetic catalog size")
+    parser.add_argument("--snapshot", help="Serve this saved catalog snapshot instead of a synthetic one")
+    parser.add_argument("--archive", help="Build the catalog from this recorded page archive in replay mode")
+    parser.add_argument("--profiles", help="Common profiles file to warm the result cache with")
+    parser.add_argument("--workers", type=int, default=2, help="Optimizer work queue workers")
+    parser.add_argument("--queue-depth", type=int, default=32)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        server, port = start_server(args, workdir)
+        try:
+            timings, wall, base_rss, rss, errors = asyncio.run(drive(args, port, server))
+        finally:
+            server.terminate()
+            server.wait(10)
+
+    actions = sum(len(samples) for samples in timings.values())
+    report = {
+        "sessions": args.sessions,
+        "concurrency": args.concurrency,
+        "wall_seconds": round(wall, 3),
+        "sessions_per_sec": round(args.sessions / wall, 2),
+        "actions_per_sec": round(actions / wall, 2),
+        "latency_ms": {
+            step: {
+                "count": len(samples),
+                "p50": round(percentile(samples, 50) * 1000, 1),
+                "p90": round(percentile(samples, 90) * 1000, 1),
+                "p99": round(percentile(samples, 99) * 1000, 1),
+                "max": round(max(samples, default=0.0) * 1000, 1),
+            }
+            for step, samples in timings.items()
+        },
+        "server_rss_mb": round(rss / 1024, 1) if rss else None,
+        "memory_per_session_kb": round((rss - base_rss) / args.sessions, 1) if rss and base_rss else None,
+        "errors": errors,
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(
+        f"{args.sessions} sessions, {args.concurrency} at a time, in {report['wall_seconds']:.2f}s: "
+        f"{report['sessions_per_sec']} sessions/s, {report['actions_per_sec']} actions/s"
+    )
+    print(f"{'step':<12} {'count':>6} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for step, row in report["latency_ms"].items():
+        print(f"{step:<12} {row['count']:>6} {row['p50']:>9} {row['p90']:>9} {row['p99']:>9} {row['max']:>9}")
+    if report["server_rss_mb"] is not None:
+        print(f"Server RSS {report['server_rss_mb']} MB, ~{report['memory_per_session_kb']} KB per live session")
+    if errors:
+        print(f"{len(errors)} app errors, first: {errors[0]}")
+
+
+if __name__ == "__main__":
+    main()
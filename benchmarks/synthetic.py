@@ -0,0 +1,87 @@
+import json
+import random
+
+SUBJECTS = [
+    "AAE", "ACCT", "AGEC", "ANTH", "ART", "BIOL", "CHM", "COM", "CS", "ECON",
+    "ENGL", "HIST", "HORT", "MA", "ME", "PHIL", "PHYS", "POL", "PSY", "STAT",
+]
+
+
+def course_code(rng):
+    return f"{rng.choice(SUBJECTS)}{rng.randint(100, 599)}00"
+
+
+def make_section(rng, idx):
+    roll = rng.random()
+    if roll < 0.1:
+        return {"title": f"Policy {idx}", "kind": "manual", "description": "See advisor.", "excluded_codes": []}
+    if roll < 0.45:
+        options = sorted({course_code(rng) for _ in range(rng.randint(4, 30))})
+        return {
+            "title": f"Choose from list {idx}",
+            "kind": "pool",
+            "required": rng.randint(1, 4),
+            "options": options,
+            "children": [],
+            "notes": [],
+            "excluded_codes": rng.sample(options, k=min(1, len(options))) if rng.random() < 0.2 else [],
+        }
+    groups = []
+    for _ in range(rng.randint(1, 5)):
+        groups.append(
+            [sorted({course_code(rng) for _ in range(rng.randint(1, 2))}) for _ in range(rng.randint(1, 3))]
+        )
+    codes = sorted({code for group in groups for alt in group for code in alt})
+    return {
+        "title": f"Required Courses {idx}",
+        "kind": "formula",
+        "required": len(groups),
+        "groups": groups,
+        "codes": codes,
+        "notes": [],
+        "excluded_codes": [],
+    }
+
+
+def make_catalog(minor_count=150, seed=0):
+    """
+    Return a deterministic catalog shaped like the scraper's output, for
+    benchmarks that must run offline.
+    """
+    rng = random.Random(seed)
+    return [
+        {
+            "name": f"Synthetic {idx} Minor",
+            "link": f"https://catalog.example/minor/{idx}",
+            "sections": [make_section(rng, s) for s in range(rng.randint(2, 6))],
+            "notes": ["50% of credits must come from Purdue."],
+            "restriction_text": "",
+        }
+        for idx in range(minor_count)
+    ]
+
+
+def make_taken(rng, size=12):
+    return {course_code(rng) for _ in range(size)}
+
+
+def make_years(minors, count=5, change_rate=0.1, seed=0):
+    """
+    Return {year label: minors} for `count` catalog years. Each year is a
+    separate deep copy, as if scraped on its own, in which about `change_rate`
+    of the sections differ from the year before.
+    """
+    rng = random.Random(seed)
+    years = {}
+    current = minors
+    for offset in range(count):
+        label = f"{2025 - offset}-{2026 - offset}"
+        current = json.loads(json.dumps(current))
+        for minor in current:
+            minor["link"] = minor["link"] + f"?year={label}"
+            minor["sections"] = [
+                make_section(rng, idx) if rng.random() < change_rate else section
+                for idx, section in enumerate(minor["sections"])
+            ]
+        years[label] = current
+    return years
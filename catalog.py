@@ -0,0 +1,471 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from functools import partial
+from types import MappingProxyType
+
+import scraper
+from scraper import EMPTY_REQUIREMENTS
+from singleflight import SingleFlight
+
+_flights = SingleFlight()
+_loaders = {}
+_loaders_lock = threading.Lock()
+
+
+class CatalogLoader:
+    """
+    Owns the minors index page, the minor links found on it and each minor's
+    parsed requirements.
+
+    The index is fetched once per loader and requirements load lazily per minor,
+    so `minor_list()`, `requirements()` and `minors_data()` can be mixed freely
+    without refetching anything. `stats()` reports what the loader has fetched.
+    """
+
+    def __init__(self, index_url=None):
+        self.index_url = index_url or scraper.MINORS_PAGE
+        self._lock = threading.Lock()
+        self._flights = SingleFlight()
+        self._links = None
+        self._requirements = {}
+        self._stats = {
+            "pages_fetched": 0,
+            "bytes_fetched": 0,
+            "fetch_seconds": 0.0,
+            "load_seconds": 0.0,
+            "minors_loaded": 0,
+        }
+
+    def _fetch(self, url, deadline=None):
+        started = time.perf_counter()
+        html = scraper._fetch_html(url) if deadline is None else scraper._fetch_html(url, deadline)
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self._stats["pages_fetched"] += 1
+            self._stats["bytes_fetched"] += len(html.encode("utf-8"))
+            self._stats["fetch_seconds"] += elapsed
+        return html
+
+    def _store(self, link, requirements):
+        with self._lock:
+            if link not in self._requirements:
+                self._stats["minors_loaded"] += 1
+            self._requirements[link] = requirements
+
+    def minor_list(self, deadline=None):
+        """
+        Return a list of (minor_name, url) tuples, fetching the index on first use.
+        """
+        if self._links is None:
+            self._flights.do_within(deadline, "index", self._load_index, deadline)
+        return list(self._links)
+
+    def _load_index(self, deadline=None):
+        if self._links is None:
+            self._links = scraper._parse_minor_links(self._fetch(self.index_url, deadline))
+
+    def requirements(self, link):
+        """
+        Return (sections, notes, restriction_text) for one minor, loading it on first use.
+        """
+        with self._lock:
+            cached = self._requirements.get(link)
+        if cached is not None:
+            return cached
+        self._flights.do(("requirements", link), self._load_requirements, link)
+        with self._lock:
+            return self._requirements[link]
+
+    def _load_requirements(self, link):
+        with self._lock:
+            if link in self._requirements:
+                return
+        try:
+            requirements = scraper._parse_minor_page(self._fetch(link))
+        except Exception:
+            requirements = EMPTY_REQUIREMENTS
+        self._store(link, requirements)
+
+    def minors_data(self, progress=None, **pipeline_options):
+        """
+        Return every minor as a dict for the optimizer, loading whatever is still
+        missing through the fetch/parse pipeline.
+        """
+        minors, _ = self.minors_within(None, progress, **pipeline_options)
+        return minors
+
+    def minors_within(self, deadline, progress=None, **pipeline_options):
+        """
+        Like minors_data(), but stop loading when `deadline` expires. Returns
+        (minors, skipped_names): minors already loaded or finished in time, and
+        the names of minors left out. Skipped minors are not cached as empty, so
+        a later load fetches them again.
+        """
+        with scraper.archive_batch():
+            return self._minors_data(progress, deadline, **pipeline_options)
+
+    def _minors_data(self, progress=None, deadline=None, **pipeline_options):
+        started = time.perf_counter()
+        minor_links = self.minor_list(deadline)
+        names = dict((link, name) for name, link in minor_links)
+        with self._lock:
+            missing = [link for _, link in minor_links if link not in self._requirements]
+        skipped = set()
+        if missing:
+            # The pipeline pulls in process pools; only loads that fetch need it.
+            from pipeline import load_minor_pages
+
+            pages, stats = load_minor_pages(
+                missing,
+                progress=(lambda link: progress(names[link])) if progress is not None else None,
+                fetch=self._fetch if deadline is None else partial(self._fetch, deadline=deadline),
+                deadline=deadline,
+                **pipeline_options,
+            )
+            skipped = set(stats["skipped"])
+            for link in missing:
+                if link not in skipped:
+                    self._store(link, pages.get(link, EMPTY_REQUIREMENTS))
+        with self._lock:
+            self._stats["load_seconds"] += time.perf_counter() - started
+            loaded = [
+                (name, link, self._requirements[link]) for name, link in minor_links if link not in skipped
+            ]
+        minors = []
+        for name, link, (sections, notes, restriction_text) in loaded:
+            minors.append(
+                {
+                    "name": name,
+                    "link": link,
+                    "sections": sections,
+                    "notes": notes,
+                    "restriction_text": restriction_text,
+                }
+            )
+        return minors, [names[link] for link in missing if link in skipped]
+
+    def intern_sections(self, pool):
+        """
+        Replace the parsed sections this loader holds with `pool`'s shared
+        copies, so loaders for several catalog years keep each repeated
+        section once.
+        """
+        with self._lock:
+            for link, (sections, notes, restriction_text) in self._requirements.items():
+                self._requirements[link] = ([pool.intern(section) for section in sections], notes, restriction_text)
+
+    def requirements_by_name(self):
+        """
+        Return {minor_name: (sections, notes, restriction_text)} like
+        scraper.get_minors_requirements(), sharing this loader's fetches.
+        """
+        return {name: self.requirements(link) for name, link in self.minor_list()}
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats)
+
+
+def get_loader(index_url=None):
+    """
+    Return the shared loader for `index_url` (the minors index by default).
+
+    The app and scraper.get_minors_requirements() both go through this loader,
+    so the index and each minor page are fetched once per process until
+    `refresh_loader()` swaps in a fresh one.
+    """
+    index_url = index_url or scraper.MINORS_PAGE
+    with _loaders_lock:
+        loader = _loaders.get(index_url)
+        if loader is None:
+            loader = _loaders[index_url] = CatalogLoader(index_url)
+        return loader
+
+
+def refresh_loader(index_url=None):
+    """
+    Replace the shared loader for `index_url` with an empty one and return it.
+    """
+    index_url = index_url or scraper.MINORS_PAGE
+    loader = CatalogLoader(index_url)
+    with _loaders_lock:
+        _loaders[index_url] = loader
+    return loader
+
+
+def load_catalog(progress=None, loader=None, **pipeline_options):
+    """
+    Load every minor's requirements as a list of minor dicts for the optimizer.
+
+    Uses the shared loader unless one is given, so repeat loads reuse pages that
+    are already parsed. Concurrent callers share a single in-flight load;
+    `progress` is called with each minor name as it finishes, but only for the
+    caller running the load.
+    """
+    loader = loader or get_loader()
+    return _flights.do(
+        ("catalog", id(loader)), loader.minors_data, progress, **pipeline_options
+    )
+
+
+def section_hash(section):
+    """
+    Content hash of a parsed section; equal sections hash equally whatever
+    their key order.
+    """
+    blob = json.dumps(section, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()
+
+
+class SectionPool:
+    """
+    Content-addressed store of parsed sections.
+
+    `intern()` returns one shared object per distinct section, so catalog
+    years that repeat a section keep a single copy of it in memory.
+    """
+
+    def __init__(self, sections=None):
+        self._sections = dict(sections or {})
+
+    def intern(self, section):
+        return self._sections.setdefault(section_hash(section), section)
+
+    def intern_minor(self, minor):
+        minor = dict(minor)
+        minor["sections"] = [self.intern(section) for section in minor.get("sections", [])]
+        return minor
+
+    def get(self, key):
+        return self._sections[key]
+
+    def __len__(self):
+        return len(self._sections)
+
+
+class Catalog:
+    """
+    Immutable, versioned snapshot of every minor's requirements.
+
+    `minors` is a tuple of read-only mappings for the default catalog year
+    (`year`). Other catalog years published alongside it are listed in `years`
+    and served by `for_year()` as catalogs of their own, versioned
+    "<version>:<year>" so cached results never mix years. All years share one
+    SectionPool, so a section unchanged between years is stored once. Nested
+    section data is shared with the loader that produced it and must be
+    treated as read-only too. `majors` is the admissions majors list captured
+    alongside it, if any.
+    """
+
+    __slots__ = ("_minors", "_majors", "_version", "_loaded_at", "_year", "_views")
+
+    def __init__(self, minors, version, loaded_at=None, majors=(), years=None, year=None, pool=None):
+        pool = pool if pool is not None else SectionPool()
+        self._minors = tuple(MappingProxyType(pool.intern_minor(minor)) for minor in minors)
+        self._majors = tuple(majors)
+        self._version = version
+        self._loaded_at = time.time() if loaded_at is None else loaded_at
+        self._year = year or scraper.default_catalog_year()
+        self._views = {
+            label: Catalog(year_minors, f"{version}:{label}", self._loaded_at, majors, year=label, pool=pool)
+            for label, year_minors in (years or {}).items()
+            if label != self._year
+        }
+
+    @property
+    def minors(self):
+        return self._minors
+
+    @property
+    def majors(self):
+        return self._majors
+
+    @property
+    def version(self):
+        return self._version
+
+    @property
+    def loaded_at(self):
+        return self._loaded_at
+
+    @property
+    def year(self):
+        return self._year
+
+    @property
+    def years(self):
+        return (self._year, *self._views)
+
+    def for_year(self, year):
+        """
+        Return the catalog for `year`, one of `years`.
+        """
+        if year == self._year:
+            return self
+        return self._views[year]
+
+    def __len__(self):
+        return len(self._minors)
+
+
+class CatalogHolder:
+    """
+    Publishes the current Catalog with read-copy-update semantics.
+
+    Readers call `current()` once per request and keep that reference, so a
+    request in flight keeps using the version it started with. Publishing
+    builds the new Catalog off to the side and replaces the reference in one
+    assignment; only writers take the lock.
+    """
+
+    def __init__(self):
+        self._current = None
+        self._write_lock = threading.Lock()
+
+    def current(self):
+        return self._current
+
+    def publish(self, minors, if_empty=False, majors=(), loaded_at=None, years=None, year=None):
+        """
+        Swap in a new Catalog built from `minors` and return the published one.
+        `years` maps other catalog years to their minors. With if_empty=True an
+        existing catalog is kept and returned instead.
+        """
+        with self._write_lock:
+            previous = self._current
+            if if_empty and previous is not None:
+                return previous
+            catalog = Catalog(
+                minors,
+                version=(previous.version + 1) if previous else 1,
+                loaded_at=loaded_at,
+                majors=majors,
+                years=years,
+                year=year,
+            )
+            self._current = catalog
+            return catalog
+
+    def install(self, catalog):
+        """
+        Swap in an already built catalog object (e.g. a MappedCatalog).
+        """
+        with self._write_lock:
+            self._current = catalog
+            return catalog
+
+
+_holder = CatalogHolder()
+
+
+def get_catalog_holder():
+    return _holder
+
+
+def current_catalog(progress=None, **pipeline_options):
+    """
+    Return the published Catalog, loading and publishing one first if needed.
+    """
+    catalog = _holder.current()
+    if catalog is None:
+        catalog = _holder.publish(load_catalog(progress, **pipeline_options), if_empty=True)
+    return catalog
+
+
+def refresh_catalog_in_background(holder=None, **pipeline_options):
+    """
+    Reload the catalog from a fresh loader on a background thread and swap it
+    in when complete. Readers keep the old version until then. Returns the thread.
+    """
+    holder = holder or _holder
+
+    def refresh():
+        loader = CatalogLoader()
+        minors = loader.minors_data(**pipeline_options)
+        with _loaders_lock:
+            _loaders[loader.index_url] = loader
+        holder.publish(minors)
+
+    thread = threading.Thread(target=refresh, name="catalog-refresh", daemon=True)
+    thread.start()
+    return thread
+
+
+def save_snapshot(catalog, path):
+    """
+    Write `catalog` to `path` as JSON, replacing the file atomically. Every
+    catalog year is saved, and each distinct section is written once and
+    referenced from minors by its content hash.
+    """
+    sections = {}
+
+    def pack(minors):
+        packed = []
+        for minor in minors:
+            minor = dict(minor)
+            hashes = []
+            for section in minor.get("sections", []):
+                key = section_hash(section)
+                sections.setdefault(key, section)
+                hashes.append(key)
+            minor["sections"] = hashes
+            packed.append(minor)
+        return packed
+
+    payload = {
+        "loaded_at": catalog.loaded_at,
+        "majors": list(catalog.majors),
+        "year": catalog.year,
+        "minors": pack(catalog.minors),
+        "years": {year: pack(catalog.for_year(year).minors) for year in catalog.years[1:]},
+        "sections": sections,
+    }
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        json.dump(payload, handle)
+    os.replace(tmp_path, path)
+
+
+def _read_snapshot(path):
+    with open(path, encoding="utf-8") as handle:
+        payload = json.load(handle)
+    pool = SectionPool(payload.get("sections"))
+
+    def unpack(minors):
+        # Snapshots written before sections were pooled hold them inline.
+        for minor in minors:
+            minor["sections"] = [
+                pool.get(section) if isinstance(section, str) else section for section in minor.get("sections", [])
+            ]
+        return minors
+
+    payload["minors"] = unpack(payload["minors"])
+    payload["years"] = {year: unpack(minors) for year, minors in payload.get("years", {}).items()}
+    return payload
+
+
+def load_snapshot(path):
+    """
+    Return (minors, majors, loaded_at) for the default catalog year from a
+    snapshot written by save_snapshot().
+    """
+    payload = _read_snapshot(path)
+    return payload["minors"], payload.get("majors", []), payload.get("loaded_at")
+
+
+def load_snapshot_years(path):
+    """
+    Return (minors, majors, loaded_at, years, year) from a snapshot: the
+    default year's minors and label, plus {label: minors} for the others.
+    """
+    payload = _read_snapshot(path)
+    return (
+        payload["minors"],
+        payload.get("majors", []),
+        payload.get("loaded_at"),
+        payload["years"],
+        payload.get("year"),
+    )
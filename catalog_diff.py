@@ -0,0 +1,218 @@
+from catalog import section_hash
+from optimizer import catalog_course_codes
+
+# Fields compared section by section; `children` are diffed as sections.
+SECTION_FIELDS = ("kind", "required", "description", "groups", "options", "codes", "excluded_codes", "notes")
+# Fields holding unordered sets of course codes or notes.
+SET_FIELDS = {"options", "codes", "excluded_codes", "notes"}
+MINOR_FIELDS = ("link", "restriction_text", "notes")
+
+
+def _change(field, old, new):
+    if field in SET_FIELDS:
+        old, new = set(old or ()), set(new or ())
+        return {"added": sorted(new - old), "removed": sorted(old - new)}
+    if field == "groups":
+        old = [_describe_group(group) for group in old or ()]
+        new = [_describe_group(group) for group in new or ()]
+        return {
+            "added": [group for group in new if group not in old],
+            "removed": [group for group in old if group not in new],
+        }
+    return {"old": old, "new": new}
+
+
+def _describe_group(group):
+    # One requirement group as text: alternatives joined by "or", courses taken
+    # together joined by "+".
+    def describe(alternative):
+        if isinstance(alternative, str):
+            return alternative
+        return " + ".join(describe(item) for item in alternative)
+
+    return " or ".join(describe(alternative) for alternative in group)
+
+
+def _keyed(sections):
+    # Sections are matched by title; repeated titles by their order.
+    keyed = {}
+    for section in sections:
+        title = section.get("title", "")
+        key = title
+        count = 1
+        while key in keyed:
+            count += 1
+            key = f"{title} ({count})"
+        keyed[key] = section
+    return keyed
+
+
+def diff_sections(old_sections, new_sections):
+    """
+    Compare two section lists. Returns {"added": [titles], "removed": [titles],
+    "changed": {title: {field: change}}}, or None when they are equal. Sections
+    with equal content hashes are skipped without comparing fields.
+    """
+    old, new = _keyed(old_sections), _keyed(new_sections)
+    changed = {}
+    for key in old.keys() & new.keys():
+        before, after = old[key], new[key]
+        if section_hash(before) == section_hash(after):
+            continue
+        fields = {
+            field: _change(field, before.get(field), after.get(field))
+            for field in SECTION_FIELDS
+            if before.get(field) != after.get(field)
+        }
+        children = diff_sections(before.get("children", []), after.get("children", []))
+        if children:
+            fields["children"] = children
+        changed[key] = fields
+    added = [key for key in new if key not in old]
+    removed = [key for key in old if key not in new]
+    if not (added or removed or changed):
+        return None
+    return {"added": added, "removed": removed, "changed": dict(sorted(changed.items()))}
+
+
+def diff_minors(old_minors, new_minors):
+    """
+    Compare two lists of parsed minors by name. Returns {"added", "removed",
+    "changed", "unchanged"}: names added and removed, {name: {"fields",
+    "sections"}} for changed minors, and how many were unchanged. A minor
+    whose content hash is unchanged is skipped without walking its sections.
+    """
+    old = {minor["name"]: minor for minor in old_minors}
+    new = {minor["name"]: minor for minor in new_minors}
+    changed = {}
+    unchanged = 0
+    for name in old.keys() & new.keys():
+        before, after = old[name], new[name]
+        # Catalog minors are read-only mappings; hash them as plain dicts.
+        if section_hash(dict(before)) == section_hash(dict(after)):
+            unchanged += 1
+            continue
+        changed[name] = {
+            "fields": {
+                field: _change(field, before.get(field), after.get(field))
+                for field in MINOR_FIELDS
+                if before.get(field) != after.get(field)
+            },
+            "sections": diff_sections(before.get("sections", []), after.get("sections", [])),
+        }
+    return {
+        "added": sorted(new.keys() - old.keys()),
+        "removed": sorted(old.keys() - new.keys()),
+        "changed": dict(sorted(changed.items())),
+        "unchanged": unchanged,
+    }
+
+
+def diff_catalogs(old, new):
+    """
+    Compare two catalogs (Catalog or MappedCatalog), every catalog year
+    included. Returns a report dict:
+
+    - "years": {year: diff_minors() result} for years whose minors differ
+    - "added_years" / "removed_years": catalog years only in one catalog
+    - "majors": {"added", "removed"}
+    - "new_courses": codes the new catalog lists that the old one did not
+    - "invalidate": names of the caches built from the old catalog that the
+      change makes stale (empty when nothing changed)
+    """
+    added_years = [year for year in new.years if year not in old.years]
+    removed_years = [year for year in old.years if year not in new.years]
+    years = {}
+    for year in new.years:
+        if year not in old.years:
+            continue
+        minors = diff_minors(old.for_year(year).minors, new.for_year(year).minors)
+        if minors["added"] or minors["removed"] or minors["changed"]:
+            years[year] = minors
+    majors = {
+        "added": sorted(set(new.majors) - set(old.majors)),
+        "removed": sorted(set(old.majors) - set(new.majors)),
+    }
+    touched = [
+        minor
+        for year in new.years
+        for minor in new.for_year(year).minors
+        if year in added_years or minor["name"] in years.get(year, {}).get("changed", ())
+        or minor["name"] in years.get(year, {}).get("added", ())
+    ]
+    new_courses = catalog_course_codes(touched)
+    if new_courses:
+        new_courses -= set().union(*(catalog_course_codes(old.for_year(year).minors) for year in old.years))
+
+    invalidate = []
+    default_changed = bool(new.year in years or majors["added"] or majors["removed"])
+    if years or added_years or removed_years or default_changed:
+        invalidate += ["result cache", "interned minors", "search index", "snapshot"]
+    if default_changed:
+        invalidate += ["compiled catalog", "SQLite store"]
+    if new_courses:
+        invalidate.append("prerequisites")
+    return {
+        "years": years,
+        "added_years": added_years,
+        "removed_years": removed_years,
+        "majors": majors,
+        "new_courses": sorted(new_courses),
+        "invalidate": invalidate,
+    }
+
+
+def _format_change(field, change):
+    if "old" in change:
+        return f"{field} {change['old']!r} -> {change['new']!r}"
+
+    def item(text):
+        # Group and note text has spaces of its own; bracket it.
+        return f"[{text}]" if " " in str(text) else text
+
+    parts = [f"+{item(text)}" for text in change["added"]] + [f"-{item(text)}" for text in change["removed"]]
+    return f"{field} {' '.join(parts)}"
+
+
+def _format_sections(sections, indent):
+    lines = []
+    for title in sections["added"]:
+        lines.append(f"{indent}+ section {title!r}")
+    for title in sections["removed"]:
+        lines.append(f"{indent}- section {title!r}")
+    for title, fields in sections["changed"].items():
+        changes = [_format_change(field, change) for field, change in fields.items() if field != "children"]
+        lines.append(f"{indent}~ section {title!r}: {'; '.join(changes) or 'subsections changed'}")
+        if "children" in fields:
+            lines.extend(_format_sections(fields["children"], indent + "    "))
+    return lines
+
+
+def format_diff(report):
+    """
+    Render a diff_catalogs() report as a short plain-text change report, one
+    line per added, removed or changed minor and section.
+    """
+    lines = []
+    for year, minors in report["years"].items():
+        lines.append(
+            f"{year}: {len(minors['changed'])} changed, {len(minors['added'])} added, "
+            f"{len(minors['removed'])} removed, {minors['unchanged']} unchanged"
+        )
+        lines.extend(f"  + {name}" for name in minors["added"])
+        lines.extend(f"  - {name}" for name in minors["removed"])
+        for name, change in minors["changed"].items():
+            fields = [_format_change(field, field_change) for field, field_change in change["fields"].items()]
+            lines.append(f"  ~ {name}" + (f": {'; '.join(fields)}" if fields else ""))
+            if change["sections"]:
+                lines.extend(_format_sections(change["sections"], "      "))
+    lines.extend(f"+ catalog year {year}" for year in report["added_years"])
+    lines.extend(f"- catalog year {year}" for year in report["removed_years"])
+    if report["majors"]["added"] or report["majors"]["removed"]:
+        lines.append(_format_change("Majors:", report["majors"]))
+    if report["new_courses"]:
+        lines.append(f"New courses: {', '.join(report['new_courses'])}")
+    if not report["invalidate"]:
+        return "No changes."
+    lines.append(f"Invalidate: {', '.join(report['invalidate'])}")
+    return "\n".join(lines)
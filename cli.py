@@ -0,0 +1,172 @@
+import argparse
+import logging
+import sys
+import time
+
+from prereqs import DEFAULT_FETCH_WORKERS, DEFAULT_PREREQS_PATH
+from profiling import DEFAULT_PROFILE_DIR, DEFAULT_TOP
+from refresher import DEFAULT_REFRESH_SECONDS, CatalogRefresher
+
+
+def cmd_refresh(args):
+    refresher = CatalogRefresher(
+        interval=args.interval,
+        snapshot_path=args.snapshot,
+        store_path=args.store,
+        compiled_path=args.compiled,
+    )
+    if args.once:
+        ok = refresher.refresh_once()
+        print(refresher.stats())
+        return 0 if ok else 1
+
+    refresher.start()
+    try:
+        while True:
+            time.sleep(args.interval)
+            print(refresher.stats(), flush=True)
+    except KeyboardInterrupt:
+        refresher.stop()
+    return 0
+
+
+def cmd_warm(args):
+    from catalog import CatalogHolder, load_snapshot
+    from result_cache import ResultCache, load_profiles, warm_cache
+
+    minors, majors, loaded_at = load_snapshot(args.snapshot)
+    catalog = CatalogHolder().publish(minors, majors=majors, loaded_at=loaded_at)
+    profiles = load_profiles(args.profiles)
+    cache = ResultCache()
+    started = time.perf_counter()
+    computed = warm_cache(cache, catalog, profiles)
+    elapsed = time.perf_counter() - started
+    print(f"Warmed {computed} profiles in {elapsed:.2f}s ({elapsed / max(computed, 1) * 1000:.1f} ms each)")
+    print(cache.stats())
+    return 0
+
+
+def cmd_profile(args):
+    from catalog import load_snapshot
+    from courses import canonical_code
+    from equivalencies import get_equivalencies
+    from optimizer import rank_minors
+    from profiling import profile_call
+    from share import decode_profile
+
+    minors, _, _ = load_snapshot(args.snapshot)
+    if args.link:
+        profile = decode_profile(args.link)
+        taken = {course["code"] for course in profile["courses"]}
+        major = profile["major"]
+    else:
+        taken = {canonical_code(code) for code in args.courses.split(",") if code.strip()}
+        major = args.major
+    taken = get_equivalencies().expand(taken)
+
+    def run():
+        for _ in range(args.repeat):
+            results, _ = rank_minors(minors, taken, major)
+        return results
+
+    results, path, rows = profile_call(run, directory=args.out, label="cli", limit=args.top)
+    print(f"Ranked {len(results)} minors {args.repeat}x; stats saved to {path}")
+    print(f"{'cumtime':>10} {'tottime':>10} {'calls':>8}  function")
+    for row in rows:
+        print(f"{row['cumtime']:>10.4f} {row['tottime']:>10.4f} {row['calls']:>8}  {row['function']}")
+    return 0
+
+
+def cmd_prereqs(args):
+    from catalog import load_snapshot
+    from prereqs import build_prereq_graph
+
+    minors, _, _ = load_snapshot(args.snapshot)
+    started = time.perf_counter()
+    graph = build_prereq_graph(
+        [minor["link"] for minor in minors],
+        workers=args.workers,
+        progress=lambda done, found: print(f"{done}/{found} course pages", flush=True),
+    )
+    graph.save(args.out)
+    print(f"Saved prerequisites for {len(graph)} courses to {args.out} in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+def cmd_diff(args):
+    import json
+
+    from catalog import CatalogHolder, load_snapshot_years
+    from catalog_diff import diff_catalogs, format_diff
+
+    def snapshot_catalog(path):
+        minors, majors, loaded_at, years, year = load_snapshot_years(path)
+        return CatalogHolder().publish(minors, majors=majors, loaded_at=loaded_at, years=years, year=year)
+
+    report = diff_catalogs(snapshot_catalog(args.old), snapshot_catalog(args.new))
+    print(json.dumps(report, indent=2) if args.json else format_diff(report))
+    return 1 if report["invalidate"] else 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Purdue Minor Optimizer maintenance commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    refresh = commands.add_parser(
+        "refresh", help="Scrape the catalog into a snapshot file the app warm-starts from"
+    )
+    refresh.add_argument("--snapshot", default="catalog_snapshot.json")
+    refresh.add_argument("--store", help="Also write the catalog to this SQLite database")
+    refresh.add_argument(
+        "--compiled", help="Also write a memory-mapped catalog file for worker processes to share"
+    )
+    refresh.add_argument("--interval", type=float, default=DEFAULT_REFRESH_SECONDS)
+    refresh.add_argument("--once", action="store_true", help="Refresh once and exit")
+    refresh.set_defaults(func=cmd_refresh)
+
+    warm = commands.add_parser(
+        "warm", help="Score the common profiles against a snapshot to check and time a cache warm-up"
+    )
+    warm.add_argument("--snapshot", default="catalog_snapshot.json")
+    warm.add_argument("--profiles", default="common_profiles.json")
+    warm.set_defaults(func=cmd_warm)
+
+    profile = commands.add_parser(
+        "profile", help="Profile ranking one student profile against a snapshot with cProfile"
+    )
+    profile.add_argument("--snapshot", default="catalog_snapshot.json")
+    source = profile.add_mutually_exclusive_group(required=True)
+    source.add_argument("--courses", help="Comma-separated course codes, e.g. 'CS 18000, MA 16100'")
+    source.add_argument("--link", help="Profile token from a shared link's ?p= parameter")
+    profile.add_argument("--major")
+    profile.add_argument("--repeat", type=int, default=1, help="Rank this many times in one profile")
+    profile.add_argument("--top", type=int, default=DEFAULT_TOP)
+    profile.add_argument("--out", default=DEFAULT_PROFILE_DIR, help="Directory for the .pstats file")
+    profile.set_defaults(func=cmd_profile)
+
+    prereqs = commands.add_parser(
+        "prereqs", help="Scrape the prerequisites of every course the snapshot's minors link to"
+    )
+    prereqs.add_argument("--snapshot", default="catalog_snapshot.json")
+    prereqs.add_argument("--out", default=DEFAULT_PREREQS_PATH)
+    prereqs.add_argument("--workers", type=int, default=DEFAULT_FETCH_WORKERS, help="Course pages fetched at once")
+    prereqs.set_defaults(func=cmd_prereqs)
+
+    diff = commands.add_parser(
+        "diff", help="Report which minors, sections and caches changed between two snapshots"
+    )
+    diff.add_argument("old", help="Earlier snapshot file")
+    diff.add_argument("new", help="Later snapshot file")
+    diff.add_argument("--json", action="store_true", help="Print the full report as JSON")
+    diff.set_defaults(func=cmd_diff)
+    return parser
+
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO)
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,204 @@
+import json
+import os
+import re
+import threading
+from bisect import bisect_left
+
+DEFAULT_ALIASES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "course_aliases.json")
+
+_CODE_RE = re.compile(r"^([A-Z]{2,5})(\d{3,5})$")
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def normalize_code(code):
+    """
+    Spell a course code the way the catalog does: upper case, no spaces, and a
+    five-digit number, so "cs 180" and "CS180" both become "CS18000". Codes
+    that do not look like Purdue course codes (test credits, for example) are
+    only upper-cased and stripped of spaces.
+    """
+    compact = re.sub(r"[\s\-]+", "", code.upper())
+    match = _CODE_RE.match(compact)
+    if not match:
+        return re.sub(r"\s+", "", code.upper())
+    subject, number = match.groups()
+    return subject + number.ljust(5, "0")
+
+
+class CourseRegistry:
+    """
+    Maps every spelling of a course to one canonical code and interns each
+    canonical code to a small integer ID.
+
+    Aliases cover cross-listed courses (e.g. STAT 41600 listed as MA 41600).
+    IDs are assigned on first use and never change for the registry's
+    lifetime, so sets of IDs built at different times can be compared.
+    """
+
+    def __init__(self, aliases=None):
+        self._lock = threading.Lock()
+        self._aliases = {}
+        self._ids = {}
+        self._codes = []
+        for alias, canonical in (aliases or {}).items():
+            self.add_alias(alias, canonical)
+
+    def add_alias(self, alias, canonical):
+        alias = normalize_code(alias)
+        if alias in self._ids:
+            # Lookups trust interned codes to be canonical.
+            raise ValueError(f"{alias} is already interned and cannot become an alias")
+        self._aliases[alias] = normalize_code(canonical)
+
+    def canonical(self, code):
+        normalized = normalize_code(code)
+        return self._aliases.get(normalized, normalized)
+
+    def intern(self, code):
+        """
+        Return the ID for `code`, assigning the next free one if it is new.
+        """
+        # Catalog codes are already canonical; skip normalizing them.
+        course_id = self._ids.get(code)
+        if course_id is not None:
+            return course_id
+        canonical = self.canonical(code)
+        course_id = self._ids.get(canonical)
+        if course_id is not None:
+            return course_id
+        with self._lock:
+            course_id = self._ids.get(canonical)
+            if course_id is None:
+                course_id = self._ids[canonical] = len(self._codes)
+                self._codes.append(canonical)
+            return course_id
+
+    def id_of(self, code):
+        """
+        Return the ID for `code`, or None if it was never interned.
+        """
+        course_id = self._ids.get(code)
+        if course_id is None:
+            course_id = self._ids.get(self.canonical(code))
+        return course_id
+
+    def ids(self, codes):
+        """
+        Return the frozenset of IDs for the known codes in `codes`. Unknown codes
+        cannot match any requirement, so they are dropped rather than interned.
+        """
+        ids = set()
+        for code in codes:
+            course_id = self.id_of(code)
+            if course_id is not None:
+                ids.add(course_id)
+        return frozenset(ids)
+
+    def code(self, course_id):
+        return self._codes[course_id]
+
+    def codes(self, course_ids):
+        return [self._codes[course_id] for course_id in course_ids]
+
+    def __len__(self):
+        return len(self._codes)
+
+
+class CourseIndex:
+    """
+    Sorted course codes, and the words of their titles, for completing what a
+    student has typed so far.
+
+    Completion is a bisection into the sorted arrays followed by a short scan,
+    so it stays well under a millisecond with tens of thousands of courses.
+    """
+
+    def __init__(self, codes, titles=None):
+        self._codes = sorted({normalize_code(code) for code in codes})
+        self._known = set(self._codes)
+        self._titles = {code: title for code, title in (titles or {}).items() if title}
+        self._words = sorted(
+            (word, code)
+            for code in self._codes
+            for word in set(re.findall(r"[a-z0-9]+", self._titles.get(code, "").lower()))
+        )
+
+    def title(self, code):
+        return self._titles.get(code, "")
+
+    def complete(self, text, limit=10):
+        """
+        Return up to `limit` (code, title) pairs for codes starting with `text`
+        ("cs 25" -> CS25000, CS25100, ...), then for titles with a word
+        starting with it.
+        """
+        prefix = re.sub(r"[\s\-]+", "", text.upper())
+        if not prefix:
+            return []
+        # Walk by position; slicing would copy the rest of the array.
+        matches = []
+        position = bisect_left(self._codes, prefix)
+        while position < len(self._codes) and len(matches) < limit and self._codes[position].startswith(prefix):
+            matches.append(self._codes[position])
+            position += 1
+        word = text.strip().lower()
+        if word.isalpha():
+            position = bisect_left(self._words, (word, ""))
+            while position < len(self._words) and len(matches) < limit and self._words[position][0].startswith(word):
+                code = self._words[position][1]
+                if code not in matches:
+                    matches.append(code)
+                position += 1
+        return [(code, self.title(code)) for code in matches]
+
+    def suggest(self, code, limit=5):
+        """
+        Return (code, title) pairs for courses close to `code`, found by
+        completing ever shorter prefixes of it; empty if `code` is known. Stops
+        at the subject plus one digit, so "CS18100" suggests CS18000 and
+        CS18200 but never every CS course.
+        """
+        code = normalize_code(code)
+        if code in self._known:
+            return []
+        match = re.match(r"[A-Z]+\d", code)
+        shortest = match.end() if match else len(code)
+        for end in range(len(code) - 1, shortest - 1, -1):
+            matches = self.complete(code[:end], limit)
+            if matches:
+                return matches
+        return []
+
+    def __contains__(self, code):
+        return code in self._known
+
+    def __len__(self):
+        return len(self._codes)
+
+
+def load_aliases(path):
+    """
+    Read {"alias": "canonical", ...} from a JSON file.
+    """
+    with open(path, "r", encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def get_registry():
+    """
+    Return the process-wide registry, with aliases from
+    MINOR_OPTIMIZER_COURSE_ALIASES (default: course_aliases.json next to this
+    module) when that file exists.
+    """
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            path = os.environ.get("MINOR_OPTIMIZER_COURSE_ALIASES", DEFAULT_ALIASES_PATH)
+            _registry = CourseRegistry(load_aliases(path) if os.path.exists(path) else None)
+        return _registry
+
+
+def canonical_code(code):
+    return get_registry().canonical(code)
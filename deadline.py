@@ -0,0 +1,47 @@
+import time
+
+# Budget for a request that has to load minors itself because no catalog has
+# been published yet.
+DEFAULT_REQUEST_SECONDS = 20
+
+
+class DeadlineExceeded(TimeoutError):
+    """
+    A step failed because its caller's deadline ran out. Callers sharing the
+    step through SingleFlight retry with their own budget instead of inheriting it.
+    """
+
+
+class Deadline:
+    """
+    A point in time a request must finish by.
+
+    Pass one down a load so each blocking step waits at most for what is left
+    of the budget instead of its own fixed timeout.
+    """
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self._expires_at = time.monotonic() + seconds
+
+    def remaining(self):
+        return max(0.0, self._expires_at - time.monotonic())
+
+    def expired(self):
+        return self.remaining() == 0.0
+
+    def timeout(self, cap):
+        """
+        Return `cap` seconds, shortened to what is left of the budget.
+        """
+        return min(cap, self.remaining())
+
+    def __repr__(self):
+        return f"Deadline({self.seconds}s, {self.remaining():.2f}s left)"
+
+
+def remaining_timeout(deadline, cap):
+    """
+    Timeout for one blocking step: `cap`, or less when `deadline` is closer.
+    """
+    return cap if deadline is None else deadline.timeout(cap)
@@ -0,0 +1,113 @@
+import json
+import os
+import re
+import threading
+
+from courses import canonical_code
+
+DEFAULT_EQUIVALENCIES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "transfer_equivalencies.json")
+# Highest score on any exam the table covers (IB scores run to 7).
+MAX_SCORE = 7
+
+_SCORED_RE = re.compile(r"^(.*\D)(\d)$")
+
+_table = None
+_table_lock = threading.Lock()
+
+
+def credit_key(text):
+    """
+    Spelling-independent key for an exam or transfer course: the canonical
+    code the app stores, letters and digits only. "AP Calculus BC: 5" becomes
+    "APCALCULUSBC5" and "MATH 151" becomes "MATH15100".
+    """
+    return re.sub(r"[^A-Z0-9]", "", canonical_code(text).upper())
+
+
+class EquivalencyTable:
+    """
+    Purdue equivalents of test and transfer credits.
+
+    Every (credit, score) pair a student could enter is expanded when the
+    table loads, so a lookup is one or two dictionary probes. Scores in the
+    file are minimums: {"4": [...]} applies to scores of 4 and up. Credits
+    without a score (transfer courses) list their equivalents under "courses".
+    """
+
+    def __init__(self, credits=None):
+        self._courses = {}
+        self._labels = {}
+        for label, entry in (credits or {}).items():
+            keys = [credit_key(name) for name in [label, *entry.get("aliases", [])]]
+            equivalents = {None: entry["courses"]} if "courses" in entry else {}
+            thresholds = sorted((int(score), courses) for score, courses in entry.get("scores", {}).items())
+            for score in range(1, MAX_SCORE + 1):
+                met = [courses for threshold, courses in thresholds if score >= threshold]
+                if met:
+                    equivalents[score] = met[-1]
+            for key in keys:
+                self._labels[key] = label
+                for score, courses in equivalents.items():
+                    self._courses[(key, score)] = tuple(canonical_code(code) for code in courses)
+
+    def _probe(self, credit):
+        key = credit_key(credit)
+        courses = self._courses.get((key, None))
+        if courses is not None:
+            return key, courses
+        # "AP Calc BC 5", "AP Calc BC: 5" and "APCALCBC5" all end in the score.
+        match = _SCORED_RE.match(key)
+        if match:
+            courses = self._courses.get((match.group(1), int(match.group(2))))
+            if courses is not None:
+                return match.group(1), courses
+        return None, ()
+
+    def lookup(self, credit):
+        """
+        Return the Purdue course codes `credit` counts as, or () if the table
+        does not cover it (or the score earns no credit).
+        """
+        return self._probe(credit)[1]
+
+    def label(self, credit):
+        """
+        Return the table's name for `credit`, or "" if it is not covered.
+        """
+        key, _ = self._probe(credit)
+        return self._labels.get(key, "")
+
+    def expand(self, codes):
+        """
+        Return `codes` plus the Purdue equivalents of every credit among them.
+        """
+        taken = set(codes)
+        for code in list(taken):
+            taken.update(self.lookup(code))
+        return taken
+
+    def __len__(self):
+        return len(set(self._labels.values()))
+
+
+def load_equivalencies(path):
+    """
+    Read {"credit name": {"aliases": [...], "scores": {"min score": [codes]}
+    or "courses": [codes]}, ...} from a JSON file.
+    """
+    with open(path, "r", encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def get_equivalencies():
+    """
+    Return the process-wide table, loaded from MINOR_OPTIMIZER_EQUIVALENCIES
+    (default: transfer_equivalencies.json next to this module) when that file
+    exists.
+    """
+    global _table
+    with _table_lock:
+        if _table is None:
+            path = os.environ.get("MINOR_OPTIMIZER_EQUIVALENCIES", DEFAULT_EQUIVALENCIES_PATH)
+            _table = EquivalencyTable(load_equivalencies(path) if os.path.exists(path) else None)
+        return _table
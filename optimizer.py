@@ -1,5 +1,16 @@
 import math
 import re
+from bisect import bisect_left
+from itertools import combinations
+
+from courses import normalize_code
+
+DEFAULT_COURSES_PER_SEMESTER = 3
+DEFAULT_LAST_SEMESTER = 8
+# Each planned semester picks from the `cap` most pressing courses plus this
+# many more, and the planner settles for a greedy plan after this many states.
+PLAN_BRANCH_SLACK = 2
+MAX_PLAN_STATES = 5000
 
 
 def flatten_course_codes(value):
@@ -166,6 +177,548 @@ def sort_minor_results(results):
     return sorted(results, key=lambda item: (-item["percent"], item["total"] - item["completed"], item["name"]))
 
 
+def rank_minors(minors, taken, major=None):
+    """
+    Score every minor against `taken`. Returns (sorted results, names of minors
+    skipped because `major` matches their restriction).
+    """
+    results = []
+    skipped_minors = []
+    for minor in minors:
+        if major_restriction_applies(major, minor.get("restriction_text", "")):
+            skipped_minors.append(minor["name"])
+            continue
+        summary = summarize_minor(minor, taken, major)
+        if summary is not None:
+            results.append(summary)
+    return sort_minor_results(results), skipped_minors
+
+
+def intern_minor(minor, registry):
+    """
+    Precompute a minor for scoring on integer course IDs from `registry`.
+
+    Exclusions are applied and option lists ordered once here, so scoring a
+    student only does set lookups. The original dicts are kept for titles,
+    notes and other fields that pass through to the results unchanged.
+    """
+    sections = []
+    for section in minor.get("sections", []):
+        kind = section.get("kind")
+        excluded = set(section.get("excluded_codes", []))
+        if kind == "pool":
+            options = sorted(set(code for code in section.get("options", []) if code not in excluded))
+            total = section.get("required") or max(1, len(options) // 3)
+            sections.append(("pool", section, (tuple(registry.intern(code) for code in options), total)))
+        elif kind == "manual":
+            sections.append(("manual", section, None))
+        else:
+            groups = tuple(
+                tuple(
+                    tuple(registry.intern(code) for code in flatten_course_codes(alt) if code not in excluded)
+                    for alt in group
+                )
+                for group in section.get("groups", [])
+            )
+            sections.append(("formula", section, (groups, section.get("required") or len(groups))))
+    return {"minor": minor, "sections": tuple(sections)}
+
+
+def _evaluate_interned_formula(section, groups, total, taken_ids, registry):
+    completed = 0
+    taken_ids_used = set()
+    pending_groups = []
+    for group in groups:
+        best_missing = None
+        best_alt = None
+        satisfied = False
+        for alt in group:
+            if not alt:
+                continue
+            missing = [course_id for course_id in alt if course_id not in taken_ids]
+            if not missing:
+                completed += 1
+                taken_ids_used.update(alt)
+                satisfied = True
+                break
+            if best_missing is None or len(missing) < len(best_missing):
+                best_missing = missing
+                best_alt = alt
+        if not satisfied:
+            pending_groups.append(
+                {"options": registry.codes(best_alt or ()), "missing": registry.codes(best_missing or ())}
+            )
+    return {
+        "kind": "formula",
+        "title": section.get("title", "Section"),
+        "total": total,
+        "completed": min(completed, total),
+        "percent": (completed / total * 100) if total else 0,
+        "taken_codes": sorted(registry.codes(taken_ids_used)),
+        "pending_groups": pending_groups,
+        "notes": section.get("notes", []),
+    }
+
+
+def _evaluate_interned_pool(section, options, total, taken_ids, registry):
+    selected = [course_id for course_id in options if course_id in taken_ids]
+    completed = min(total, len(selected))
+    return {
+        "kind": "pool",
+        "title": section.get("title", "Section"),
+        "total": total,
+        "completed": completed,
+        "percent": (completed / total * 100) if total else 0,
+        "taken_codes": registry.codes(selected),
+        "remaining_options": [registry.code(course_id) for course_id in options if course_id not in taken_ids],
+        "children": section.get("children", []),
+        "notes": section.get("notes", []),
+    }
+
+
+def summarize_interned(interned, taken_ids, registry, major=None):
+    """
+    Same result as summarize_minor(), computed from intern_minor() output and a
+    frozenset of taken course IDs.
+    """
+    minor = interned["minor"]
+    if major_restriction_applies(major, minor.get("restriction_text", "")):
+        return None
+
+    block_results = []
+    for kind, section, data in interned["sections"]:
+        if kind == "pool":
+            block_results.append(_evaluate_interned_pool(section, data[0], data[1], taken_ids, registry))
+        elif kind == "manual":
+            block_results.append(evaluate_manual_section(section))
+        else:
+            block_results.append(_evaluate_interned_formula(section, data[0], data[1], taken_ids, registry))
+    total_req = sum(result["total"] for result in block_results)
+    completed_req = sum(result["completed"] for result in block_results)
+    if total_req == 0 or completed_req == 0:
+        return None
+
+    return {
+        "name": minor["name"],
+        "link": minor["link"],
+        "taken_codes": sorted({code for result in block_results for code in result["taken_codes"]}),
+        "section_results": block_results,
+        "notes": minor.get("notes", []),
+        "total": total_req,
+        "completed": completed_req,
+        "percent": (completed_req / total_req) * 100 if total_req else 0,
+    }
+
+
+def rank_interned(interned_minors, taken, registry, major=None):
+    """
+    rank_minors() over intern_minor() output: the student's codes are resolved
+    to IDs once and every membership test is on integers.
+    """
+    taken_ids = registry.ids(taken)
+    results = []
+    skipped_minors = []
+    for interned in interned_minors:
+        minor = interned["minor"]
+        if major_restriction_applies(major, minor.get("restriction_text", "")):
+            skipped_minors.append(minor["name"])
+            continue
+        summary = summarize_interned(interned, taken_ids, registry, major)
+        if summary is not None:
+            results.append(summary)
+    return sort_minor_results(results), skipped_minors
+
+
+def rank_minors_from_store(store, taken, major=None):
+    """
+    rank_minors() over a CatalogStore. Returns the same (sorted results,
+    skipped minor names) pair without rebuilding every minor.
+    """
+    skipped_ids = set()
+    skipped_minors = []
+    for minor_id, name, restriction_text in store.restrictions():
+        if major_restriction_applies(major, restriction_text):
+            skipped_ids.add(minor_id)
+            skipped_minors.append(name)
+    # A minor only produces a summary if some taken course appears in it, so the
+    # store's course index narrows the candidates before anything is evaluated.
+    candidate_ids = [minor_id for minor_id in store.minor_ids_mentioning(taken) if minor_id not in skipped_ids]
+    results = [summarize_minor(minor, taken, major) for minor in store.minors(candidate_ids)]
+    return sort_minor_results([result for result in results if result is not None]), skipped_minors
+
+
+def _requirement_met(tree, done):
+    if tree is None:
+        return True
+    if isinstance(tree, str):
+        return tree in done
+    met = (_requirement_met(child, done) for child in tree[1:])
+    return all(met) if tree[0] == "and" else any(met)
+
+
+def _mentions(tree, code):
+    if tree is None:
+        return False
+    if isinstance(tree, str):
+        return tree == code
+    return any(_mentions(child, code) for child in tree[1:])
+
+
+class _PlanSearchExhausted(Exception):
+    pass
+
+
+def _plan_needs(results):
+    # Each unfinished section becomes (count still needed, options), where an
+    # option is a tuple of courses that must all be taken.
+    needs = []
+    for result in results:
+        for section in result["section_results"]:
+            needed = section["total"] - section["completed"]
+            if section["kind"] == "manual" or needed <= 0:
+                continue
+            if section["kind"] == "pool":
+                options = [(code,) for code in section.get("remaining_options", [])]
+            else:
+                options = [tuple(group["missing"]) for group in section.get("pending_groups", []) if group["missing"]]
+            needs.append((needed, options))
+    return needs
+
+
+def plan_semesters(
+    results,
+    history,
+    current_sem,
+    prerequisites=None,
+    cap=DEFAULT_COURSES_PER_SEMESTER,
+    last_semester=DEFAULT_LAST_SEMESTER,
+):
+    """
+    Plan the remaining courses of one or more ranked minors so they finish as
+    early as possible, taking at most `cap` planned courses a semester.
+
+    `history` is the app's course list ({"code", "sem"}; external credits have
+    no semester). Planning starts the semester after `current_sem`, so courses
+    recorded this semester count as done by then. `prerequisites` is anything
+    with a `requires(code)` method returning an and/or tree (a PrereqGraph);
+    without it every course is available right away.
+
+    The search tries each finish semester from a lower bound upward and asks
+    whether the minors can be done by then. Every semester is filled up to
+    the cap, since taking more courses never finishes later, and it picks
+    among the most pressing courses: those unlocking the longest prerequisite
+    chains, then those counting for the most sections. Sets of completed
+    courses already shown to be too slow are memoized. If the search visits
+    more than MAX_PLAN_STATES states it falls back to taking the most pressing
+    courses each semester, and "greedy" is True.
+
+    Returns {"finish", "greedy", "semesters", "history", "prerequisites"};
+    "finish" is None when the minors cannot be done by `last_semester`.
+    """
+    taken = frozenset(course["code"] for course in history)
+    by_semester = {}
+    for course in history:
+        if course.get("sem") is not None:
+            by_semester.setdefault(course["sem"], []).append(course["code"])
+    plan = {
+        "finish": None,
+        "greedy": False,
+        "semesters": [],
+        "history": {sem: sorted(codes) for sem, codes in sorted(by_semester.items())},
+        "prerequisites": [],
+    }
+    requires = prerequisites.requires if prerequisites is not None else (lambda code: None)
+
+    def chain(done):
+        # Semesters needed to take a course from `done`, counting the course.
+        memo = {}
+
+        def course(code, visiting=()):
+            if code in done:
+                return 0
+            if code not in memo:
+                if code in visiting:
+                    return 1
+                memo[code] = 1 + tree(requires(code), visiting + (code,))
+            return memo[code]
+
+        def tree(node, visiting):
+            if node is None:
+                return 0
+            if isinstance(node, str):
+                return course(node, visiting)
+            depths = [tree(child, visiting) for child in node[1:]]
+            return max(depths) if node[0] == "and" else min(depths)
+
+        return course, tree
+
+    course_depth, tree_depth = chain(taken)
+    needs = []
+    wanted = set()
+    for needed, options in _plan_needs(results):
+        if len(options) < needed:
+            return plan
+        # The options reachable soonest, plus as many spares as are needed.
+        options = sorted(options, key=lambda option: (max(course_depth(code) for code in option), option))
+        options = options[: needed * 2]
+        needs.append((needed, options))
+        for option in options:
+            wanted.update(option)
+
+    # A course shared by several sections' options counts toward each of them
+    # in proportion, so summing sections never overstates the courses needed.
+    shares = {}
+    for _, options in needs:
+        for code in {code for option in options for code in option}:
+            shares[code] = shares.get(code, 0) + 1
+
+    def add_prerequisites(node, into):
+        if node is None:
+            return
+        if isinstance(node, str):
+            if node not in taken and node not in into:
+                into.add(node)
+                add_prerequisites(requires(node), into)
+            return
+        if node[0] == "and":
+            for child in node[1:]:
+                add_prerequisites(child, into)
+        else:
+            add_prerequisites(min(node[1:], key=lambda child: tree_depth(child, ())), into)
+
+    candidates = set()
+    for code in wanted:
+        add_prerequisites(code, candidates)
+
+    dependents = {code: [other for other in candidates if _mentions(requires(other), code)] for code in candidates}
+    heights = {}
+
+    def height(code, visiting=()):
+        # Length of the longest chain of candidates this course unlocks.
+        if code not in heights:
+            heights[code] = 1 + max(
+                (height(other, visiting + (code,)) for other in dependents[code] if other not in visiting),
+                default=0,
+            )
+        return heights[code]
+
+    # Courses that unlock longer chains go first, then those counting for the
+    # most sections.
+    priority = sorted(candidates, key=lambda code: (-height(code), -shares.get(code, 0), code))
+
+    def lower_bound(done):
+        course, _ = chain(done)
+        depth_bound = 0
+        courses_needed = 0.0
+        for needed, options in needs:
+            open_options = [option for option in options if not all(code in done for code in option)]
+            remaining = needed - (len(options) - len(open_options))
+            if remaining <= 0:
+                continue
+            depths = sorted(max(course(code) for code in option) for option in open_options)
+            sizes = sorted(sum(1 / shares[code] for code in option if code not in done) for option in open_options)
+            depth_bound = max(depth_bound, depths[remaining - 1])
+            courses_needed += sum(sizes[:remaining])
+        return max(depth_bound, math.ceil(courses_needed / cap - 1e-9))
+
+    def available(done):
+        # Courses that can be taken now and still help: they belong to an
+        # unfinished option or unlock a course not yet taken.
+        useful = set()
+        for needed, options in needs:
+            open_options = [option for option in options if not all(code in done for code in option)]
+            if needed > len(options) - len(open_options):
+                useful.update(code for option in open_options for code in option)
+        return [
+            code
+            for code in priority
+            if code not in done
+            and (code in useful or any(other not in done for other in dependents[code]))
+            and _requirement_met(requires(code), done)
+        ]
+
+    too_slow = {}
+    visited = [0]
+
+    def search(done, budget):
+        # Courses to take each semester to finish within `budget` semesters,
+        # or None if that cannot be done from `done`.
+        visited[0] += 1
+        if visited[0] > MAX_PLAN_STATES:
+            raise _PlanSearchExhausted
+        bound = lower_bound(done)
+        if bound == 0:
+            return []
+        if bound > budget or too_slow.get(done, -1) >= budget:
+            return None
+        courses = available(done)[: cap + PLAN_BRANCH_SLACK]
+        for choice in combinations(courses, min(cap, len(courses))):
+            rest = search(done | frozenset(choice), budget - 1)
+            if rest is not None:
+                return [list(choice)] + rest
+        too_slow[done] = budget
+        return None
+
+    horizon = last_semester - current_sem
+    semesters = None
+    try:
+        for budget in range(lower_bound(taken), horizon + 1):
+            semesters = search(taken, budget)
+            if semesters is not None:
+                break
+    except _PlanSearchExhausted:
+        plan["greedy"] = True
+        semesters, done = [], taken
+        while lower_bound(done) and len(semesters) < horizon:
+            courses = available(done)[:cap]
+            if not courses:
+                break
+            semesters.append(courses)
+            done = done | frozenset(courses)
+        if lower_bound(done):
+            semesters = None
+    if semesters is None:
+        return plan
+
+    plan["semesters"] = [
+        {"semester": current_sem + offset, "courses": sorted(choice)} for offset, choice in enumerate(semesters, start=1)
+    ]
+    plan["finish"] = current_sem + len(semesters)
+    planned = {code for choice in semesters for code in choice}
+    plan["prerequisites"] = sorted(planned - wanted)
+    return plan
+
+
+_SEARCH_CODE_RE = re.compile(r"\b[A-Za-z]{2,5}\s*\d{3,5}\b")
+_SEARCH_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def _section_codes(section):
+    codes = set(section.get("codes", [])) | set(section.get("options", []))
+    for group in section.get("groups", []):
+        codes.update(flatten_course_codes(group))
+    for child in section.get("children", []):
+        codes.update(_section_codes(child))
+    return codes
+
+
+def catalog_course_codes(minors):
+    """
+    Every course code any section of `minors` lists.
+    """
+    return {code for minor in minors for section in minor.get("sections", []) for code in _section_codes(section)}
+
+
+class SearchIndex:
+    """
+    Inverted index over minor names, section titles, notes, descriptions and
+    course codes.
+
+    Each term maps to {minor position: (weight, field)}, keeping the heaviest
+    field the term appears in, and the sorted term list answers prefix
+    lookups by bisection. Build one per published catalog; it is read-only
+    afterwards and safe to share between sessions.
+    """
+
+    FIELD_WEIGHTS = {"name": 5.0, "course code": 4.0, "section title": 3.0, "notes": 1.0}
+    # A prefix match counts for this share of a whole-term match.
+    PREFIX_WEIGHT = 0.5
+
+    def __init__(self, minors):
+        self._minors = [(minor["name"], minor["link"]) for minor in minors]
+        postings = {}
+        for position, minor in enumerate(minors):
+            self._add(postings, position, "name", _SEARCH_WORD_RE.findall(minor["name"].lower()))
+            texts = list(minor.get("notes", [])) + [minor.get("restriction_text", "")]
+            codes = set()
+            sections = list(minor.get("sections", []))
+            while sections:
+                section = sections.pop()
+                sections.extend(section.get("children", []))
+                self._add(postings, position, "section title", self._terms_of(section.get("title", "")))
+                texts.extend(section.get("notes", []))
+                texts.append(section.get("description", ""))
+                codes.update(_section_codes(section))
+            self._add(postings, position, "notes", [term for text in texts for term in self._terms_of(text)])
+            self._add(postings, position, "course code", [code.lower() for code in codes])
+        self._postings = postings
+        self._terms = sorted(postings)
+        count = max(1, len(minors))
+        self._idf = {term: math.log(1 + count / len(hits)) for term, hits in postings.items()}
+
+    @staticmethod
+    def _terms_of(text):
+        # Course codes become one term each ("STAT 35000" -> "stat35000"), so
+        # a code query matches the code and not every STAT course.
+        text = text.lower()
+        codes = [re.sub(r"\s+", "", code) for code in _SEARCH_CODE_RE.findall(text)]
+        return codes + _SEARCH_WORD_RE.findall(_SEARCH_CODE_RE.sub(" ", text))
+
+    def _add(self, postings, position, field, terms):
+        weight = self.FIELD_WEIGHTS[field]
+        for term in terms:
+            hits = postings.setdefault(term, {})
+            if position not in hits or hits[position][0] < weight:
+                hits[position] = (weight, field)
+
+    def _matches(self, term):
+        # {position: (weight, field)} for the term itself and for every term
+        # it is a prefix of, prefix matches discounted.
+        matches = {}
+        terms = self._terms
+        for index in range(bisect_left(terms, term), len(terms)):
+            candidate = terms[index]
+            if not candidate.startswith(term):
+                break
+            scale = self._idf[candidate] * (1.0 if candidate == term else self.PREFIX_WEIGHT)
+            for position, (weight, field) in self._postings[candidate].items():
+                score = weight * scale
+                if position not in matches or matches[position][0] < score:
+                    matches[position] = (score, field)
+        return matches
+
+    def search(self, query, limit=20):
+        """
+        Return up to `limit` minors matching every term of `query`, best first,
+        as {"name", "link", "score", "fields"} dicts. Terms match whole words
+        or word prefixes; "STAT 35000" and "stat35000" match the course code.
+        """
+        # A code with a short number ("cs 180") is padded the way the catalog
+        # writes it.
+        terms = [
+            normalize_code(term).lower() if _SEARCH_CODE_RE.fullmatch(term) else term
+            for term in self._terms_of(query)
+        ]
+        if not terms:
+            return []
+        scores = None
+        for term in terms:
+            matches = self._matches(term)
+            if scores is None:
+                scores = {position: (score, {field}) for position, (score, field) in matches.items()}
+            else:
+                scores = {
+                    position: (total + matches[position][0], fields | {matches[position][1]})
+                    for position, (total, fields) in scores.items()
+                    if position in matches
+                }
+            if not scores:
+                return []
+        ranked = sorted(scores.items(), key=lambda item: (-item[1][0], self._minors[item[0]][0]))
+        return [
+            {
+                "name": self._minors[position][0],
+                "link": self._minors[position][1],
+                "score": score,
+                "fields": sorted(fields),
+            }
+            for position, (score, fields) in ranked[:limit]
+        ]
+
+    def __len__(self):
+        return len(self._terms)
+
+
 def residency_requirement(total_courses, notes):
     req_pcnt = None
     for note in notes:
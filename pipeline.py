@@ -0,0 +1,200 @@
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from functools import partial
+
+import scraper
+from scraper import EMPTY_REQUIREMENTS
+_DONE = object()
+# Stands in for the HTML of a page that could not be fetched.
+_FAILED = object()
+# How often blocked fetchers re-check whether the load was abandoned.
+_PUT_POLL_SECONDS = 0.1
+
+_parse_pools = {}
+_parse_pools_lock = threading.Lock()
+
+
+def get_parse_pool(workers):
+    """
+    Return the process pool shared by every load with this many parse workers.
+
+    Pools are created once and reused. They use the spawn start method because
+    forking a multithreaded server such as Streamlit can deadlock the child.
+    """
+    with _parse_pools_lock:
+        pool = _parse_pools.get(workers)
+        if pool is None:
+            pool = _parse_pools[workers] = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return pool
+
+
+def _stage_stats(pages, started, finished):
+    seconds = max(0.0, (finished or started or 0.0) - (started or 0.0))
+    return {
+        "pages": pages,
+        "seconds": seconds,
+        "pages_per_sec": (pages / seconds) if seconds else 0.0,
+    }
+
+
+def load_minor_pages(
+    links,
+    fetch_workers=8,
+    parse_workers=None,
+    queue_size=16,
+    progress=None,
+    fetch=None,
+    deadline=None,
+):
+    """
+    Fetch and parse minor pages in two overlapping stages.
+
+    Threads download raw HTML into a bounded queue; a process pool parses the
+    pages into section blocks. Returns ({link: (sections, notes, restriction_text)},
+    stats) where stats reports pages/sec for the fetch and parse stages.
+
+    With a `deadline` the load stops waiting once it expires and returns the
+    pages finished so far. stats["skipped"] lists the links left out: those
+    not finished in time and those whose fetch failed, so callers retry them
+    later instead of treating them as minors without requirements.
+    """
+    links = list(links)
+    fetch_page = fetch or scraper._fetch_html
+    if fetch is None and deadline is not None:
+        fetch_page = partial(scraper._fetch_html, deadline=deadline)
+    parse_workers = parse_workers or os.cpu_count() or 1
+    parse_pool = get_parse_pool(parse_workers)
+    html_queue = queue.Queue(maxsize=max(1, queue_size))
+    done_queue = queue.Queue()
+    stop = threading.Event()
+    results = {}
+    # Bounds parse jobs in flight so the queue, not the executor, absorbs bursts.
+    in_flight = threading.Semaphore(parse_workers * 2)
+    lock = threading.Lock()
+    timing = {"fetch": [None, None, 0], "parse": [None, None, 0]}
+
+    def mark(stage, start=None, end=None):
+        with lock:
+            entry = timing[stage]
+            if start is not None and (entry[0] is None or start < entry[0]):
+                entry[0] = start
+            if end is not None:
+                entry[1] = end if entry[1] is None else max(entry[1], end)
+                entry[2] += 1
+
+    def put(item):
+        # A full queue is the backpressure; give up once the load is abandoned.
+        while not stop.is_set():
+            try:
+                html_queue.put(item, timeout=_PUT_POLL_SECONDS)
+                return
+            except queue.Full:
+                continue
+
+    def fetch_one(link):
+        if stop.is_set():
+            return
+        started = time.perf_counter()
+        try:
+            html = fetch_page(link)
+        except Exception:
+            # Includes DeadlineExceeded: the page is skipped, not parsed as empty.
+            html = _FAILED
+        mark("fetch", started, time.perf_counter())
+        put((link, html))
+
+    def on_parsed(link):
+        def callback(future):
+            try:
+                parsed = future.result()
+            except Exception:
+                parsed = EMPTY_REQUIREMENTS
+            mark("parse", end=time.perf_counter())
+            in_flight.release()
+            done_queue.put((link, parsed))
+
+        return callback
+
+    def collect(item):
+        finished_link, parsed = item
+        if parsed is not _FAILED:
+            results[finished_link] = parsed
+        if progress is not None:
+            progress(finished_link)
+
+    def next_item(source):
+        if deadline is None:
+            return source.get()
+        return source.get(timeout=deadline.remaining())
+
+    def finish_fetching(fetches):
+        # Polls rather than blocking in wait(): futures cancelled by shutdown()
+        # never wake a waiter.
+        while not stop.is_set():
+            _, not_done = wait(fetches, timeout=_PUT_POLL_SECONDS)
+            if not not_done:
+                put(_DONE)
+                return
+
+    fetch_pool = ThreadPoolExecutor(
+        max_workers=max(1, fetch_workers), thread_name_prefix="minor-fetch"
+    )
+    try:
+        fetches = [fetch_pool.submit(fetch_one, link) for link in links]
+        threading.Thread(
+            target=finish_fetching, args=(fetches,), name="minor-fetch-done", daemon=True
+        ).start()
+
+        pending = 0
+        try:
+            while True:
+                item = next_item(html_queue)
+                if item is _DONE:
+                    break
+                link, html = item
+                pending += 1
+                if html is None or html is _FAILED:
+                    done_queue.put((link, EMPTY_REQUIREMENTS if html is None else _FAILED))
+                    continue
+                if not in_flight.acquire(timeout=None if deadline is None else deadline.remaining()):
+                    raise queue.Empty
+                mark("parse", start=time.perf_counter())
+                future = parse_pool.submit(scraper._parse_minor_page, html)
+                future.add_done_callback(on_parsed(link))
+
+                # Drain finished parses between submissions so progress stays live.
+                while not done_queue.empty():
+                    collect(done_queue.get())
+                    pending -= 1
+
+            while pending:
+                collect(next_item(done_queue))
+                pending -= 1
+        except queue.Empty:
+            # Deadline reached: keep the parses that already finished. Any still
+            # running finish into a queue nobody reads.
+            while not done_queue.empty():
+                collect(done_queue.get())
+    finally:
+        # Release fetchers blocked on the full queue and drop fetches not yet
+        # started, so an interrupted load (e.g. a Streamlit rerun raised from
+        # `progress`) leaves no threads behind.
+        stop.set()
+        while True:
+            try:
+                html_queue.get_nowait()
+            except queue.Empty:
+                break
+        fetch_pool.shutdown(wait=False, cancel_futures=True)
+
+    stats = {
+        stage: _stage_stats(entry[2], entry[0], entry[1]) for stage, entry in timing.items()
+    }
+    stats["skipped"] = [link for link in links if link not in results]
+    return results, stats
@@ -0,0 +1,220 @@
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import scraper
+from courses import canonical_code
+
+DEFAULT_PREREQS_PATH = "prerequisites.json"
+DEFAULT_FETCH_WORKERS = 8
+
+_graph = None
+_graph_lock = threading.Lock()
+
+logger = logging.getLogger(__name__)
+
+
+class PrereqGraph:
+    """
+    Prerequisites for every course reachable from the minor pages.
+
+    Each course maps to a requirement tree: a course code, ["and", *children]
+    or ["or", *children], or None when it has no prerequisites. The graph is
+    read-only once built, so every session shares one copy.
+    """
+
+    def __init__(self, requires=None, titles=None):
+        self._requires = dict(requires or {})
+        self._titles = dict(titles or {})
+
+    def requires(self, code):
+        return self._requires.get(code)
+
+    def title(self, code):
+        return self._titles.get(code, "")
+
+    def codes(self):
+        return list(self._requires)
+
+    def __contains__(self, code):
+        return code in self._requires
+
+    def __len__(self):
+        return len(self._requires)
+
+    def to_dict(self):
+        return {
+            "courses": {
+                code: {"title": self._titles.get(code, ""), "requires": self._requires[code]}
+                for code in sorted(self._requires)
+            }
+        }
+
+    @classmethod
+    def from_dict(cls, payload):
+        courses = payload.get("courses", {})
+        return cls(
+            {code: course.get("requires") for code, course in courses.items()},
+            {code: course.get("title", "") for code, course in courses.items()},
+        )
+
+    def save(self, path):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(self.to_dict(), handle, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r", encoding="utf-8") as handle:
+            return cls.from_dict(json.load(handle))
+
+
+def _minor_course_links(link):
+    try:
+        return scraper._parse_course_links(scraper._fetch_html(link))
+    except Exception as exc:
+        logger.warning("Skipping minor page %s: %s", link, exc)
+        return {}
+
+
+def _course_prerequisites(url):
+    # None when the course page could not be fetched or parsed.
+    try:
+        return scraper.get_course_prerequisites(url)
+    except Exception as exc:
+        logger.warning("Skipping course page %s: %s", url, exc)
+        return None
+
+
+def build_prereq_graph(minor_links, workers=DEFAULT_FETCH_WORKERS, progress=None):
+    """
+    Scrape the prerequisites of every course linked from the given minor pages
+    and, transitively, of every course those prerequisites link to.
+
+    A page that fails to load is skipped and the crawl goes on. A course whose
+    own page failed is left out of the graph, so its prerequisites are unknown
+    rather than recorded as none.
+    """
+    courses = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for linked in pool.map(_minor_course_links, minor_links):
+            for code, course in linked.items():
+                courses.setdefault(code, course)
+        requires = {}
+        skipped = set()
+        pending = sorted(courses)
+        while pending:
+            # One breadth-first wave of course pages at a time.
+            urls = [courses[code][1] for code in pending]
+            for code, parsed in zip(pending, pool.map(_course_prerequisites, urls)):
+                if parsed is None:
+                    skipped.add(code)
+                    continue
+                tree, linked = parsed
+                requires[code] = tree
+                for linked_code, course in linked.items():
+                    courses.setdefault(linked_code, course)
+            if progress:
+                progress(len(requires), len(courses))
+            pending = sorted(code for code in courses if code not in requires and code not in skipped)
+    if skipped:
+        logger.warning("Prerequisites unknown for %d courses: %s", len(skipped), ", ".join(sorted(skipped)))
+    return PrereqGraph(requires, {code: title for code, (title, _) in courses.items()})
+
+
+def get_prereq_graph():
+    """
+    Return the process-wide graph loaded from MINOR_OPTIMIZER_PREREQS (default:
+    prerequisites.json), or an empty graph when that file does not exist.
+    """
+    global _graph
+    with _graph_lock:
+        if _graph is None:
+            path = os.environ.get("MINOR_OPTIMIZER_PREREQS", DEFAULT_PREREQS_PATH)
+            _graph = PrereqGraph.load(path) if os.path.exists(path) else PrereqGraph()
+        return _graph
+
+
+class Scheduler:
+    """
+    Earliest semester each course, and each minor, could be finished by a
+    student who has taken `taken` and is in `current_sem`.
+
+    A course can be taken the semester after all of its prerequisites, so its
+    earliest semester is one past the longest chain of untaken prerequisites.
+    Semesters are memoized per course, so scheduling every minor walks each
+    part of the graph once. There is no per-semester course cap here.
+    """
+
+    def __init__(self, graph, taken, current_sem):
+        self.graph = graph
+        self.taken = {canonical_code(code) for code in taken}
+        self.current_sem = current_sem
+        self._memo = {}
+        self._visiting = set()
+
+    def course(self, code):
+        """
+        Earliest semester `code` could be completed; current_sem if already taken.
+        """
+        semester = self._memo.get(code)
+        if semester is not None:
+            return semester
+        if code in self.taken:
+            return self.current_sem
+        if code in self._visiting:
+            # The catalog has a few mutual prerequisites; treat the back edge as met.
+            return self.current_sem
+        self._visiting.add(code)
+        try:
+            ready = self._ready(self.graph.requires(code))
+        finally:
+            self._visiting.discard(code)
+        semester = self._memo[code] = ready + 1
+        return semester
+
+    def _ready(self, tree):
+        # Semester by which a requirement tree is satisfied.
+        if tree is None:
+            return self.current_sem
+        if isinstance(tree, str):
+            return self.course(tree)
+        children = [self._ready(child) for child in tree[1:]]
+        return max(children) if tree[0] == "and" else min(children)
+
+    def minor(self, result):
+        """
+        Earliest semester the minor in a ranking result could be finished, or
+        None if a section cannot be completed from its listed options.
+        """
+        finish = self.current_sem
+        for section in result["section_results"]:
+            needed = section["total"] - section["completed"]
+            if section["kind"] == "manual" or needed <= 0:
+                continue
+            if section["kind"] == "pool":
+                semesters = sorted(self.course(code) for code in section.get("remaining_options", []))
+            else:
+                # Each pending group finishes with the last of its missing courses.
+                semesters = sorted(
+                    max(self.course(code) for code in group["missing"])
+                    for group in section.get("pending_groups", [])
+                    if group["missing"]
+                )
+            if len(semesters) < needed:
+                return None
+            finish = max(finish, semesters[needed - 1])
+        return finish
+
+
+def rank_by_finish(results, scheduler):
+    """
+    Return (finish semester, result) pairs ordered by earliest finish, keeping
+    the completion ranking among ties. Minors that cannot be finished go last.
+    """
+    scheduled = [(scheduler.minor(result), idx, result) for idx, result in enumerate(results)]
+    scheduled.sort(key=lambda item: (item[0] is None, item[0] or 0, item[1]))
+    return [(finish, result) for finish, _, result in scheduled]
@@ -0,0 +1,56 @@
+import cProfile
+import itertools
+import os
+import pstats
+import time
+
+DEFAULT_PROFILE_DIR = "profiles"
+DEFAULT_TOP = 15
+
+_sequence = itertools.count(1)
+
+
+def profile_call(fn, *args, directory=None, label="request", limit=DEFAULT_TOP, **kwargs):
+    """
+    Run `fn(*args, **kwargs)` under cProfile. Returns (result, path, rows):
+    `path` is the saved .pstats file when `directory` is given (else None) and
+    `rows` are the top `limit` functions by cumulative time.
+    """
+    profiler = cProfile.Profile()
+    result = profiler.runcall(fn, *args, **kwargs)
+    path = save_stats(profiler, directory, label) if directory else None
+    return result, path, top_functions(profiler, limit)
+
+
+def save_stats(profiler, directory, label="request"):
+    """
+    Dump `profiler` to a uniquely named .pstats file in `directory` and return
+    its path. Open it later with `python -m pstats <path>`.
+    """
+    os.makedirs(directory, exist_ok=True)
+    name = f"{label}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{next(_sequence)}.pstats"
+    path = os.path.join(directory, name)
+    profiler.dump_stats(path)
+    return path
+
+
+def top_functions(source, limit=DEFAULT_TOP, sort="cumulative"):
+    """
+    Return the top `limit` functions of a profiler or .pstats path as dicts with
+    function, calls, tottime and cumtime.
+    """
+    stats = pstats.Stats(source)
+    stats.sort_stats(sort)
+    rows = []
+    for func in stats.fcn_list[:limit]:
+        _, calls, tottime, cumtime, _ = stats.stats[func]
+        filename, line, name = func
+        rows.append(
+            {
+                "function": f"{name} ({os.path.basename(filename)}:{line})" if line else name,
+                "calls": calls,
+                "tottime": round(tottime, 6),
+                "cumtime": round(cumtime, 6),
+            }
+        )
+    return rows
@@ -0,0 +1,217 @@
+import logging
+import os
+import threading
+import time
+
+import catalog
+import scraper
+from catalog_diff import diff_catalogs, format_diff
+from shared_catalog import MappedCatalog, compile_catalog, file_identity
+
+DEFAULT_REFRESH_SECONDS = 6 * 60 * 60
+# Followers only stat the compiled file, so they can check it often.
+DEFAULT_FOLLOW_SECONDS = 10
+
+logger = logging.getLogger(__name__)
+
+
+def scrape_catalog(**pipeline_options):
+    """
+    Scrape every configured catalog year with fresh loaders. Returns (minors,
+    majors, years): the default year's minors, the majors list and {label:
+    minors} for the other years. Installs the loaders as the shared ones so
+    later lazy lookups reuse their pages; their sections are interned in one
+    SectionPool first, so a section repeated across years is held once.
+    """
+    loaded = {}
+    pool = catalog.SectionPool()
+    for year, index_url in scraper.catalog_years().items():
+        loader = catalog.CatalogLoader(index_url)
+        minors = loader.minors_data(**pipeline_options)
+        loader.intern_sections(pool)
+        loaded[year] = [pool.intern_minor(minor) for minor in minors]
+        with catalog._loaders_lock:
+            catalog._loaders[loader.index_url] = loader
+    majors = scraper.get_majors_list()
+    default_year = scraper.default_catalog_year()
+    return loaded.pop(default_year), majors, loaded
+
+
+class CatalogRefresher:
+    """
+    Keeps the published catalog fresh from a background thread.
+
+    `start()` publishes the snapshot file immediately when one exists (warm
+    start), then scrapes on the refresh thread: right away if nothing could be
+    preloaded, and every `interval` seconds after that. Each successful scrape is
+    published to the holder and written back to the snapshot (and the SQLite
+    store, when `store_path` is set). A scrape that matches the published
+    catalog is not republished, so it keeps its version and caches; it is
+    only written to outputs that are missing. User requests only
+    ever read the holder, so none of them waits on scraping.
+
+    With `compiled_path` the catalog is also compiled to a memory-mapped file and
+    served from the mapping. With `follow=True` the refresher never scrapes: it
+    maps the compiled file written by another process and remaps it when that
+    file is replaced, so many workers share one copy of the catalog. Followers
+    check the file every `follow_interval` seconds rather than `interval`, so
+    they pick up a recompiled catalog soon after the writer replaces it.
+    """
+
+    def __init__(
+        self,
+        holder=None,
+        interval=DEFAULT_REFRESH_SECONDS,
+        snapshot_path=None,
+        scrape=None,
+        store_path=None,
+        compiled_path=None,
+        follow=False,
+        follow_interval=DEFAULT_FOLLOW_SECONDS,
+    ):
+        self.holder = holder or catalog.get_catalog_holder()
+        self.interval = interval
+        self.snapshot_path = snapshot_path
+        self.store_path = store_path
+        self.compiled_path = compiled_path
+        self.follow = follow
+        self.follow_interval = follow_interval
+        self._scrape = scrape or scrape_catalog
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._stats = {
+            "last_refresh_at": None,
+            "last_duration": None,
+            "refreshes": 0,
+            "failures": 0,
+            "consecutive_failures": 0,
+            "last_error": None,
+            "warm_started": False,
+        }
+
+    def warm_start(self):
+        """
+        Publish the compiled file or the snapshot file if there is one. Returns
+        True on success.
+        """
+        if self.compiled_path and os.path.exists(self.compiled_path):
+            try:
+                self.holder.install(MappedCatalog(self.compiled_path))
+            except Exception as exc:
+                logger.warning("Could not map compiled catalog %s: %s", self.compiled_path, exc)
+            else:
+                with self._lock:
+                    self._stats["warm_started"] = True
+                return True
+        if self.follow:
+            return False
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return False
+        try:
+            minors, majors, loaded_at, years, year = catalog.load_snapshot_years(self.snapshot_path)
+        except Exception as exc:
+            logger.warning("Could not read catalog snapshot %s: %s", self.snapshot_path, exc)
+            return False
+        self.holder.publish(minors, majors=majors, loaded_at=loaded_at, years=years, year=year)
+        with self._lock:
+            self._stats["warm_started"] = True
+        return True
+
+    def refresh_once(self):
+        """
+        Scrape and publish a new catalog (or, when following, remap a replaced
+        compiled file). Returns True on success; failures are counted and the
+        previous catalog stays published.
+        """
+        started = time.perf_counter()
+        try:
+            if self.follow:
+                self._follow_compiled()
+            else:
+                self._scrape_and_publish()
+        except Exception as exc:
+            logger.exception("Catalog refresh failed")
+            with self._lock:
+                self._stats["failures"] += 1
+                self._stats["consecutive_failures"] += 1
+                self._stats["last_error"] = f"{type(exc).__name__}: {exc}"
+                self._stats["last_duration"] = time.perf_counter() - started
+            return False
+
+        with self._lock:
+            self._stats["refreshes"] += 1
+            self._stats["consecutive_failures"] = 0
+            self._stats["last_error"] = None
+            self._stats["last_refresh_at"] = time.time()
+            self._stats["last_duration"] = time.perf_counter() - started
+        return True
+
+    def _scrape_and_publish(self):
+        # A scrape may return (minors, majors) or add the other catalog years.
+        minors, majors, *years = self._scrape()
+        years = years[0] if years else None
+        current = self.holder.current()
+        changed = True
+        if current is not None:
+            report = diff_catalogs(current, catalog.Catalog(minors, None, majors=majors, years=years))
+            changed = bool(report["invalidate"])
+            if changed:
+                logger.info("Catalog changed:\n%s", format_diff(report))
+            else:
+                # Keeping the version keeps every cache built from it valid.
+                logger.info("Catalog unchanged; keeping version %s", current.version)
+        published = self.holder.publish(minors, majors=majors, years=years) if changed else current
+        # An unchanged catalog is still written to outputs that do not exist
+        # yet, so followers and store readers are not left without one.
+        if self.snapshot_path and (changed or not os.path.exists(self.snapshot_path)):
+            catalog.save_snapshot(published, self.snapshot_path)
+        if self.store_path and (changed or not os.path.exists(self.store_path)):
+            from store import CatalogStore
+
+            store = CatalogStore(self.store_path)
+            try:
+                store.populate(published.minors)
+            finally:
+                store.close()
+        if self.compiled_path and (changed or not os.path.exists(self.compiled_path)):
+            compile_catalog(published, self.compiled_path)
+            self.holder.install(MappedCatalog(self.compiled_path))
+
+    def _follow_compiled(self):
+        if not os.path.exists(self.compiled_path):
+            return
+        current = self.holder.current()
+        if getattr(current, "identity", None) == file_identity(self.compiled_path):
+            return
+        # The old mapping is left to close itself once in-flight readers drop it.
+        self.holder.install(MappedCatalog(self.compiled_path))
+
+    def start(self):
+        if self._thread is not None:
+            return self
+        refresh_now = not self.warm_start()
+        self._thread = threading.Thread(
+            target=self._run, args=(refresh_now,), name="catalog-refresher", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def _run(self, refresh_now):
+        if refresh_now:
+            self.refresh_once()
+        interval = self.follow_interval if self.follow else self.interval
+        while not self._stop.wait(interval):
+            self.refresh_once()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        current = self.holder.current()
+        stats["catalog_version"] = current.version if current else None
+        return stats
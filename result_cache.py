@@ -0,0 +1,183 @@
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+
+from courses import canonical_code, get_registry
+from optimizer import intern_minor, rank_interned, rank_minors
+from shared_catalog import MappedCatalog
+
+DEFAULT_MAX_ENTRIES = 512
+# Interned minors are kept for this many catalogs: the catalog years of the
+# current version, plus the previous version while requests drain.
+_INTERNED_CATALOGS = 8
+
+logger = logging.getLogger(__name__)
+
+_interned = OrderedDict()
+_interned_lock = threading.Lock()
+
+
+def profile_key(taken, major, catalog_version):
+    """
+    Canonical cache key for a student profile. Course order, duplicates and the
+    app's "None" major placeholder do not change the key.
+    """
+    if major == "None":
+        major = None
+    payload = json.dumps([sorted(set(taken)), major, catalog_version], separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    Bounded LRU cache of ranking results, shared by every session in the process.
+
+    Keys come from `profile_key`, so a new catalog version never serves stale
+    results; entries for old versions simply age out.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._warmed_version = None
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._entries:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return self._entries[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def get_or_compute(self, key, compute):
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self):
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+            }
+
+    def mark_warmed(self, version):
+        """
+        Record that `version` is being warmed. Returns True for the first call
+        per version and False after that, so only one caller warms it.
+        """
+        with self._lock:
+            if self._warmed_version == version:
+                return False
+            self._warmed_version = version
+            return True
+
+
+def interned_minors(catalog):
+    """
+    Return the catalog's minors interned for integer-ID scoring, building them
+    once per published catalog (and catalog year).
+    """
+    with _interned_lock:
+        key = id(catalog)
+        entry = _interned.get(key)
+        if entry is None or entry[0] is not catalog:
+            registry = get_registry()
+            entry = _interned[key] = (catalog, [intern_minor(minor, registry) for minor in catalog.minors])
+            while len(_interned) > _INTERNED_CATALOGS:
+                _interned.popitem(last=False)
+        _interned.move_to_end(key)
+        return entry[1]
+
+
+def rank_catalog(catalog, taken, major=None):
+    # Mapped catalogs decode minors on demand so worker processes share one
+    # copy; interning them would pin a private copy in every process.
+    if isinstance(catalog, MappedCatalog):
+        return rank_minors(catalog.minors, taken, major)
+    return rank_interned(interned_minors(catalog), taken, get_registry(), major)
+
+
+def ranked_results(cache, catalog, taken, major=None):
+    """
+    Return (results, skipped_minors) for a profile, scoring the catalog only on
+    a cache miss.
+    """
+    key = profile_key(taken, major, catalog.version)
+    return cache.get_or_compute(key, lambda: rank_catalog(catalog, taken, major))
+
+
+def load_profiles(path):
+    """
+    Read common profiles from a JSON list of {"courses": [...], "major": ...}
+    objects. "name" is optional and only used for reporting.
+    """
+    with open(path, "r", encoding="utf-8") as handle:
+        profiles = json.load(handle)
+    for profile in profiles:
+        profile["courses"] = [canonical_code(code) for code in profile["courses"]]
+    return profiles
+
+
+def warm_cache(cache, catalog, profiles):
+    """
+    Score every profile against `catalog` so the first real request for it is a
+    cache hit. Returns how many profiles were newly computed.
+    """
+    computed = 0
+    for profile in profiles:
+        key = profile_key(profile["courses"], profile.get("major"), catalog.version)
+        if key in cache:
+            continue
+        cache.put(key, rank_catalog(catalog, set(profile["courses"]), profile.get("major")))
+        computed += 1
+    return computed
+
+
+def warm_in_background(cache, catalog, profiles):
+    """
+    Warm the cache for `catalog` on a daemon thread, once per catalog version.
+    Returns the thread, or None if this version is already warm or warming.
+    """
+    if not cache.mark_warmed(catalog.version):
+        return None
+
+    def run():
+        try:
+            warm_cache(cache, catalog, profiles)
+        except Exception:
+            logger.exception("Result cache warm-up failed")
+
+    thread = threading.Thread(target=run, name="result-cache-warm", daemon=True)
+    thread.start()
+    return thread
@@ -1,17 +1,18 @@
+import contextlib
+import json
+import os
 import re
 from urllib.parse import urljoin, urlparse
 
-import requests
-from bs4 import BeautifulSoup
-
-try:
-    from playwright.sync_api import sync_playwright
-except Exception:  # pragma: no cover - optional dependency during setup
-    sync_playwright = None
+from archive import HtmlArchive
+from courses import canonical_code
+from deadline import DeadlineExceeded, remaining_timeout
+from singleflight import SingleFlight
 
 BASE_URL = "https://catalog.purdue.edu"
 MINORS_PAGE = "https://catalog.purdue.edu/content.php?catoid=19&navoid=25481"
 MAJORS_PAGE = "https://www.admissions.purdue.edu/majors/"
+DEFAULT_CATALOG_YEAR = "Current catalog"
 REQUEST_HEADERS = {
     "User-Agent": (
         "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
@@ -19,18 +20,122 @@ REQUEST_HEADERS = {
     )
 }
 COURSE_CODE_RE = re.compile(r"[A-Z]{2,4}\s*\d{3,5}")
+COURSE_PAGE = BASE_URL + "/preview_course_nopop.php?catoid={catoid}&coid={coid}"
+SHOW_COURSE_RE = re.compile(r"showCourse\(\s*'(\d+)'\s*,\s*'(\d+)'")
+PREREQ_TOKEN_RE = re.compile(r"\(|\)|(?i:\b(?:and|or)\b)|[A-Z]{2,4}\s*\d{3,5}")
+# Field labels that end the prerequisite text on a course page.
+PREREQ_END_RE = re.compile(
+    r"\b(?:Corequisites?|Restrictions?|Course Attributes|Typically Offered|Schedule Types?|Credit Hours|Learning Outcomes)\b",
+    re.I,
+)
+ARCHIVE_MODES = {"record", "replay"}
+EMPTY_REQUIREMENTS = ([], [], "")
+
+_archive = None
+_archive_mode = None
+# Concurrent sessions asking for the same page share one fetch/parse.
+_flights = SingleFlight()
+
+
+def use_archive(path, mode="record"):
+    """
+    Record every fetched page into the archive at `path`, or replay pages from it
+    without touching the network. Pass path=None to disable.
+    """
+    global _archive, _archive_mode
+    if path is not None and mode not in ARCHIVE_MODES:
+        raise ValueError(f"Unknown archive mode: {mode}")
+    if _archive is not None:
+        _archive.close()
+    if path is None:
+        _archive, _archive_mode = None, None
+        return
+    _archive, _archive_mode = HtmlArchive(path), mode
+
+
+def archive_batch():
+    """
+    Buffer pages recorded during a load and write them to the archive together.
+    """
+    if _archive_mode == "record":
+        return _archive.batch()
+    return contextlib.nullcontext()
+
+
+if os.environ.get("MINOR_OPTIMIZER_ARCHIVE"):
+    use_archive(
+        os.environ["MINOR_OPTIMIZER_ARCHIVE"],
+        os.environ.get("MINOR_OPTIMIZER_ARCHIVE_MODE", "record"),
+    )
+
+
+def catalog_years():
+    """
+    Return {year label: minors index URL}, default year first.
+
+    The default year is MINORS_PAGE, labeled by MINOR_OPTIMIZER_CATALOG_YEAR.
+    MINOR_OPTIMIZER_CATALOG_YEARS adds more as a JSON object, e.g.
+    {"2023-2024": "https://catalog.purdue.edu/content.php?catoid=16&navoid=..."}.
+    """
+    years = {os.environ.get("MINOR_OPTIMIZER_CATALOG_YEAR", DEFAULT_CATALOG_YEAR): MINORS_PAGE}
+    for label, url in json.loads(os.environ.get("MINOR_OPTIMIZER_CATALOG_YEARS") or "{}").items():
+        years.setdefault(label, url)
+    return years
+
+
+def default_catalog_year():
+    return next(iter(catalog_years()))
+
+
+def _make_soup(html):
+    from bs4 import BeautifulSoup
+
+    return BeautifulSoup(html, "html.parser")
 
 
 def _normalize_text(text):
     return " ".join(text.split()).strip()
 
 
-def _fetch_html(url):
-    res = requests.get(url, headers=REQUEST_HEADERS, timeout=30)
+def _timeout(deadline, cap):
+    # Never pass 0: requests and Playwright treat it as "no timeout" or fail oddly.
+    return max(0.001, remaining_timeout(deadline, cap))
+
+
+def _fetch_html(url, deadline=None):
+    return _flights.do_within(deadline, ("fetch", url), _fetch_html_once, url, deadline)
+
+
+def _fetch_html_once(url, deadline=None):
+    if _archive_mode == "replay":
+        return _archive.get(url)
+
+    try:
+        html = _fetch_html_from_network(url, deadline)
+    except Exception as exc:
+        if deadline is not None and deadline.expired():
+            raise DeadlineExceeded(f"deadline expired fetching {url}") from exc
+        raise
+    if _archive_mode == "record":
+        _archive.put(url, html)
+    return html
+
+
+def _fetch_html_from_network(url, deadline=None):
+    # Network and rendering dependencies load on first fetch, so reading a
+    # cached catalog never imports them.
+    import requests
+
+    res = requests.get(url, headers=REQUEST_HEADERS, timeout=_timeout(deadline, 30))
     if res.ok and res.text.strip():
         return res.text
 
-    if sync_playwright is not None:
+    try:
+        from playwright.sync_api import sync_playwright
+    except Exception:  # pragma: no cover - optional dependency during setup
+        sync_playwright = None
+
+    if sync_playwright is not None and (deadline is None or not deadline.expired()):
         try:
             with sync_playwright() as playwright:
                 browser = playwright.chromium.launch(headless=True)
@@ -38,9 +143,9 @@ def _fetch_html(url):
                     user_agent=REQUEST_HEADERS["User-Agent"],
                     viewport={"width": 1440, "height": 1200},
                 )
-                page.goto(url, wait_until="domcontentloaded", timeout=60000)
+                page.goto(url, wait_until="domcontentloaded", timeout=_timeout(deadline, 60) * 1000)
                 try:
-                    page.wait_for_load_state("networkidle", timeout=15000)
+                    page.wait_for_load_state("networkidle", timeout=_timeout(deadline, 15) * 1000)
                 except Exception:
                     pass
                 html = page.content()
@@ -55,7 +160,7 @@ def _fetch_html(url):
 
 
 def _extract_course_codes(text):
-    return sorted({code.replace(" ", "") for code in COURSE_CODE_RE.findall(text.upper())})
+    return sorted({canonical_code(code) for code in COURSE_CODE_RE.findall(text.upper())})
 
 
 def _extract_excluded_codes(text):
@@ -279,7 +384,15 @@ def get_minor_list():
     """
     Return a list of (minor_name, url) tuples for each minor preview page.
     """
-    soup = BeautifulSoup(_fetch_html(MINORS_PAGE), "html.parser")
+    return list(_flights.do(("minor_list", MINORS_PAGE), _get_minor_list))
+
+
+def _get_minor_list():
+    return _parse_minor_links(_fetch_html(MINORS_PAGE))
+
+
+def _parse_minor_links(html):
+    soup = _make_soup(html)
     minor_links = []
     seen = set()
     for a in soup.find_all("a", href=re.compile(r"preview_program\.php")):
@@ -295,25 +408,24 @@ def get_minor_list():
 
 
 def get_minors_requirements():
-    # Scrape all minor links via preview_program pages
-    soup = BeautifulSoup(_fetch_html(MINORS_PAGE), "html.parser")
-    minors = {}
-    for a in soup.find_all("a", href=re.compile(r"preview_program\.php")):
-        name = _normalize_text(a.get_text(" ", strip=True))
-        if "Minor" not in name:
-            continue
-        link = urljoin(BASE_URL, a["href"])
-        try:
-            reqs = _get_requirements_from_minor_page(link)
-        except Exception:
-            reqs = ([], [], "")
-        minors[name] = reqs
-    return minors
+    """
+    Return {minor_name: (sections, notes, restriction_text)} for every minor,
+    reusing the pages already loaded by the shared catalog loader.
+    """
+    from catalog import get_loader  # catalog builds on this module
+
+    return get_loader().requirements_by_name()
 
 
 def _get_requirements_from_minor_page(url):
     # Scrape course requirements from the rendered catalog page.
-    soup = BeautifulSoup(_fetch_html(url), "html.parser")
+    return _flights.do(("requirements", url), lambda: _parse_minor_page(_fetch_html(url)))
+
+
+def _parse_minor_page(html):
+    # Parse a fetched minor page into (sections, notes, restriction_text).
+    # Kept free of network access so it can run in a worker process.
+    soup = _make_soup(html)
     main = soup.find("main") or soup.body or soup
     headings = [h for h in main.find_all(["h2", "h3", "h4"]) if _normalize_text(h.get_text(" ", strip=True))]
     sections = []
@@ -389,11 +501,116 @@ def _get_requirements_from_minor_page(url):
     return sections, notes, " ".join(restriction_texts)
 
 
+def _parse_course_links(html):
+    """
+    Return {course_code: (title, course_page_url)} for every course linked from
+    a catalog page. Catalog pages link courses either with a coid query string
+    or through a showCourse('catoid', 'coid') handler.
+    """
+    soup = _make_soup(html)
+    courses = {}
+    for a in soup.find_all("a"):
+        text = _normalize_text(a.get_text(" ", strip=True))
+        match = COURSE_CODE_RE.match(text.upper())
+        if not match:
+            continue
+        href = a.get("href", "")
+        onclick = SHOW_COURSE_RE.search(a.get("onclick", ""))
+        if "coid=" in href:
+            url = urljoin(BASE_URL, href)
+        elif onclick:
+            url = COURSE_PAGE.format(catoid=onclick.group(1), coid=onclick.group(2))
+        else:
+            continue
+        title = text.split(" - ", 1)[1] if " - " in text else ""
+        courses.setdefault(canonical_code(match.group(0)), (title, url))
+    return courses
+
+
+def _parse_prerequisite_text(text):
+    """
+    Parse "CS 18000 and (MA 16100 or MA 16500)" into a requirement tree: a
+    course code, ["and", *children] or ["or", *children]. Returns None when
+    the text names no courses. "and" binds tighter than "or" where the catalog
+    leaves out parentheses.
+    """
+    tokens = [
+        token if token in "()" else token.lower() if token.lower() in ("and", "or") else canonical_code(token)
+        for token in PREREQ_TOKEN_RE.findall(text)
+    ]
+    position = 0
+
+    def parse(operator, operand):
+        nonlocal position
+        children = []
+        node = operand()
+        if node is not None:
+            children.append(node)
+        while position < len(tokens) and tokens[position] == operator:
+            position += 1
+            node = operand()
+            if node is not None:
+                children.append(node)
+        if len(children) > 1:
+            return [operator, *children]
+        return children[0] if children else None
+
+    def atom():
+        nonlocal position
+        while position < len(tokens):
+            token = tokens[position]
+            position += 1
+            if token == "(":
+                node = parse("or", conjunction)
+                if position < len(tokens) and tokens[position] == ")":
+                    position += 1
+                return node
+            if token not in ("and", "or", ")"):
+                return token
+        return None
+
+    def conjunction():
+        return parse("and", atom)
+
+    tree = None
+    while position < len(tokens):
+        # Stray closing parentheses or operators must not end parsing early.
+        node = parse("or", conjunction)
+        if node is not None:
+            tree = node if tree is None else ["and", tree, node]
+        elif position < len(tokens):
+            position += 1
+    return tree
+
+
+def _parse_course_page(html):
+    """
+    Parse a course preview page into (prerequisite tree, {code: (title, url)}
+    of the courses it links to). The prerequisite text runs from its label to
+    the next field label on the page.
+    """
+    soup = _make_soup(html)
+    main = soup.find("main") or soup.body or soup
+    text = _normalize_text(main.get_text(" ", strip=True))
+    match = re.search(r"Prerequisites?(?:\s*\(s\))?\s*:(.*)", text, re.I)
+    tree = None
+    if match:
+        tree = _parse_prerequisite_text(PREREQ_END_RE.split(match.group(1), maxsplit=1)[0])
+    return tree, _parse_course_links(html)
+
+
+def get_course_prerequisites(url):
+    """
+    Return (prerequisite tree, linked courses) for one course page.
+    """
+    return _flights.do(("prerequisites", url), lambda: _parse_course_page(_fetch_html(url)))
+
+
 def get_majors_list():
     """
     Scrape the Purdue admissions majors page and return a sorted list of major names.
     """
-    soup = BeautifulSoup(_fetch_html(MAJORS_PAGE), "html.parser")
+    soup = _make_soup(_fetch_html(MAJORS_PAGE))
     majors = []
     seen = set()
     # the majors appear under the div with id 'all-majors-container'
@@ -0,0 +1,76 @@
+import base64
+import json
+import zlib
+
+from courses import canonical_code
+
+QUERY_PARAM = "p"
+EXPERIENCES = ("study_abroad", "intl_internship")
+# Largest decoded profile accepted from a link; real profiles are well under
+# 2 KiB, so anything bigger is a crafted token.
+MAX_PROFILE_BYTES = 64 * 1024
+
+
+def encode_profile(courses, current_sem=1, major=None, experiences=(), year=None):
+    """
+    Encode a student profile as a short URL-safe token.
+
+    `courses` are the app's course dicts ({"code", "sem", "origin"}). `year`
+    is the catalog year label, left out for the default year. The token is
+    deterministic: course order, duplicate codes and the "None" major do not
+    change it, so identical profiles share a link and a result cache entry.
+    """
+    purdue = sorted(
+        {(course["code"], course.get("sem") or 1) for course in courses if course.get("origin", "purdue") == "purdue"}
+    )
+    external = sorted({course["code"] for course in courses if course.get("origin") == "external"})
+    payload = {
+        "c": [list(item) for item in purdue],
+        "e": external,
+        "m": major if major and major != "None" else "",
+        "s": current_sem,
+        "x": sorted(set(experiences) & set(EXPERIENCES)),
+    }
+    if year:
+        payload["y"] = year
+    raw = json.dumps(payload, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    return base64.urlsafe_b64encode(zlib.compress(raw, 9)).rstrip(b"=").decode("ascii")
+
+
+def decode_profile(token):
+    """
+    Decode a token from `encode_profile`. Returns a dict with courses,
+    current_sem, major, experiences and year (None for the default catalog
+    year), or raises ValueError if the token is malformed or inflates past
+    MAX_PROFILE_BYTES. Course codes are canonicalized like typed ones.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        inflater = zlib.decompressobj()
+        raw = inflater.decompress(base64.urlsafe_b64decode(padded), MAX_PROFILE_BYTES)
+        if inflater.unconsumed_tail:
+            raise ValueError(f"profile is larger than {MAX_PROFILE_BYTES} bytes")
+        if not inflater.eof:
+            raise ValueError("profile is truncated")
+        payload = json.loads(raw)
+        current_sem = min(max(int(payload["s"]), 1), 8)
+        courses = [
+            {"code": canonical_code(str(code)), "sem": min(max(int(sem), 1), current_sem)} for code, sem in payload["c"]
+        ]
+        courses += [{"code": canonical_code(str(code)), "sem": None, "origin": "external"} for code in payload["e"]]
+        # Spellings can share a canonical code; keep the first, as the sidebar does.
+        unique = {}
+        for course in courses:
+            unique.setdefault(course["code"], course)
+        courses = list(unique.values())
+        experiences = [name for name in payload["x"] if name in EXPERIENCES]
+        year = str(payload["y"]) if payload.get("y") else None
+    except (ValueError, TypeError, KeyError, zlib.error) as exc:
+        raise ValueError(f"invalid profile link: {exc}") from exc
+    return {
+        "courses": courses,
+        "current_sem": current_sem,
+        "major": payload["m"] or "None",
+        "experiences": experiences,
+        "year": year,
+    }
@@ -0,0 +1,167 @@
+import json
+import mmap
+import os
+import struct
+import time
+from collections.abc import Sequence
+from types import MappingProxyType
+
+MAGIC = b"PMOCAT01"
+_HEADER = struct.Struct("<8sQ")
+
+
+def compile_catalog(catalog, path):
+    """
+    Write `catalog` (anything with minors/majors/version/loaded_at) to `path` in
+    the compiled format that MappedCatalog maps read-only. Every catalog year
+    of a multi-year Catalog is compiled.
+
+    Layout: magic, index length, a JSON index (metadata plus the offset and
+    length of every minor, per catalog year), then one JSON blob per minor.
+    The file is written to a temporary name and renamed into place, so
+    processes that still map the previous file keep a consistent view.
+    """
+    blobs = []
+    offset = 0
+
+    def pack(minors):
+        nonlocal offset
+        entries = []
+        for minor in minors:
+            blob = json.dumps(dict(minor), separators=(",", ":")).encode("utf-8")
+            entries.append([minor["name"], offset, len(blob)])
+            blobs.append(blob)
+            offset += len(blob)
+        return entries
+
+    year = getattr(catalog, "year", None)
+    index = json.dumps(
+        {
+            "version": catalog.version,
+            "loaded_at": catalog.loaded_at,
+            "majors": list(catalog.majors),
+            "year": year,
+            "minors": pack(catalog.minors),
+            "years": {
+                label: pack(catalog.for_year(label).minors)
+                for label in getattr(catalog, "years", (year,))
+                if label != year
+            },
+        },
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as handle:
+        handle.write(_HEADER.pack(MAGIC, len(index)))
+        handle.write(index)
+        for blob in blobs:
+            handle.write(blob)
+    os.replace(tmp_path, path)
+
+
+class _MappedMinors(Sequence):
+    def __init__(self, mapped):
+        self._mapped = mapped
+
+    def __len__(self):
+        return len(self._mapped._entries)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+        return self._mapped.minor(idx)
+
+
+class MappedCatalog:
+    """
+    Read-only catalog backed by a memory-mapped compiled file.
+
+    Every worker process that maps the same file shares its pages through the OS
+    page cache, so adding workers does not add a private copy of the catalog.
+    Only the small index is decoded up front; each minor is decoded when it is
+    read and is not cached, so per-process memory stays flat. Every ranking
+    pass pays for that decoding; benchmarks/bench_shared_catalog.py measures
+    it against a catalog held in memory. Catalog years
+    compiled alongside the default one are served by `for_year()`.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as handle:
+            stat = os.fstat(handle.fileno())
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        self.identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        magic, index_length = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self._map.close()
+            raise ValueError(f"{path} is not a compiled catalog")
+        index = json.loads(self._map[_HEADER.size : _HEADER.size + index_length])
+        self._data_start = _HEADER.size + index_length
+        self._entries = index["minors"]
+        self._names = {entry[0]: idx for idx, entry in enumerate(self._entries)}
+        self._majors = tuple(index["majors"])
+        self._version = index["version"]
+        self._loaded_at = index.get("loaded_at") or time.time()
+        self._year = index.get("year")
+        self._root = self
+        # Other catalog years share this mapping, versioned "<version>:<year>"
+        # like Catalog.for_year().
+        self._views = {label: self._view(label, entries) for label, entries in index.get("years", {}).items()}
+
+    def _view(self, year, entries):
+        view = object.__new__(MappedCatalog)
+        view.__dict__.update(self.__dict__)
+        view._entries = entries
+        view._names = {entry[0]: idx for idx, entry in enumerate(entries)}
+        view._version = f"{self._version}:{year}"
+        view._year = year
+        return view
+
+    def minor(self, idx):
+        _, offset, length = self._entries[idx]
+        start = self._data_start + offset
+        return MappingProxyType(json.loads(self._map[start : start + length]))
+
+    def minor_by_name(self, name):
+        return self.minor(self._names[name])
+
+    @property
+    def minors(self):
+        return _MappedMinors(self)
+
+    @property
+    def majors(self):
+        return self._majors
+
+    @property
+    def version(self):
+        return self._version
+
+    @property
+    def loaded_at(self):
+        return self._loaded_at
+
+    @property
+    def year(self):
+        return self._year
+
+    @property
+    def years(self):
+        return (self._root._year, *self._root._views)
+
+    def for_year(self, year):
+        if year == self._root._year:
+            return self._root
+        return self._root._views[year]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def close(self):
+        self._map.close()
+
+
+def file_identity(path):
+    stat = os.stat(path)
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
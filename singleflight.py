@@ -0,0 +1,81 @@
+import threading
+
+from deadline import DeadlineExceeded
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.interrupted = False
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key.
+
+    The first caller for a key runs the function; callers arriving while it is in
+    flight wait and receive the same result (or exception). Once the call
+    finishes the key is forgotten, so later calls run again.
+
+    Only ordinary exceptions are shared. If the leader is interrupted by a
+    BaseException (KeyboardInterrupt, or Streamlit's stop/rerun signals raised
+    from the leader's own session), waiting callers retry instead of inheriting
+    that interruption. The same goes for DeadlineExceeded, which only means the
+    leader ran out of its own time budget.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn, *args, **kwargs):
+        return self.do_within(None, key, fn, *args, **kwargs)
+
+    def do_within(self, deadline, key, fn, *args, **kwargs):
+        """
+        Like do(), but a caller that joins a call already in flight waits at
+        most until `deadline` (a Deadline, or None for no limit) and then
+        raises DeadlineExceeded. The leader is not bounded here; pass the
+        deadline to `fn` as well for that.
+        """
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                leader = call is None
+                if leader:
+                    call = self._calls[key] = _Call()
+
+            if leader:
+                return self._run(key, call, fn, *args, **kwargs)
+
+            if not call.done.wait(None if deadline is None else deadline.remaining()):
+                raise DeadlineExceeded(f"deadline expired waiting for {key!r}")
+            if call.interrupted:
+                continue
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+    def _run(self, key, call, fn, *args, **kwargs):
+        try:
+            call.result = fn(*args, **kwargs)
+        except DeadlineExceeded:
+            call.interrupted = True
+            raise
+        except Exception as exc:
+            call.error = exc
+            raise
+        except BaseException:
+            call.interrupted = True
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
@@ -0,0 +1,356 @@
+import json
+import sqlite3
+import threading
+
+from optimizer import flatten_course_codes
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS minors (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    link TEXT NOT NULL,
+    restriction_text TEXT NOT NULL DEFAULT '',
+    notes TEXT NOT NULL DEFAULT '[]'
+);
+CREATE TABLE IF NOT EXISTS sections (
+    id INTEGER PRIMARY KEY,
+    minor_id INTEGER NOT NULL REFERENCES minors(id),
+    parent_id INTEGER REFERENCES sections(id),
+    position INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    required INTEGER,
+    description TEXT,
+    notes TEXT NOT NULL DEFAULT '[]'
+);
+CREATE TABLE IF NOT EXISTS groups (
+    id INTEGER PRIMARY KEY,
+    section_id INTEGER NOT NULL REFERENCES sections(id),
+    position INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS alternatives (
+    id INTEGER PRIMARY KEY,
+    group_id INTEGER NOT NULL REFERENCES groups(id),
+    position INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS alternative_courses (
+    alternative_id INTEGER NOT NULL REFERENCES alternatives(id),
+    position INTEGER NOT NULL,
+    code TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS section_courses (
+    section_id INTEGER NOT NULL REFERENCES sections(id),
+    role TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    code TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS exclusions (
+    section_id INTEGER NOT NULL REFERENCES sections(id),
+    code TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_minors_name ON minors(name);
+CREATE INDEX IF NOT EXISTS idx_sections_minor ON sections(minor_id, parent_id, position);
+CREATE INDEX IF NOT EXISTS idx_groups_section ON groups(section_id, position);
+CREATE INDEX IF NOT EXISTS idx_alternatives_group ON alternatives(group_id, position);
+CREATE INDEX IF NOT EXISTS idx_alternative_courses_alt ON alternative_courses(alternative_id, position);
+CREATE INDEX IF NOT EXISTS idx_alternative_courses_code ON alternative_courses(code);
+CREATE INDEX IF NOT EXISTS idx_section_courses_section ON section_courses(section_id, role, position);
+CREATE INDEX IF NOT EXISTS idx_section_courses_code ON section_courses(code);
+CREATE INDEX IF NOT EXISTS idx_exclusions_section ON exclusions(section_id);
+CREATE INDEX IF NOT EXISTS idx_exclusions_code ON exclusions(code);
+"""
+
+# Top-level sections only: pool children are already folded into pool options.
+_ACCEPTING_SQL = """
+SELECT DISTINCT m.name FROM minors m
+JOIN sections s ON s.minor_id = m.id
+JOIN groups g ON g.section_id = s.id
+JOIN alternatives a ON a.group_id = g.id
+JOIN alternative_courses ac ON ac.alternative_id = a.id
+WHERE ac.code = :code AND s.parent_id IS NULL
+  AND NOT EXISTS (SELECT 1 FROM exclusions e WHERE e.section_id = s.id AND e.code = :code)
+UNION
+SELECT DISTINCT m.name FROM minors m
+JOIN sections s ON s.minor_id = m.id
+JOIN section_courses sc ON sc.section_id = s.id
+WHERE sc.code = :code AND sc.role = 'option' AND s.parent_id IS NULL
+  AND NOT EXISTS (SELECT 1 FROM exclusions e WHERE e.section_id = s.id AND e.code = :code)
+ORDER BY 1
+"""
+
+
+class CatalogStore:
+    """
+    Normalized SQLite copy of the parsed catalog.
+
+    Minors, sections, groups, alternatives, course codes and exclusions each get
+    their own table with indexes on course code, so course lookups do not scan
+    every section. The database file can be opened by several worker processes;
+    each thread gets its own connection.
+    """
+
+    def __init__(self, path=":memory:"):
+        self.path = path
+        self._local = threading.local()
+        self._shared = None
+        if path == ":memory:":
+            # An in-memory database exists per connection, so share one.
+            self._shared = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._shared_lock = threading.Lock()
+        conn = self._connection()
+        if path != ":memory:":
+            # WAL lets worker processes keep reading while a refresh repopulates.
+            conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+
+    def _connection(self):
+        if self._shared is not None:
+            return self._shared
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.path, isolation_level=None)
+        return conn
+
+    def _write(self):
+        return _Transaction(self)
+
+    def _query(self, sql, params=()):
+        if self._shared is not None:
+            with self._shared_lock:
+                return self._shared.execute(sql, params).fetchall()
+        return self._connection().execute(sql, params).fetchall()
+
+    def populate(self, minors):
+        """
+        Replace the stored catalog with `minors` in a single transaction.
+        """
+        with self._write() as conn:
+            for table in (
+                "exclusions",
+                "section_courses",
+                "alternative_courses",
+                "alternatives",
+                "groups",
+                "sections",
+                "minors",
+            ):
+                conn.execute(f"DELETE FROM {table}")
+            for minor in minors:
+                cursor = conn.execute(
+                    "INSERT INTO minors (name, link, restriction_text, notes) VALUES (?, ?, ?, ?)",
+                    (
+                        minor["name"],
+                        minor["link"],
+                        minor.get("restriction_text", ""),
+                        json.dumps(list(minor.get("notes", []))),
+                    ),
+                )
+                for position, section in enumerate(minor.get("sections", [])):
+                    _insert_section(conn, cursor.lastrowid, None, position, section)
+
+    def minor_names(self):
+        return [row[0] for row in self._query("SELECT name FROM minors ORDER BY id")]
+
+    def restrictions(self):
+        """
+        Return (id, name, restriction_text) for every minor with restriction text.
+        """
+        return self._query("SELECT id, name, restriction_text FROM minors WHERE restriction_text != '' ORDER BY id")
+
+    def minors_accepting(self, code):
+        """
+        Return the names of minors where `code` can count toward a section.
+        """
+        return [row[0] for row in self._query(_ACCEPTING_SQL, {"code": code})]
+
+    def minor_ids_mentioning(self, codes):
+        """
+        Return ids of minors whose groups or options mention any of `codes`.
+        """
+        codes = sorted(set(codes))
+        if not codes:
+            return []
+        marks = ",".join("?" * len(codes))
+        sql = f"""
+            SELECT s.minor_id FROM alternative_courses ac
+            JOIN alternatives a ON a.id = ac.alternative_id
+            JOIN groups g ON g.id = a.group_id
+            JOIN sections s ON s.id = g.section_id
+            WHERE ac.code IN ({marks}) AND s.parent_id IS NULL
+            UNION
+            SELECT s.minor_id FROM section_courses sc
+            JOIN sections s ON s.id = sc.section_id
+            WHERE sc.code IN ({marks}) AND sc.role = 'option' AND s.parent_id IS NULL
+            ORDER BY 1
+        """
+        return [row[0] for row in self._query(sql, codes + codes)]
+
+    def minors(self, ids=None):
+        """
+        Rebuild minor dicts (all of them, or those with `ids`) for the optimizer.
+        Group alternatives come back as flat code lists, which evaluate the same
+        as the nested lists the scraper produces.
+        """
+        if ids is None:
+            rows = self._query("SELECT id, name, link, restriction_text, notes FROM minors ORDER BY id")
+        else:
+            ids = list(ids)
+            if not ids:
+                return []
+            marks = ",".join("?" * len(ids))
+            rows = self._query(
+                f"SELECT id, name, link, restriction_text, notes FROM minors WHERE id IN ({marks}) ORDER BY id",
+                ids,
+            )
+        return [
+            {
+                "name": name,
+                "link": link,
+                "sections": self._sections(minor_id, None),
+                "notes": json.loads(notes),
+                "restriction_text": restriction_text,
+            }
+            for minor_id, name, link, restriction_text, notes in rows
+        ]
+
+    def _sections(self, minor_id, parent_id):
+        if parent_id is None:
+            rows = self._query(
+                "SELECT id, title, kind, required, description, notes FROM sections "
+                "WHERE minor_id = ? AND parent_id IS NULL ORDER BY position",
+                (minor_id,),
+            )
+        else:
+            rows = self._query(
+                "SELECT id, title, kind, required, description, notes FROM sections "
+                "WHERE minor_id = ? AND parent_id = ? ORDER BY position",
+                (minor_id, parent_id),
+            )
+        return [self._section(minor_id, *row) for row in rows]
+
+    def _section(self, minor_id, section_id, title, kind, required, description, notes):
+        excluded = [
+            row[0]
+            for row in self._query(
+                "SELECT code FROM exclusions WHERE section_id = ? ORDER BY code", (section_id,)
+            )
+        ]
+        if kind == "manual":
+            return {"title": title, "kind": kind, "description": description or "", "excluded_codes": excluded}
+
+        section = {"title": title, "kind": kind, "required": required}
+        if kind == "pool":
+            section["options"] = self._section_codes(section_id, "option")
+            section["children"] = self._sections(minor_id, section_id)
+        else:
+            section["groups"] = self._groups(section_id)
+            section["codes"] = self._section_codes(section_id, "code")
+        section["notes"] = json.loads(notes)
+        section["excluded_codes"] = excluded
+        return section
+
+    def _section_codes(self, section_id, role):
+        return [
+            row[0]
+            for row in self._query(
+                "SELECT code FROM section_courses WHERE section_id = ? AND role = ? ORDER BY position",
+                (section_id, role),
+            )
+        ]
+
+    def _groups(self, section_id):
+        rows = self._query(
+            """
+            SELECT g.id, a.id, ac.code FROM groups g
+            JOIN alternatives a ON a.group_id = g.id
+            LEFT JOIN alternative_courses ac ON ac.alternative_id = a.id
+            WHERE g.section_id = ?
+            ORDER BY g.position, a.position, ac.position
+            """,
+            (section_id,),
+        )
+        groups = {}
+        for group_id, alt_id, code in rows:
+            alternatives = groups.setdefault(group_id, {})
+            codes = alternatives.setdefault(alt_id, [])
+            if code is not None:
+                codes.append(code)
+        return [list(alternatives.values()) for alternatives in groups.values()]
+
+    def close(self):
+        if self._shared is not None:
+            self._shared.close()
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+class _Transaction:
+    def __init__(self, store):
+        self.store = store
+
+    def __enter__(self):
+        if self.store._shared is not None:
+            self.store._shared_lock.acquire()
+        self.conn = self.store._connection()
+        self.conn.execute("BEGIN")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self.conn.execute("COMMIT")
+            else:
+                self.conn.execute("ROLLBACK")
+        finally:
+            if self.store._shared is not None:
+                self.store._shared_lock.release()
+        return False
+
+
+def _insert_section(conn, minor_id, parent_id, position, section):
+    kind = section.get("kind", "formula")
+    cursor = conn.execute(
+        "INSERT INTO sections (minor_id, parent_id, position, title, kind, required, description, notes) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            minor_id,
+            parent_id,
+            position,
+            section.get("title", "Section"),
+            kind,
+            section.get("required"),
+            section.get("description"),
+            json.dumps(list(section.get("notes", []))),
+        ),
+    )
+    section_id = cursor.lastrowid
+    conn.executemany(
+        "INSERT INTO exclusions (section_id, code) VALUES (?, ?)",
+        [(section_id, code) for code in section.get("excluded_codes", [])],
+    )
+    if kind == "pool":
+        conn.executemany(
+            "INSERT INTO section_courses (section_id, role, position, code) VALUES (?, 'option', ?, ?)",
+            [(section_id, idx, code) for idx, code in enumerate(section.get("options", []))],
+        )
+        for child_position, child in enumerate(section.get("children", [])):
+            _insert_section(conn, minor_id, section_id, child_position, child)
+    elif kind != "manual":
+        conn.executemany(
+            "INSERT INTO section_courses (section_id, role, position, code) VALUES (?, 'code', ?, ?)",
+            [(section_id, idx, code) for idx, code in enumerate(section.get("codes", []))],
+        )
+        for group_position, group in enumerate(section.get("groups", [])):
+            group_id = conn.execute(
+                "INSERT INTO groups (section_id, position) VALUES (?, ?)", (section_id, group_position)
+            ).lastrowid
+            for alt_position, alternative in enumerate(group):
+                alt_id = conn.execute(
+                    "INSERT INTO alternatives (group_id, position) VALUES (?, ?)", (group_id, alt_position)
+                ).lastrowid
+                conn.executemany(
+                    "INSERT INTO alternative_courses (alternative_id, position, code) VALUES (?, ?, ?)",
+                    [(alt_id, idx, code) for idx, code in enumerate(flatten_course_codes(alternative))],
+                )
@@ -0,0 +1,121 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import catalog
+import equivalencies
+import prereqs
+import refresher
+from equivalencies import EquivalencyTable
+from prereqs import PrereqGraph
+from test_store import MINORS
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+MATH_MINOR = {
+    "name": "Mathematics Minor",
+    "link": "https://example.com/math",
+    "sections": [
+        {
+            "title": "Calculus",
+            "kind": "formula",
+            "required": 2,
+            "groups": [[["MA16100"]], [["MA16200"]]],
+            "codes": ["MA16100", "MA16200"],
+            "notes": [],
+            "excluded_codes": [],
+        }
+    ],
+    "notes": [],
+    "restriction_text": "",
+}
+APP_MINORS = MINORS + [MATH_MINOR]
+
+
+class AppTests(unittest.TestCase):
+    """The Streamlit page, run in-process against a small catalog."""
+
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        snapshot = os.path.join(tmpdir.name, "snapshot.json")
+        catalog.save_snapshot(catalog.CatalogHolder().publish(APP_MINORS, majors=["Biology"]), snapshot)
+        env = patch.dict(
+            os.environ,
+            {
+                "MINOR_OPTIMIZER_SNAPSHOT": snapshot,
+                "MINOR_OPTIMIZER_REFRESH_SECONDS": "3600",
+                "MINOR_OPTIMIZER_PROFILES": os.path.join(tmpdir.name, "none.json"),
+            },
+        )
+        env.start()
+        self.addCleanup(env.stop)
+        scrape = patch.object(refresher, "scrape_catalog", lambda **_: (APP_MINORS, ["Biology"]))
+        scrape.start()
+        self.addCleanup(scrape.stop)
+        # The refresher is shared by every app run in the process; serve this
+        # catalog even if another test started it first.
+        holder = catalog.get_catalog_holder()
+        previous = holder.current()
+        holder.publish(APP_MINORS, majors=["Biology"])
+        if previous is not None:
+            self.addCleanup(holder.install, previous)
+
+    def run_session(self, courses):
+        from streamlit.testing.v1 import AppTest
+
+        app = AppTest.from_file(APP_PATH, default_timeout=30)
+        app.session_state["courses"] = [{"code": code, "sem": 1} for code in courses]
+        app.session_state["optimize"] = True
+        app.run()
+        return app
+
+    def test_only_open_sections_are_rendered(self):
+        # A profile no other test uses, so the shared result cache stays cold.
+        app = self.run_session(["CS18000", "CS30700"])
+
+        self.assertEqual([exc.value for exc in app.exception], [])
+        sections = {expander.label: len(expander.children) for expander in app.expander}
+        # Incomplete sections start open; the manual policy section stays
+        # closed and is not built until the student opens it.
+        self.assertGreater(sections["Required Courses"], 0)
+        self.assertEqual(sections["Policy"], 0)
+
+    def test_profiled_run_ranks_even_when_cached(self):
+        with tempfile.TemporaryDirectory() as profile_dir, patch.dict(
+            os.environ, {"MINOR_OPTIMIZER_PROFILE": "1", "MINOR_OPTIMIZER_PROFILE_DIR": profile_dir}
+        ):
+            self.run_session(["HIST10300"])
+            app = self.run_session(["HIST10300"])
+
+        self.assertEqual([exc.value for exc in app.exception], [])
+        # The first run cached this profile; the second must still score it.
+        functions = " ".join(app.table[0].value["function"])
+        self.assertIn("rank_catalog", functions)
+
+    def test_transfer_credit_counts_in_ranking_and_plan(self):
+        from streamlit.testing.v1 import AppTest
+
+        table = EquivalencyTable({"MATH 151": {"courses": ["MA 16100"]}})
+        graph = PrereqGraph({"MA16100": None, "MA16200": "MA16100"})
+        with patch.object(equivalencies, "_table", table), patch.object(prereqs, "_graph", graph):
+            app = AppTest.from_file(APP_PATH, default_timeout=30)
+            app.run()
+            app.text_input(key="external_courses_input").input("MATH 151")
+            next(button for button in app.button if button.label == "Add External Credits").click().run()
+            next(button for button in app.button if button.label == "Find minor optimization").click().run()
+
+        self.assertEqual([exc.value for exc in app.exception], [])
+        self.assertEqual(app.session_state["courses"][0]["code"], "MATH15100")
+        self.assertTrue(any("Counts as MA 16100" in item.value for item in app.sidebar.markdown))
+        completed = {metric.label: metric.value for metric in app.metric}["Completed"]
+        self.assertEqual(completed, "1 / 2")
+        # The credit covers MA 16200's prerequisite, so the plan does not
+        # schedule MA 16100 again.
+        planned = app.table[0].value
+        self.assertEqual(list(planned["Courses"]), ["MA 16200"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import os
+import tempfile
+import unittest
+import zipfile
+from unittest.mock import patch
+
+import scraper
+from archive import ArchiveMiss, HtmlArchive
+from test_scraper import ACCOUNTING_MINOR_HTML, MINORS_INDEX_HTML
+
+ACCOUNTING_URL = "https://catalog.purdue.edu/preview_program.php?catoid=19&poid=111"
+
+
+class HtmlArchiveTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "catalog.zip")
+
+    def tearDown(self):
+        scraper.use_archive(None)
+        self.tmpdir.cleanup()
+
+    def test_round_trip_and_miss(self):
+        archive = HtmlArchive(self.path)
+        archive.put(scraper.MINORS_PAGE, MINORS_INDEX_HTML)
+        archive.put(ACCOUNTING_URL, ACCOUNTING_MINOR_HTML * 20)
+
+        self.assertEqual(archive.get(scraper.MINORS_PAGE), MINORS_INDEX_HTML)
+        self.assertEqual(archive.urls(), sorted([scraper.MINORS_PAGE, ACCOUNTING_URL]))
+        self.assertNotIn("https://example.com/missing", archive)
+        with self.assertRaises(ArchiveMiss):
+            archive.get("https://example.com/missing")
+        self.assertLess(os.path.getsize(self.path), len(ACCOUNTING_MINOR_HTML) * 20)
+
+    def test_rerecording_replaces_page_without_growing_archive(self):
+        archive = HtmlArchive(self.path)
+        archive.put(scraper.MINORS_PAGE, MINORS_INDEX_HTML)
+        archive.put(ACCOUNTING_URL, ACCOUNTING_MINOR_HTML)
+        size = os.path.getsize(self.path)
+        for _ in range(5):
+            archive.put(ACCOUNTING_URL, ACCOUNTING_MINOR_HTML)
+
+        self.assertEqual(os.path.getsize(self.path), size)
+        with zipfile.ZipFile(self.path) as raw:
+            self.assertEqual(len(raw.namelist()), 2)
+        archive.put(ACCOUNTING_URL, "new")
+        self.assertEqual(HtmlArchive(self.path).get(ACCOUNTING_URL), "new")
+        self.assertEqual(HtmlArchive(self.path).get(scraper.MINORS_PAGE), MINORS_INDEX_HTML)
+
+    def test_batch_defers_writes_until_exit(self):
+        archive = HtmlArchive(self.path)
+        with archive.batch():
+            archive.put(scraper.MINORS_PAGE, MINORS_INDEX_HTML)
+            archive.put(ACCOUNTING_URL, ACCOUNTING_MINOR_HTML)
+            self.assertFalse(os.path.exists(self.path))
+            self.assertEqual(archive.get(ACCOUNTING_URL), ACCOUNTING_MINOR_HTML)
+
+        self.assertEqual(HtmlArchive(self.path).urls(), sorted([scraper.MINORS_PAGE, ACCOUNTING_URL]))
+
+    def test_switching_archives_closes_previous_reader(self):
+        HtmlArchive(self.path).put(ACCOUNTING_URL, ACCOUNTING_MINOR_HTML)
+        scraper.use_archive(self.path, "replay")
+        scraper._fetch_html(ACCOUNTING_URL)
+        previous = scraper._archive
+
+        scraper.use_archive(os.path.join(self.tmpdir.name, "other.zip"), "record")
+
+        self.assertIsNone(previous._reader)
+
+    def test_scraper_records_then_replays_without_network(self):
+        pages = {scraper.MINORS_PAGE: MINORS_INDEX_HTML, ACCOUNTING_URL: ACCOUNTING_MINOR_HTML}
+        scraper.use_archive(self.path, "record")
+        with patch("scraper._fetch_html_from_network", side_effect=pages.get):
+            recorded = scraper.get_minor_list()
+            recorded_reqs = scraper._get_requirements_from_minor_page(ACCOUNTING_URL)
+
+        scraper.use_archive(self.path, "replay")
+        with patch("scraper._fetch_html_from_network", side_effect=AssertionError("network used")):
+            self.assertEqual(scraper.get_minor_list(), recorded)
+            self.assertEqual(scraper._get_requirements_from_minor_page(ACCOUNTING_URL), recorded_reqs)
+            with self.assertRaises(ArchiveMiss):
+                scraper._fetch_html("https://example.com/missing")
+
+    def test_unknown_mode_is_rejected(self):
+        with self.assertRaises(ValueError):
+            scraper.use_archive(self.path, "rewind")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,248 @@
+import collections
+import json
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+import catalog
+import refresher
+import scraper
+from catalog import CatalogHolder, CatalogLoader
+from test_scraper import ACCOUNTING_MINOR_HTML, COMMUNICATION_MINOR_HTML, MINORS_INDEX_HTML
+from test_store import MINORS
+
+ACCOUNTING_URL = "https://catalog.purdue.edu/preview_program.php?catoid=19&poid=111"
+AEROSPACE_URL = "https://catalog.purdue.edu/preview_program.php?catoid=19&poid=333"
+SOMETHING_URL = "https://catalog.purdue.edu/preview_program.php?catoid=19&poid=444"
+PAGES = {
+    scraper.MINORS_PAGE: MINORS_INDEX_HTML,
+    ACCOUNTING_URL: ACCOUNTING_MINOR_HTML,
+    AEROSPACE_URL: COMMUNICATION_MINOR_HTML,
+}
+
+
+class CatalogLoaderTests(unittest.TestCase):
+    def setUp(self):
+        self.hits = collections.Counter()
+
+        def fake_fetch(url):
+            self.hits[url] += 1
+            if url not in PAGES:
+                raise RuntimeError("unreachable")
+            return PAGES[url]
+
+        patcher = patch("scraper._fetch_html", side_effect=fake_fetch)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        catalog.refresh_loader()
+
+    def test_requirements_load_lazily_per_minor(self):
+        loader = CatalogLoader()
+        self.assertEqual(len(loader.minor_list()), 3)
+        sections, _, _ = loader.requirements(ACCOUNTING_URL)
+        loader.requirements(ACCOUNTING_URL)
+
+        self.assertEqual(sections[0]["title"], "Required Courses (9-12 credits)")
+        self.assertEqual(dict(self.hits), {scraper.MINORS_PAGE: 1, ACCOUNTING_URL: 1})
+        self.assertEqual(loader.stats()["minors_loaded"], 1)
+
+    def test_both_call_paths_share_one_index_fetch(self):
+        loader = CatalogLoader()
+        names = [name for name, _ in loader.minor_list()]
+        by_name = loader.requirements_by_name()
+        minors = loader.minors_data(parse_workers=1)
+
+        self.assertEqual(list(by_name), names)
+        self.assertEqual([minor["name"] for minor in minors], names)
+        self.assertEqual(by_name["Minor in Something"], ([], [], ""))
+        self.assertEqual(minors[0]["sections"], by_name["Accounting Minor"][0])
+        self.assertEqual(self.hits[scraper.MINORS_PAGE], 1)
+        self.assertEqual(max(self.hits.values()), 1)
+
+        stats = loader.stats()
+        self.assertEqual(stats["pages_fetched"], 3)
+        self.assertEqual(
+            stats["bytes_fetched"],
+            sum(len(PAGES[url].encode("utf-8")) for url in PAGES),
+        )
+        self.assertEqual(stats["minors_loaded"], 3)
+
+    def test_fresh_loader_runs_pipeline_for_every_minor(self):
+        loaded = []
+        loader = CatalogLoader()
+        minors = loader.minors_data(parse_workers=1, progress=loaded.append)
+
+        # The unreachable page is left out rather than cached as empty.
+        self.assertEqual([minor["name"] for minor in minors], ["Accounting Minor", "Aerospace Studies Minor"])
+        self.assertEqual(minors[0]["sections"][0]["title"], "Required Courses (9-12 credits)")
+        self.assertEqual(minors[1]["sections"], scraper._parse_minor_page(COMMUNICATION_MINOR_HTML)[0])
+        self.assertEqual(sorted(loaded), ["Accounting Minor", "Aerospace Studies Minor", "Minor in Something"])
+        self.assertEqual(
+            dict(self.hits),
+            {scraper.MINORS_PAGE: 1, ACCOUNTING_URL: 1, AEROSPACE_URL: 1, SOMETHING_URL: 1},
+        )
+
+        PAGES[SOMETHING_URL] = ACCOUNTING_MINOR_HTML
+        self.addCleanup(PAGES.pop, SOMETHING_URL)
+        minors = loader.minors_data(parse_workers=1)
+        self.assertEqual(minors[2]["name"], "Minor in Something")
+        self.assertEqual(self.hits[SOMETHING_URL], 2)
+        self.assertEqual(self.hits[ACCOUNTING_URL], 1)
+
+    def test_scraped_years_share_section_objects(self):
+        older_index = "https://catalog.purdue.edu/content.php?catoid=16&navoid=1"
+        years = {"2023-2024": older_index}
+        with patch.dict(PAGES, {older_index: MINORS_INDEX_HTML}), patch.dict(
+            os.environ, {"MINOR_OPTIMIZER_CATALOG_YEARS": json.dumps(years)}
+        ), patch("scraper.get_majors_list", return_value=[]):
+            minors, _, loaded = refresher.scrape_catalog(parse_workers=1)
+        self.addCleanup(catalog._loaders.pop, older_index, None)
+
+        current, older = catalog.get_loader(), catalog.get_loader(older_index)
+        self.assertIsNot(current, older)
+        self.assertIs(
+            older.requirements(ACCOUNTING_URL)[0][0], current.requirements(ACCOUNTING_URL)[0][0]
+        )
+        self.assertIs(loaded["2023-2024"][0]["sections"][0], minors[0]["sections"][0])
+        self.assertIs(minors[0]["sections"][0], current.requirements(ACCOUNTING_URL)[0][0])
+
+    def test_app_and_scraper_paths_share_the_module_loader(self):
+        minors = catalog.load_catalog(parse_workers=1)
+        by_name = scraper.get_minors_requirements()
+
+        self.assertEqual(list(by_name)[:2], [minor["name"] for minor in minors])
+        self.assertEqual(self.hits[scraper.MINORS_PAGE], 1)
+        self.assertEqual(self.hits[ACCOUNTING_URL], 1)
+        self.assertIs(catalog.get_loader(), catalog.get_loader())
+
+        catalog.refresh_loader()
+        scraper.get_minors_requirements()
+        self.assertEqual(self.hits[scraper.MINORS_PAGE], 2)
+
+
+def versioned_minors(tag, count=50):
+    return [
+        {"name": f"{tag} Minor {idx}", "link": f"https://example.com/{tag}/{idx}", "sections": [], "tag": tag}
+        for idx in range(count)
+    ]
+
+
+class CatalogHolderTests(unittest.TestCase):
+    def test_catalog_is_read_only_and_versioned(self):
+        holder = CatalogHolder()
+        first = holder.publish(versioned_minors("a", 2))
+        second = holder.publish(versioned_minors("b", 2))
+
+        self.assertEqual((first.version, second.version), (1, 2))
+        self.assertIs(holder.current(), second)
+        self.assertEqual(first.minors[0]["tag"], "a")
+        with self.assertRaises(TypeError):
+            first.minors[0]["tag"] = "b"
+        with self.assertRaises(AttributeError):
+            first.version = 5
+        self.assertIs(holder.publish(versioned_minors("c", 2), if_empty=True), second)
+
+    def test_concurrent_readers_never_see_a_mixed_catalog(self):
+        holder = CatalogHolder()
+        holder.publish(versioned_minors("v0"))
+        stop = threading.Event()
+        problems = []
+        reads = collections.Counter()
+
+        def reader(idx):
+            last_version = 0
+            while not stop.is_set():
+                snapshot = holder.current()
+                tags = {minor["tag"] for minor in snapshot.minors}
+                if len(tags) != 1 or len(snapshot) != 50:
+                    problems.append(("mixed", tags))
+                if snapshot.version < last_version:
+                    problems.append(("went back", last_version, snapshot.version))
+                last_version = snapshot.version
+                reads[idx] += 1
+
+        readers = [threading.Thread(target=reader, args=(idx,)) for idx in range(8)]
+        for thread in readers:
+            thread.start()
+        for version in range(1, 200):
+            holder.publish(versioned_minors(f"v{version}"))
+        stop.set()
+        for thread in readers:
+            thread.join()
+
+        self.assertEqual(problems, [])
+        self.assertEqual(holder.current().version, 200)
+        self.assertTrue(all(reads[idx] > 0 for idx in range(8)))
+
+    def test_background_refresh_swaps_in_new_version(self):
+        holder = CatalogHolder()
+        holder.publish(versioned_minors("old", 1))
+        pages = {scraper.MINORS_PAGE: MINORS_INDEX_HTML, ACCOUNTING_URL: ACCOUNTING_MINOR_HTML}
+        with patch("scraper._fetch_html", side_effect=lambda url: pages.get(url, "")):
+            before = holder.current()
+            catalog.refresh_catalog_in_background(holder, parse_workers=1).join(timeout=30)
+
+        self.assertEqual(before.version, 1)
+        self.assertEqual(before.minors[0]["tag"], "old")
+        self.assertEqual(holder.current().version, 2)
+        self.assertEqual(holder.current().minors[0]["name"], "Accounting Minor")
+
+
+class CatalogYearsTests(unittest.TestCase):
+    def older_year(self):
+        # A separately loaded copy in which only the Data Minor's section changed.
+        minors = json.loads(json.dumps(MINORS))
+        minors[1]["sections"][0]["required"] = 2
+        return minors
+
+    def test_years_share_identical_sections(self):
+        published = CatalogHolder().publish(MINORS, years={"2023-2024": self.older_year()}, year="2024-2025")
+        older = published.for_year("2023-2024")
+
+        self.assertEqual(published.years, ("2024-2025", "2023-2024"))
+        self.assertIs(published.for_year("2024-2025"), published)
+        self.assertEqual(older.version, "1:2023-2024")
+        self.assertIs(older.minors[0]["sections"][0], published.minors[0]["sections"][0])
+        self.assertIsNot(older.minors[1]["sections"][0], published.minors[1]["sections"][0])
+        self.assertEqual(older.minors[1]["sections"][0]["required"], 2)
+        with self.assertRaises(KeyError):
+            published.for_year("1999-2000")
+
+    def test_snapshot_stores_each_section_once(self):
+        published = CatalogHolder().publish(MINORS, years={"2023-2024": self.older_year()}, year="2024-2025")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "snapshot.json")
+            catalog.save_snapshot(published, path)
+            with open(path, encoding="utf-8") as handle:
+                payload = json.load(handle)
+            minors, _, _, years, year = catalog.load_snapshot_years(path)
+
+        distinct = {catalog.section_hash(section) for minor in MINORS + self.older_year() for section in minor["sections"]}
+        self.assertEqual(len(payload["sections"]), len(distinct))
+        self.assertEqual(year, "2024-2025")
+        self.assertEqual(minors, MINORS)
+        self.assertEqual(years, {"2023-2024": self.older_year()})
+        self.assertIs(years["2023-2024"][0]["sections"][0], minors[0]["sections"][0])
+
+    def test_snapshots_with_inline_sections_still_load(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "snapshot.json")
+            with open(path, "w", encoding="utf-8") as handle:
+                json.dump({"loaded_at": 1.0, "majors": [], "minors": MINORS}, handle)
+            minors, _, loaded_at = catalog.load_snapshot(path)
+
+        self.assertEqual((minors, loaded_at), (MINORS, 1.0))
+
+    def test_catalog_years_come_from_the_environment(self):
+        extra = {"2023-2024": "https://catalog.purdue.edu/content.php?catoid=16&navoid=1"}
+        with patch.dict(os.environ, {"MINOR_OPTIMIZER_CATALOG_YEARS": json.dumps(extra)}):
+            years = scraper.catalog_years()
+
+        self.assertEqual(list(years), [scraper.DEFAULT_CATALOG_YEAR, "2023-2024"])
+        self.assertEqual(years[scraper.DEFAULT_CATALOG_YEAR], scraper.MINORS_PAGE)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import copy
+import unittest
+
+from catalog import CatalogHolder
+from catalog_diff import diff_catalogs, diff_minors, format_diff
+from test_store import MINORS
+
+
+def edited_minors():
+    minors = copy.deepcopy(MINORS)
+    cs = minors[0]
+    cs["sections"][1]["required"] = 3
+    cs["sections"][1]["options"].append("CS37300")
+    cs["sections"][1]["children"][0]["groups"] = [[["CS35400"]]]
+    cs["sections"][0]["excluded_codes"] = ["CS24000"]
+    del minors[1]
+    minors.append({"name": "Economics Minor", "link": "https://example.com/econ", "sections": []})
+    return minors
+
+
+class CatalogDiffTests(unittest.TestCase):
+    def test_unchanged_minors_are_counted_not_walked(self):
+        diff = diff_minors(MINORS, copy.deepcopy(MINORS))
+
+        self.assertEqual(diff, {"added": [], "removed": [], "changed": {}, "unchanged": len(MINORS)})
+
+    def test_changes_are_reported_per_section_and_field(self):
+        diff = diff_minors(MINORS, edited_minors())
+
+        self.assertEqual(diff["added"], ["Economics Minor"])
+        self.assertEqual(diff["removed"], ["Data Minor"])
+        self.assertEqual(diff["unchanged"], 1)
+        sections = diff["changed"]["Computer Science Minor"]["sections"]
+        self.assertEqual(sections["added"], [])
+        self.assertEqual(sections["changed"]["Required Courses"], {"excluded_codes": {"added": ["CS24000"], "removed": []}})
+        pool = sections["changed"]["Choose two"]
+        self.assertEqual(pool["required"], {"old": 2, "new": 3})
+        self.assertEqual(pool["options"], {"added": ["CS37300"], "removed": []})
+        self.assertEqual(pool["children"]["changed"]["Systems"]["groups"], {"added": ["CS35400"], "removed": ["CS35200"]})
+
+    def test_catalog_report_lists_caches_to_invalidate(self):
+        old = CatalogHolder().publish(MINORS, majors=["Accounting"], years={"2023-2024": MINORS}, year="2024-2025")
+        same = CatalogHolder().publish(
+            copy.deepcopy(MINORS), majors=["Accounting"], years={"2023-2024": MINORS}, year="2024-2025"
+        )
+        older_changed = CatalogHolder().publish(
+            MINORS, majors=["Accounting"], years={"2023-2024": edited_minors()}, year="2024-2025"
+        )
+
+        self.assertEqual(diff_catalogs(old, same)["invalidate"], [])
+        self.assertEqual(format_diff(diff_catalogs(old, same)), "No changes.")
+        report = diff_catalogs(old, older_changed)
+        self.assertEqual(list(report["years"]), ["2023-2024"])
+        self.assertEqual(report["new_courses"], ["CS35400", "CS37300"])
+        # Only the default year is compiled and stored in SQLite.
+        self.assertEqual(
+            report["invalidate"], ["result cache", "interned minors", "search index", "snapshot", "prerequisites"]
+        )
+        text = format_diff(report)
+        self.assertIn("2023-2024: 1 changed, 1 added, 1 removed, 1 unchanged", text)
+        self.assertIn("~ section 'Choose two': required 2 -> 3; options +CS37300", text)
+
+
+if __name__ == "__main__":
+    unittest.main()
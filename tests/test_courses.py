@@ -0,0 +1,111 @@
+import os
+import random
+import sys
+import unittest
+from unittest.mock import patch
+
+import optimizer
+import scraper
+from courses import CourseIndex, CourseRegistry, get_registry, normalize_code
+from test_store import MINORS
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+import fuzz_scoring  # noqa: E402
+from synthetic import make_catalog, make_taken  # noqa: E402
+
+
+class CourseRegistryTests(unittest.TestCase):
+    def test_normalize_code_pads_short_numbers(self):
+        self.assertEqual(normalize_code("cs 180"), "CS18000")
+        self.assertEqual(normalize_code("CS180"), "CS18000")
+        self.assertEqual(normalize_code("MA 1620"), "MA16200")
+        self.assertEqual(normalize_code("ENGL 10600"), "ENGL10600")
+        self.assertEqual(normalize_code("ap calc bc"), "APCALCBC")
+
+    def test_aliases_resolve_cross_listed_courses(self):
+        registry = CourseRegistry({"STAT 416": "MA 41600"})
+        self.assertEqual(registry.canonical("STAT41600"), "MA41600")
+        self.assertEqual(registry.intern("stat 416"), registry.intern("MA41600"))
+
+    def test_ids_are_dense_stable_and_reversible(self):
+        registry = CourseRegistry()
+        first = registry.intern("CS18000")
+        second = registry.intern("MA16100")
+        self.assertEqual((first, second), (0, 1))
+        self.assertEqual(registry.intern("cs 180"), first)
+        self.assertEqual(registry.code(second), "MA16100")
+        self.assertEqual(registry.ids(["CS180", "HIST10000"]), frozenset({first}))
+        self.assertIsNone(registry.id_of("HIST10000"))
+        self.assertEqual(len(registry), 2)
+
+    def test_default_registry_loads_bundled_aliases(self):
+        self.assertEqual(get_registry().canonical("STAT 51900"), "MA51900")
+
+    def test_scraper_canonicalizes_catalog_codes(self):
+        self.assertEqual(scraper._extract_course_codes("CS 180 or CS 18200 or STAT 416"), ["CS18000", "CS18200", "MA41600"])
+
+
+class CourseIndexTests(unittest.TestCase):
+    def setUp(self):
+        codes = optimizer.catalog_course_codes(MINORS)
+        self.index = CourseIndex(codes, {"CS18000": "Problem Solving And Object-Oriented Programming"})
+
+    def test_completes_code_prefixes_in_order(self):
+        self.assertEqual([code for code, _ in self.index.complete("cs 2")], ["CS24000", "CS25100", "CS25200"])
+        self.assertEqual(self.index.complete("cs18"), [("CS18000", "Problem Solving And Object-Oriented Programming")])
+        self.assertEqual(len(self.index.complete("cs", limit=2)), 2)
+        self.assertEqual(self.index.complete(" "), [])
+
+    def test_completes_title_words(self):
+        self.assertEqual([code for code, _ in self.index.complete("object")], ["CS18000"])
+
+    def test_suggests_nearest_codes_for_typos(self):
+        self.assertEqual([code for code, _ in self.index.suggest("cs 181")], ["CS18000"])
+        self.assertEqual([code for code, _ in self.index.suggest("CS 35300")], ["CS35200"])
+        self.assertEqual(self.index.suggest("cs 180"), [])
+        self.assertEqual(self.index.suggest("CS 90000"), [])
+        self.assertIn("STAT35000", self.index)
+
+
+class InternedScoringTests(unittest.TestCase):
+    def assert_same_ranking(self, minors, taken, major=None):
+        registry = CourseRegistry()
+        interned = [optimizer.intern_minor(minor, registry) for minor in minors]
+        self.assertEqual(
+            optimizer.rank_interned(interned, taken, registry, major),
+            optimizer.rank_minors(minors, taken, major),
+        )
+
+    def test_matches_reference_on_fixture(self):
+        for taken in ({"CS18000"}, {"CS18000", "CS24000", "CS25100", "CS35200"}, {"HIST10000"}):
+            self.assert_same_ranking(MINORS, taken)
+
+    def test_matches_reference_on_synthetic_catalog(self):
+        minors = make_catalog(60, seed=3)
+        rng = random.Random(3)
+        for _ in range(20):
+            self.assert_same_ranking(minors, make_taken(rng, rng.randint(1, 40)))
+
+    def test_fuzzed_sections_match_reference(self):
+        self.assertIsNone(fuzz_scoring.fuzz(300, seed=7))
+
+    def test_fuzzer_minimizes_mismatches(self):
+        evaluate = optimizer._evaluate_interned_pool
+
+        def drops_last_option(*args):
+            result = evaluate(*args)
+            result["remaining_options"] = result["remaining_options"][:-1]
+            return result
+
+        with patch.object(optimizer, "_evaluate_interned_pool", drops_last_option):
+            case, difference = fuzz_scoring.fuzz(300, seed=7)
+
+        self.assertIn("remaining_options", difference)
+        # One pool with one remaining option and one taken one is the smallest repro.
+        self.assertEqual(len(case["minor"]["sections"]), 1)
+        self.assertEqual(len(case["minor"]["sections"][0]["options"]), 2)
+        self.assertEqual(len(case["taken"]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
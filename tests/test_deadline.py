@@ -0,0 +1,68 @@
+import time
+import unittest
+from unittest.mock import patch
+
+import catalog
+import pipeline
+from deadline import Deadline, remaining_timeout
+from test_singleflight import StubCatalog
+
+SLOW_PAGE = "/preview_program.php?poid=222"
+
+
+class DeadlineTests(unittest.TestCase):
+    def test_timeouts_shrink_to_the_remaining_budget(self):
+        deadline = Deadline(0.2)
+        self.assertLessEqual(deadline.timeout(30), 0.2)
+        self.assertEqual(deadline.timeout(0.01), 0.01)
+        self.assertEqual(remaining_timeout(None, 30), 30)
+        time.sleep(0.25)
+        self.assertTrue(deadline.expired())
+        self.assertEqual(deadline.timeout(30), 0.0)
+
+    def test_pipeline_returns_finished_pages_when_deadline_expires(self):
+        def fetch(url):
+            if url == "slow":
+                time.sleep(2)
+            return "<html><body></body></html>"
+
+        started = time.monotonic()
+        results, stats = pipeline.load_minor_pages(
+            ["fast", "slow"], fetch=fetch, parse_workers=1, deadline=Deadline(0.5)
+        )
+
+        self.assertLess(time.monotonic() - started, 1.5)
+        self.assertEqual(set(results), {"fast"})
+        self.assertEqual(stats["skipped"], ["slow"])
+
+
+class LoaderDeadlineTests(unittest.TestCase):
+    def setUp(self):
+        self.stub = StubCatalog(delay=0.05, delays={SLOW_PAGE: 3})
+        for target, value in (
+            ("scraper.BASE_URL", self.stub.base_url),
+            ("scraper.MINORS_PAGE", self.stub.base_url + "/content.php"),
+        ):
+            patcher = patch(target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(self.stub.close)
+
+    def test_slow_page_is_skipped_and_loaded_on_the_next_request(self):
+        loader = catalog.CatalogLoader()
+        started = time.monotonic()
+        minors, skipped = loader.minors_within(Deadline(1.0), parse_workers=1)
+
+        self.assertLess(time.monotonic() - started, 2.0)
+        self.assertEqual([minor["name"] for minor in minors], ["Accounting Minor"])
+        self.assertEqual(skipped, ["Communication Minor"])
+
+        self.stub.delays.clear()
+        minors, skipped = loader.minors_within(Deadline(10), parse_workers=1)
+        self.assertEqual(skipped, [])
+        self.assertEqual([minor["name"] for minor in minors], ["Accounting Minor", "Communication Minor"])
+        self.assertTrue(minors[1]["sections"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import json
+import os
+import tempfile
+import unittest
+
+import optimizer
+from equivalencies import EquivalencyTable, credit_key, get_equivalencies, load_equivalencies
+from test_store import MINORS
+
+CREDITS = {
+    "AP Statistics": {"aliases": ["AP Stats"], "scores": {"3": ["STAT 301"], "5": ["STAT 301", "STAT 350"]}},
+    "Ivy Tech CSCI 101": {"courses": ["cs 180"]},
+}
+
+
+class EquivalencyTableTests(unittest.TestCase):
+    def setUp(self):
+        self.table = EquivalencyTable(CREDITS)
+
+    def test_scores_are_minimums_and_spellings_do_not_matter(self):
+        self.assertEqual(self.table.lookup("AP Statistics: 3"), ("STAT30100",))
+        self.assertEqual(self.table.lookup("ap stats 4"), ("STAT30100",))
+        self.assertEqual(self.table.lookup("APSTATS:5"), ("STAT30100", "STAT35000"))
+        self.assertEqual(self.table.lookup("AP Statistics: 2"), ())
+        self.assertEqual(self.table.label("ap stats 5"), "AP Statistics")
+        self.assertEqual(credit_key("AP Statistics: 5"), "APSTATISTICS5")
+
+    def test_transfer_courses_need_no_score(self):
+        self.assertEqual(self.table.lookup("IVY TECH CSCI 101"), ("CS18000",))
+        self.assertEqual(self.table.lookup("CS18000"), ())
+        self.assertEqual(len(self.table), 2)
+
+    def test_course_style_credits_match_as_the_app_stores_them(self):
+        table = EquivalencyTable({"MATH 151": {"courses": ["MA 16100"]}})
+
+        # The app stores "MATH 151" as the canonical code MATH15100.
+        self.assertEqual(table.lookup("MATH15100"), ("MA16100",))
+        self.assertEqual(table.lookup("math 151"), ("MA16100",))
+        self.assertEqual(table.label("MATH15100"), "MATH 151")
+
+    def test_expanded_credits_count_toward_minors(self):
+        taken = self.table.expand({"APSTATS:5", "IVYTECHCSCI101"})
+        data = next(result for result in optimizer.rank_minors(MINORS, taken)[0] if result["name"] == "Data Minor")
+
+        self.assertIn("STAT35000", taken)
+        self.assertIn("APSTATS:5", taken)
+        self.assertEqual(data["completed"], data["total"])
+
+    def test_table_loads_from_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "equivalencies.json")
+            with open(path, "w", encoding="utf-8") as handle:
+                json.dump(CREDITS, handle)
+            loaded = EquivalencyTable(load_equivalencies(path))
+
+        self.assertEqual(loaded.lookup("AP Stats 5"), self.table.lookup("AP Stats 5"))
+        self.assertEqual(get_equivalencies().lookup("AP Calc BC: 5"), ("MA16500", "MA16600"))
+
+
+if __name__ == "__main__":
+    unittest.main()
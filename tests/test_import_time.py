@@ -0,0 +1,56 @@
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Modules the app imports before a user asks for anything; scraping happens in
+# the background refresher, so none of them may pull in network or parsing libs.
+RECOMMENDATION_PATH = ("optimizer", "prereqs", "refresher", "result_cache")
+DEFERRED_MODULES = ("requests", "bs4", "playwright", "pandas", "sqlite3", "concurrent.futures.process")
+# Cold-import budget in microseconds for the whole recommendation path. It is
+# several times the measured cost (~25 ms) so slow CI machines stay green while
+# a newly added eager heavy import still trips it.
+IMPORT_BUDGET_US = 150_000
+
+
+def import_profile(modules):
+    """
+    Run `python -X importtime` in a fresh interpreter and return
+    ({module: cumulative_us}, total_us for the requested top-level modules).
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import " + ", ".join(modules)],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative = {}
+    total = 0
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, self_us, cumulative_us, name = (part.strip() for part in line.replace("import time:", "|", 1).split("|"))
+        cumulative[name] = int(cumulative_us)
+        if name in modules:
+            total += int(cumulative_us)
+    return cumulative, total
+
+
+class ImportTimeTests(unittest.TestCase):
+    def test_recommendation_path_defers_scraping_dependencies(self):
+        imported, _ = import_profile(RECOMMENDATION_PATH)
+
+        for module in RECOMMENDATION_PATH:
+            self.assertIn(module, imported)
+        self.assertEqual([module for module in DEFERRED_MODULES if module in imported], [])
+
+    def test_recommendation_path_import_budget(self):
+        best = min(import_profile(RECOMMENDATION_PATH)[1] for _ in range(3))
+
+        self.assertLess(best, IMPORT_BUDGET_US, f"cold import took {best / 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,8 @@
 import unittest
 
 import optimizer
+from test_prereqs import chain_graph
+from test_store import MINORS
 
 
 class OptimizerTests(unittest.TestCase):
@@ -134,5 +136,94 @@ class OptimizerTests(unittest.TestCase):
         self.assertIn("HORT31900", summary["taken_codes"])
 
 
+class SemesterPlanTests(unittest.TestCase):
+    def cs_result(self, taken):
+        results, _ = optimizer.rank_minors(MINORS, taken)
+        return next(result for result in results if result["name"] == "Computer Science Minor")
+
+    def test_plan_without_prerequisites_fills_semesters_up_to_the_cap(self):
+        history = [{"code": "CS18000", "sem": 1}, {"code": "AP10000", "sem": None}]
+        result = self.cs_result({"CS18000"})
+
+        plan = optimizer.plan_semesters([result], history, current_sem=2, cap=3)
+        capped = optimizer.plan_semesters([result], history, current_sem=2, cap=1)
+
+        self.assertEqual(plan["finish"], 3)
+        self.assertEqual(plan["history"], {1: ["CS18000"]})
+        self.assertEqual(sum(len(entry["courses"]) for entry in plan["semesters"]), 3)
+        self.assertEqual(capped["finish"], 5)
+        self.assertTrue(all(len(entry["courses"]) == 1 for entry in capped["semesters"]))
+
+    def test_plan_schedules_prerequisite_chains_first(self):
+        minor = {
+            "name": "Systems Minor",
+            "link": "https://example.com/systems",
+            "sections": [{"title": "Required", "kind": "formula", "groups": [[["CS18000"]], [["CS35200"]]]}],
+        }
+        result = optimizer.summarize_minor(minor, {"CS18000"})
+
+        plan = optimizer.plan_semesters([result], [{"code": "CS18000", "sem": 1}], 1, chain_graph(), cap=2)
+
+        self.assertEqual(plan["finish"], 4)
+        self.assertEqual(
+            [entry["courses"] for entry in plan["semesters"]],
+            [["CS25100", "MA16100"], ["CS25200"], ["CS35200"]],
+        )
+        self.assertEqual(plan["prerequisites"], ["CS25100", "CS25200", "MA16100"])
+        self.assertFalse(plan["greedy"])
+
+    def test_plan_reports_when_minor_cannot_finish_in_time(self):
+        result = self.cs_result({"CS18000"})
+
+        plan = optimizer.plan_semesters([result], [{"code": "CS18000", "sem": 1}], 7, chain_graph(), cap=1)
+
+        self.assertIsNone(plan["finish"])
+        self.assertEqual(plan["semesters"], [])
+
+    def test_shared_courses_count_for_every_planned_minor(self):
+        cs = self.cs_result({"CS18000"})
+        data = {
+            "name": "Data Minor",
+            "link": "https://example.com/data",
+            "sections": [
+                {"title": "Electives", "kind": "pool", "required": 2, "options": ["CS18000", "CS24000", "CS30700"]}
+            ],
+        }
+        data_result = optimizer.summarize_minor(data, {"CS18000"})
+
+        plan = optimizer.plan_semesters([cs, data_result], [{"code": "CS18000", "sem": 1}], 1, cap=3)
+
+        # Three courses in one semester only works if one counts for both minors.
+        self.assertEqual(plan["finish"], 2)
+
+
+class SearchIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.index = optimizer.SearchIndex(MINORS)
+
+    def names(self, query):
+        return [hit["name"] for hit in self.index.search(query)]
+
+    def test_course_code_matches_any_spelling(self):
+        for query in ("STAT 35000", "stat35000", "stat 350"):
+            self.assertEqual(self.names(query), ["Data Minor"])
+        self.assertEqual(self.index.search("cs 180")[0]["fields"], ["course code"])
+
+    def test_words_match_by_prefix_and_every_term_must_match(self):
+        self.assertEqual(self.names("comp sci"), ["Computer Science Minor"])
+        self.assertEqual(self.names("systems"), ["Computer Science Minor"])
+        self.assertEqual(self.names("advisor"), ["Computer Science Minor"])
+        self.assertEqual(self.names("computer history"), [])
+        self.assertEqual(self.names("  "), [])
+
+    def test_results_are_ranked_and_limited(self):
+        # "cs2" prefixes CS24000, which only the CS minor lists, so it scores higher.
+        hits = self.index.search("cs2")
+        self.assertEqual({hit["name"] for hit in hits}, {"Computer Science Minor", "Data Minor"})
+        self.assertGreater(hits[0]["score"], hits[1]["score"])
+        self.assertEqual(self.index.search("data")[0]["fields"], ["name"])
+        self.assertEqual(len(self.index.search("cs", limit=1)), 1)
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
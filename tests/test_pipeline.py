@@ -0,0 +1,122 @@
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+import pipeline
+import scraper
+from test_scraper import (
+    ACCOUNTING_MINOR_HTML,
+    AFRICAN_AMERICAN_MINOR_HTML,
+    COMMUNICATION_MINOR_HTML,
+)
+
+PAGES = {
+    "https://catalog.purdue.edu/preview_program.php?catoid=19&poid=111": ACCOUNTING_MINOR_HTML,
+    "https://catalog.purdue.edu/preview_program.php?catoid=19&poid=222": AFRICAN_AMERICAN_MINOR_HTML,
+    "https://catalog.purdue.edu/preview_program.php?catoid=19&poid=34843": COMMUNICATION_MINOR_HTML,
+}
+
+
+def fake_fetch(url):
+    if url not in PAGES:
+        raise RuntimeError("unreachable")
+    return PAGES[url]
+
+
+class PipelineTests(unittest.TestCase):
+    def test_pipeline_matches_inline_parsing(self):
+        with patch("scraper._fetch_html", side_effect=fake_fetch):
+            results, stats = pipeline.load_minor_pages(PAGES, fetch_workers=2, parse_workers=2, queue_size=1)
+
+        self.assertEqual(set(results), set(PAGES))
+        for url, html in PAGES.items():
+            self.assertEqual(results[url], scraper._parse_minor_page(html))
+        self.assertEqual(stats["fetch"]["pages"], 3)
+        self.assertEqual(stats["parse"]["pages"], 3)
+        self.assertGreater(stats["parse"]["pages_per_sec"], 0)
+
+    def test_failed_fetch_is_skipped_not_empty(self):
+        seen = []
+        links = list(PAGES) + ["https://catalog.purdue.edu/preview_program.php?catoid=19&poid=999"]
+        with patch("scraper._fetch_html", side_effect=fake_fetch):
+            results, stats = pipeline.load_minor_pages(links, parse_workers=1, progress=seen.append)
+
+        self.assertNotIn(links[-1], results)
+        self.assertEqual(stats["skipped"], [links[-1]])
+        self.assertEqual(sorted(seen), sorted(links))
+        self.assertEqual(stats["fetch"]["pages"], 4)
+        self.assertEqual(stats["parse"]["pages"], 3)
+
+    def test_bounded_queue_stalls_fetchers_while_parse_side_is_busy(self):
+        links = [f"https://catalog.purdue.edu/preview_program.php?poid={idx}" for idx in range(20)]
+        fetched = []
+        release = threading.Event()
+
+        def counting_fetch(url):
+            fetched.append(url)
+            return ACCOUNTING_MINOR_HTML
+
+        def blocking_progress(_):
+            release.wait()
+
+        result = {}
+        loader = threading.Thread(
+            target=lambda: result.update(
+                zip(
+                    ("pages", "stats"),
+                    pipeline.load_minor_pages(
+                        links,
+                        fetch_workers=1,
+                        parse_workers=1,
+                        queue_size=1,
+                        progress=blocking_progress,
+                        fetch=counting_fetch,
+                    ),
+                )
+            )
+        )
+        loader.start()
+        time.sleep(1.0)
+        # Consumer blocked: at most the parse jobs in flight, one queued page
+        # and one fetcher waiting to enqueue may have been fetched.
+        self.assertLessEqual(len(fetched), 5)
+        release.set()
+        loader.join(timeout=30)
+
+        self.assertFalse(loader.is_alive())
+        self.assertEqual(len(result["pages"]), 20)
+        self.assertEqual(len(fetched), 20)
+
+    def test_interrupted_load_leaves_no_fetch_threads(self):
+        links = [f"https://catalog.purdue.edu/preview_program.php?poid={idx}" for idx in range(40)]
+
+        def interrupting_progress(_):
+            raise KeyboardInterrupt
+
+        with self.assertRaises(KeyboardInterrupt):
+            pipeline.load_minor_pages(
+                links,
+                fetch_workers=4,
+                parse_workers=1,
+                queue_size=2,
+                progress=interrupting_progress,
+                fetch=lambda url: ACCOUNTING_MINOR_HTML,
+            )
+
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline and any(
+            thread.name.startswith("minor-fetch") for thread in threading.enumerate()
+        ):
+            time.sleep(0.05)
+        self.assertEqual(
+            [thread.name for thread in threading.enumerate() if thread.name.startswith("minor-fetch")],
+            [],
+        )
+
+    def test_parse_pool_is_reused_across_loads(self):
+        self.assertIs(pipeline.get_parse_pool(1), pipeline.get_parse_pool(1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,167 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import optimizer
+import scraper
+from prereqs import PrereqGraph, Scheduler, build_prereq_graph, rank_by_finish
+from test_store import MINORS
+
+
+MINOR_PAGE_HTML = """
+<html>
+  <body>
+    <main>
+      <ul>
+        <li><a href="#" onclick="showCourse('19', '1001', this, ''); return false;">CS 25000 - Computer Architecture</a></li>
+        <li><a href="/preview_course_nopop.php?catoid=19&coid=1002">CS 18000 - Problem Solving And Object-Oriented Programming</a></li>
+        <li><a href="/preview_program.php?catoid=19&poid=9">Computer Science Minor</a></li>
+      </ul>
+    </main>
+  </body>
+</html>
+"""
+
+
+CS25000_HTML = """
+<html>
+  <body>
+    <main>
+      <h1>CS 25000 - Computer Architecture</h1>
+      <strong>Credit Hours:</strong> 4.00<br>
+      <strong>Prerequisites:</strong><br>
+      Undergraduate level <a href="#" onclick="showCourse('19', '1003', this, '');">CS 18200</a> Minimum Grade of C
+      and (<a href="#" onclick="showCourse('19', '1002', this, '');">CS 18000</a> or CS 24000)<br>
+      <strong>Restrictions:</strong> Must be enrolled in CS 99900.
+    </main>
+  </body>
+</html>
+"""
+
+
+CS18200_HTML = """
+<html>
+  <body>
+    <main>
+      <h1>CS 18200 - Foundations Of Computer Science</h1>
+      <strong>Prerequisite(s):</strong> CS 18000 [may be taken concurrently]
+    </main>
+  </body>
+</html>
+"""
+
+
+CS18000_HTML = """
+<html><body><main><h1>CS 18000 - Problem Solving And Object-Oriented Programming</h1></main></body></html>
+"""
+
+
+PAGES = {
+    "https://example.com/cs": MINOR_PAGE_HTML,
+    scraper.COURSE_PAGE.format(catoid=19, coid=1001): CS25000_HTML,
+    scraper.COURSE_PAGE.format(catoid=19, coid=1002): CS18000_HTML,
+    scraper.COURSE_PAGE.format(catoid=19, coid=1003): CS18200_HTML,
+}
+
+
+def chain_graph():
+    # CS35200 needs CS25200, which needs CS25100, which needs CS18000.
+    return PrereqGraph(
+        {
+            "CS18000": None,
+            "CS25100": "CS18000",
+            "CS25200": ["and", "CS25100", ["or", "MA16100", "MA16500"]],
+            "CS35200": "CS25200",
+            "CS30700": "CS18000",
+        }
+    )
+
+
+class PrerequisiteParsingTests(unittest.TestCase):
+    def test_prerequisite_text_becomes_and_or_tree(self):
+        self.assertEqual(
+            scraper._parse_prerequisite_text("CS 18000 and (MA 16100 or MA 16500)"),
+            ["and", "CS18000", ["or", "MA16100", "MA16500"]],
+        )
+        self.assertEqual(
+            scraper._parse_prerequisite_text("CS 18200 and MA 26100 or STAT 35000"),
+            ["or", ["and", "CS18200", "MA26100"], "STAT35000"],
+        )
+        self.assertEqual(scraper._parse_prerequisite_text("STAT 416 and"), "MA41600")
+        self.assertIsNone(scraper._parse_prerequisite_text("Instructor permission"))
+
+    def test_course_page_stops_at_next_field(self):
+        tree, linked = scraper._parse_course_page(CS25000_HTML)
+
+        self.assertEqual(tree, ["and", "CS18200", ["or", "CS18000", "CS24000"]])
+        self.assertEqual(set(linked), {"CS18200", "CS18000"})
+
+    def test_build_graph_follows_prerequisite_links(self):
+        with patch.object(scraper, "_fetch_html", side_effect=PAGES.__getitem__):
+            graph = build_prereq_graph(["https://example.com/cs"], workers=2)
+
+        self.assertEqual(len(graph), 3)
+        self.assertEqual(graph.requires("CS18200"), "CS18000")
+        self.assertIsNone(graph.requires("CS18000"))
+        self.assertEqual(graph.title("CS25000"), "Computer Architecture")
+
+    def test_failed_pages_are_skipped_without_losing_the_crawl(self):
+        pages = dict(PAGES)
+        del pages[scraper.COURSE_PAGE.format(catoid=19, coid=1003)]
+        with patch.object(scraper, "_fetch_html", side_effect=pages.__getitem__), self.assertLogs("prereqs", "WARNING"):
+            graph = build_prereq_graph(["https://example.com/cs", "https://example.com/missing"], workers=2)
+
+        self.assertEqual(sorted(graph.codes()), ["CS18000", "CS25000"])
+        self.assertNotIn("CS18200", graph)
+
+    def test_graph_round_trips_through_json(self):
+        graph = chain_graph()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "prerequisites.json")
+            graph.save(path)
+            loaded = PrereqGraph.load(path)
+
+        self.assertEqual(loaded.to_dict(), graph.to_dict())
+
+
+class SchedulerTests(unittest.TestCase):
+    def test_course_waits_for_longest_untaken_chain(self):
+        scheduler = Scheduler(chain_graph(), set(), current_sem=2)
+
+        self.assertEqual(scheduler.course("CS18000"), 3)
+        self.assertEqual(scheduler.course("CS25100"), 4)
+        self.assertEqual(scheduler.course("CS35200"), 6)
+        self.assertEqual(scheduler.course("UNKNOWN10000"), 3)
+
+    def test_taken_courses_shorten_chains(self):
+        scheduler = Scheduler(chain_graph(), {"CS 18000", "CS25100", "MA16500"}, current_sem=3)
+
+        self.assertEqual(scheduler.course("CS25100"), 3)
+        self.assertEqual(scheduler.course("CS35200"), 5)
+
+    def test_cycles_do_not_recurse_forever(self):
+        graph = PrereqGraph({"AA10000": "BB10000", "BB10000": "AA10000"})
+
+        self.assertEqual(Scheduler(graph, set(), 1).course("AA10000"), 3)
+
+    def test_minor_finish_uses_soonest_pool_options(self):
+        results, _ = optimizer.rank_minors(MINORS, {"CS18000"})
+        cs = next(result for result in results if result["name"] == "Computer Science Minor")
+        scheduler = Scheduler(chain_graph(), {"CS18000"}, current_sem=1)
+
+        # CS24000 (no prerequisites) finishes the formula section in semester 2;
+        # the pool needs two of CS25100 (2), CS30700 (2) and CS35200 (4).
+        self.assertEqual(scheduler.minor(cs), 2)
+
+    def test_rank_by_finish_keeps_completion_order_for_ties(self):
+        results, _ = optimizer.rank_minors(MINORS, {"CS18000", "MA16100"})
+        scheduled = rank_by_finish(results, Scheduler(chain_graph(), {"CS18000", "MA16100"}, 1))
+
+        finishes = [finish for finish, _ in scheduled]
+        self.assertEqual(finishes, sorted(finishes, key=lambda finish: (finish is None, finish or 0)))
+        self.assertEqual(len(scheduled), len(results))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+import catalog
+import cli
+from profiling import profile_call, top_functions
+from test_store import MINORS
+
+
+def busy(n):
+    return sum(i * i for i in range(n))
+
+
+class ProfilingTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def test_profile_call_saves_stats_and_reports_top_functions(self):
+        result, path, rows = profile_call(busy, 10000, directory=self.tmpdir.name, label="unit")
+
+        self.assertEqual(result, busy(10000))
+        self.assertTrue(os.path.basename(path).startswith("unit-"))
+        self.assertTrue(any(row["function"].startswith("busy (") for row in rows))
+        self.assertEqual([row["function"] for row in top_functions(path)], [row["function"] for row in rows])
+        cumtimes = [row["cumtime"] for row in rows]
+        self.assertEqual(cumtimes, sorted(cumtimes, reverse=True))
+
+    def test_profile_call_without_directory_saves_nothing(self):
+        _, path, rows = profile_call(busy, 10)
+        self.assertIsNone(path)
+        self.assertTrue(rows)
+
+    def test_cli_profiles_a_saved_catalog_and_profile(self):
+        snapshot = os.path.join(self.tmpdir.name, "snapshot.json")
+        catalog.save_snapshot(catalog.CatalogHolder().publish(MINORS), snapshot)
+        out = os.path.join(self.tmpdir.name, "profiles")
+
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            code = cli.main(
+                ["profile", "--snapshot", snapshot, "--courses", "cs 18000, CS25100", "--repeat", "3", "--out", out]
+            )
+
+        self.assertEqual(code, 0)
+        self.assertIn("Ranked 1 minors 3x", stdout.getvalue())
+        self.assertIn("summarize_minor", stdout.getvalue())
+        self.assertEqual(len(os.listdir(out)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
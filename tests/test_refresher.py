@@ -0,0 +1,140 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+import catalog
+from catalog import CatalogHolder
+from refresher import CatalogRefresher
+
+
+def minors_for(tag):
+    return [{"name": f"{tag} Minor", "link": f"https://example.com/{tag}", "sections": []}]
+
+
+class CatalogRefresherTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.snapshot = os.path.join(self.tmpdir.name, "snapshot.json")
+
+    def test_warm_start_publishes_snapshot_before_any_scrape(self):
+        seed = CatalogHolder().publish(minors_for("snapshot"), majors=["Accounting"])
+        catalog.save_snapshot(seed, self.snapshot)
+        scrape_started = threading.Event()
+        release = threading.Event()
+
+        def slow_scrape():
+            scrape_started.set()
+            release.wait()
+            return minors_for("fresh"), ["Accounting", "Biology"]
+
+        holder = CatalogHolder()
+        refresher = CatalogRefresher(holder, interval=0.05, snapshot_path=self.snapshot, scrape=slow_scrape)
+        refresher.start()
+        self.addCleanup(refresher.stop)
+
+        self.assertEqual(holder.current().minors[0]["name"], "snapshot Minor")
+        self.assertEqual(holder.current().majors, ("Accounting",))
+        self.assertTrue(refresher.stats()["warm_started"])
+        self.assertTrue(scrape_started.wait(5))
+        release.set()
+
+        deadline = time.monotonic() + 5
+        while refresher.stats()["refreshes"] == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(holder.current().minors[0]["name"], "fresh Minor")
+        minors, majors, _ = catalog.load_snapshot(self.snapshot)
+        self.assertEqual(minors[0]["name"], "fresh Minor")
+        self.assertEqual(majors, ["Accounting", "Biology"])
+
+    def test_failures_are_counted_and_keep_previous_catalog(self):
+        holder = CatalogHolder()
+        holder.publish(minors_for("old"))
+        outcomes = iter([RuntimeError("catalog down"), (minors_for("new"), [])])
+
+        def flaky_scrape():
+            outcome = next(outcomes)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        refresher = CatalogRefresher(holder, scrape=flaky_scrape)
+        self.assertFalse(refresher.refresh_once())
+        stats = refresher.stats()
+        self.assertEqual((stats["failures"], stats["refreshes"]), (1, 0))
+        self.assertIn("catalog down", stats["last_error"])
+        self.assertEqual(holder.current().minors[0]["name"], "old Minor")
+
+        self.assertTrue(refresher.refresh_once())
+        stats = refresher.stats()
+        self.assertEqual((stats["failures"], stats["consecutive_failures"], stats["refreshes"]), (1, 0, 1))
+        self.assertIsNotNone(stats["last_refresh_at"])
+        self.assertGreaterEqual(stats["last_duration"], 0)
+        self.assertEqual(stats["catalog_version"], 2)
+
+    def test_refreshes_on_interval_without_snapshot(self):
+        holder = CatalogHolder()
+        refresher = CatalogRefresher(holder, interval=0.05, scrape=lambda: (minors_for("x"), []))
+        refresher.start()
+        time.sleep(0.4)
+        refresher.stop(timeout=5)
+
+        self.assertFalse(refresher.stats()["warm_started"])
+        self.assertGreaterEqual(refresher.stats()["refreshes"], 3)
+
+    def test_other_catalog_years_are_published_saved_and_warm_started(self):
+        holder = CatalogHolder()
+        refresher = CatalogRefresher(
+            holder,
+            snapshot_path=self.snapshot,
+            scrape=lambda: (minors_for("current"), [], {"2023-2024": minors_for("older")}),
+        )
+        self.assertTrue(refresher.refresh_once())
+        self.assertEqual(holder.current().for_year("2023-2024").minors[0]["name"], "older Minor")
+
+        restarted = CatalogHolder()
+        self.assertTrue(CatalogRefresher(restarted, snapshot_path=self.snapshot).warm_start())
+        self.assertEqual(restarted.current().years, holder.current().years)
+        self.assertEqual(restarted.current().for_year("2023-2024").minors[0]["name"], "older Minor")
+
+    def test_unchanged_scrape_keeps_catalog_version(self):
+        holder = CatalogHolder()
+        scrapes = iter(
+            [(minors_for("same"), ["Accounting"]), (minors_for("same"), ["Accounting"]), (minors_for("new"), [])]
+        )
+        refresher = CatalogRefresher(holder, scrape=lambda: next(scrapes))
+
+        self.assertTrue(refresher.refresh_once())
+        published = holder.current()
+        self.assertTrue(refresher.refresh_once())
+        self.assertIs(holder.current(), published)
+        self.assertTrue(refresher.refresh_once())
+        self.assertEqual(holder.current().version, 2)
+
+    def test_unchanged_scrape_still_writes_missing_outputs(self):
+        seed = CatalogHolder().publish(minors_for("same"), majors=["Accounting"])
+        catalog.save_snapshot(seed, self.snapshot)
+        compiled = os.path.join(self.tmpdir.name, "c.bin")
+        store = os.path.join(self.tmpdir.name, "s.db")
+        holder = CatalogHolder()
+        refresher = CatalogRefresher(
+            holder,
+            snapshot_path=self.snapshot,
+            scrape=lambda: (minors_for("same"), ["Accounting"]),
+            store_path=store,
+            compiled_path=compiled,
+        )
+        self.assertTrue(refresher.warm_start())
+        version = holder.current().version
+
+        self.assertTrue(refresher.refresh_once())
+        self.assertTrue(os.path.exists(compiled))
+        self.assertTrue(os.path.exists(store))
+        self.assertEqual(holder.current().version, version)
+        self.assertEqual(holder.current().minors[0]["name"], "same Minor")
+
+
+if __name__ == "__main__":
+    unittest.main()
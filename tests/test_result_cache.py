@@ -0,0 +1,78 @@
+import json
+import os
+import tempfile
+import unittest
+
+import optimizer
+from catalog import CatalogHolder
+from result_cache import ResultCache, load_profiles, profile_key, ranked_results, warm_cache, warm_in_background
+from test_store import MINORS
+
+
+class ResultCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.catalog = CatalogHolder().publish(MINORS)
+
+    def test_profile_key_is_canonical(self):
+        self.assertEqual(
+            profile_key(["CS24000", "CS18000", "CS18000"], "None", 1),
+            profile_key({"CS18000", "CS24000"}, None, 1),
+        )
+        self.assertNotEqual(profile_key(["CS18000"], None, 1), profile_key(["CS18000"], None, 2))
+        self.assertNotEqual(profile_key(["CS18000"], None, 1), profile_key(["CS18000"], "Biology", 1))
+
+    def test_lru_eviction_and_hit_rate(self):
+        cache = ResultCache(max_entries=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        cache.put("c", 3)
+
+        self.assertNotIn("b", cache)
+        self.assertIn("a", cache)
+        self.assertIsNone(cache.get("b"))
+        stats = cache.stats()
+        self.assertEqual(stats["evictions"], 1)
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+        self.assertEqual(stats["hit_rate"], 0.5)
+
+    def test_ranked_results_match_direct_scoring_and_hit_on_repeat(self):
+        cache = ResultCache()
+        taken = {"CS18000", "CS25100"}
+        first = ranked_results(cache, self.catalog, taken)
+        second = ranked_results(cache, self.catalog, set(taken))
+
+        self.assertEqual(first, optimizer.rank_minors(MINORS, taken))
+        self.assertIs(first, second)
+        self.assertEqual(cache.stats()["hits"], 1)
+
+    def test_warm_cache_from_profiles_file(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "profiles.json")
+            with open(path, "w", encoding="utf-8") as handle:
+                json.dump([{"name": "CS", "courses": ["cs 18000", "CS25100"], "major": None}], handle)
+            profiles = load_profiles(path)
+
+        cache = ResultCache()
+        self.assertEqual(warm_cache(cache, self.catalog, profiles), 1)
+        self.assertEqual(warm_cache(cache, self.catalog, profiles), 0)
+        ranked_results(cache, self.catalog, {"CS18000", "CS25100"})
+        self.assertEqual(cache.stats()["hits"], 1)
+
+    def test_background_warm_runs_once_per_version(self):
+        cache = ResultCache()
+        profiles = [{"courses": ["CS18000"]}]
+        thread = warm_in_background(cache, self.catalog, profiles)
+        thread.join(5)
+        self.assertIsNone(warm_in_background(cache, self.catalog, profiles))
+        self.assertEqual(len(cache), 1)
+
+    def test_mark_warmed_claims_each_version_once(self):
+        cache = ResultCache()
+        self.assertTrue(cache.mark_warmed("v1"))
+        self.assertFalse(cache.mark_warmed("v1"))
+        self.assertTrue(cache.mark_warmed("v2"))
+
+
+if __name__ == "__main__":
+    unittest.main()
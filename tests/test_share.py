@@ -0,0 +1,74 @@
+import base64
+import json
+import unittest
+import zlib
+
+from share import MAX_PROFILE_BYTES, decode_profile, encode_profile
+
+COURSES = [
+    {"code": "CS18000", "sem": 1},
+    {"code": "MA16100", "sem": 2},
+    {"code": "AP-CALCBC", "sem": None, "origin": "external"},
+]
+
+
+class ShareTests(unittest.TestCase):
+    def test_round_trip(self):
+        token = encode_profile(COURSES, 3, "Computer Science", ["intl_internship"])
+        profile = decode_profile(token)
+
+        self.assertEqual(
+            sorted(profile["courses"], key=lambda course: course["code"]),
+            sorted(COURSES, key=lambda course: course["code"]),
+        )
+        self.assertEqual(profile["current_sem"], 3)
+        self.assertEqual(profile["major"], "Computer Science")
+        self.assertEqual(profile["experiences"], ["intl_internship"])
+
+    def test_catalog_year_is_kept_only_when_given(self):
+        self.assertIsNone(decode_profile(encode_profile(COURSES, 3))["year"])
+        self.assertEqual(decode_profile(encode_profile(COURSES, 3, year="2023-2024"))["year"], "2023-2024")
+
+    def test_encoding_is_deterministic(self):
+        shuffled = [COURSES[2], COURSES[0], COURSES[1], COURSES[0]]
+        self.assertEqual(
+            encode_profile(COURSES, 3, "None", ["study_abroad", "intl_internship"]),
+            encode_profile(shuffled, 3, None, ["intl_internship", "study_abroad"]),
+        )
+        self.assertNotEqual(encode_profile(COURSES, 3), encode_profile(COURSES, 4))
+
+    def test_token_is_url_safe_and_compact(self):
+        courses = [{"code": f"CS{n}00", "sem": 1} for n in range(180, 400, 10)]
+        token = encode_profile(courses, 4)
+        self.assertRegex(token, r"^[A-Za-z0-9_-]+$")
+        self.assertLess(len(token), 200)
+
+    def test_out_of_range_semesters_are_clamped(self):
+        profile = decode_profile(encode_profile([{"code": "CS18000", "sem": 7}], 12))
+        self.assertEqual(profile["current_sem"], 8)
+        profile = decode_profile(encode_profile([{"code": "CS18000", "sem": 7}], 2))
+        self.assertEqual(profile["courses"][0]["sem"], 2)
+
+    def test_malformed_token_raises_value_error(self):
+        for token in ("", "not-a-token", encode_profile(COURSES)[:-6]):
+            with self.assertRaises(ValueError):
+                decode_profile(token)
+
+    def test_oversized_token_is_rejected(self):
+        bomb = base64.urlsafe_b64encode(zlib.compress(b" " * (MAX_PROFILE_BYTES * 10), 9)).decode("ascii")
+        self.assertLess(len(bomb), 2000)
+        with self.assertRaises(ValueError):
+            decode_profile(bomb)
+
+    def test_decoded_codes_are_canonical(self):
+        payload = {"c": [["cs 180", 1], ["CS18000", 2]], "e": ["ap stats 5"], "m": "", "s": 2, "x": []}
+        raw = json.dumps(payload).encode("utf-8")
+        token = base64.urlsafe_b64encode(zlib.compress(raw)).decode("ascii")
+
+        courses = decode_profile(token)["courses"]
+        self.assertEqual([course["code"] for course in courses], ["CS18000", "APSTATS5"])
+        self.assertEqual(courses[0]["sem"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
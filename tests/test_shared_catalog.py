@@ -0,0 +1,106 @@
+import os
+import tempfile
+import time
+import unittest
+
+from catalog import CatalogHolder
+from refresher import CatalogRefresher
+from shared_catalog import MappedCatalog, compile_catalog
+from test_store import MINORS
+
+
+class SharedCatalogTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.path = os.path.join(self.tmpdir.name, "catalog.bin")
+        self.source = CatalogHolder().publish(MINORS, majors=["Accounting", "Biology"])
+
+    def test_mapped_catalog_round_trips_and_is_read_only(self):
+        compile_catalog(self.source, self.path)
+        mapped = MappedCatalog(self.path)
+        self.addCleanup(mapped.close)
+
+        self.assertEqual(len(mapped), len(MINORS))
+        self.assertEqual([dict(minor) for minor in mapped.minors], MINORS)
+        self.assertEqual(mapped.minor_by_name("Data Minor")["sections"], MINORS[1]["sections"])
+        self.assertEqual(mapped.majors, ("Accounting", "Biology"))
+        self.assertEqual(mapped.version, self.source.version)
+        with self.assertRaises(TypeError):
+            mapped.minors[0]["name"] = "changed"
+
+    def test_every_catalog_year_is_compiled(self):
+        source = CatalogHolder().publish(MINORS, years={"2023-2024": MINORS[:1]}, year="2024-2025")
+        compile_catalog(source, self.path)
+        mapped = MappedCatalog(self.path)
+        self.addCleanup(mapped.close)
+
+        older = mapped.for_year("2023-2024")
+        self.assertEqual(mapped.years, source.years)
+        self.assertEqual([dict(minor) for minor in older.minors], MINORS[:1])
+        self.assertEqual(older.version, source.for_year("2023-2024").version)
+        self.assertIsInstance(older, MappedCatalog)
+        self.assertIs(older.for_year("2024-2025"), mapped)
+        self.assertEqual(len(mapped), len(MINORS))
+
+    def test_replacing_the_file_keeps_existing_mappings_valid(self):
+        compile_catalog(self.source, self.path)
+        old = MappedCatalog(self.path)
+        self.addCleanup(old.close)
+        newer = CatalogHolder().publish(MINORS[:1])
+        compile_catalog(newer, self.path)
+        new = MappedCatalog(self.path)
+        self.addCleanup(new.close)
+
+        self.assertEqual(len(old), 3)
+        self.assertEqual(old.minors[2]["name"], "History Minor")
+        self.assertEqual(len(new), 1)
+        self.assertNotEqual(old.identity, new.identity)
+
+    def test_rejects_files_that_are_not_compiled_catalogs(self):
+        with open(self.path, "wb") as handle:
+            handle.write(b"not a catalog" * 4)
+        with self.assertRaises(ValueError):
+            MappedCatalog(self.path)
+
+    def test_follower_maps_and_remaps_the_compiled_file(self):
+        writer = CatalogRefresher(
+            CatalogHolder(), compiled_path=self.path, scrape=lambda: (MINORS, ["Accounting"])
+        )
+        self.assertTrue(writer.refresh_once())
+        self.assertIsInstance(writer.holder.current(), MappedCatalog)
+
+        follower_holder = CatalogHolder()
+        follower = CatalogRefresher(follower_holder, compiled_path=self.path, follow=True)
+        self.assertTrue(follower.warm_start())
+        first = follower_holder.current()
+        self.assertEqual(len(first), 3)
+
+        follower.refresh_once()
+        self.assertIs(follower_holder.current(), first)
+
+        writer._scrape = lambda: (MINORS[:2], [])
+        writer.refresh_once()
+        follower.refresh_once()
+        self.assertIsNot(follower_holder.current(), first)
+        self.assertEqual(len(follower_holder.current()), 2)
+        self.assertEqual(len(first), 3)
+
+    def test_follower_polls_on_its_own_short_interval(self):
+        writer = CatalogRefresher(CatalogHolder(), compiled_path=self.path, scrape=lambda: (MINORS, []))
+        self.assertTrue(writer.refresh_once())
+        follower = CatalogRefresher(
+            CatalogHolder(), interval=3600, compiled_path=self.path, follow=True, follow_interval=0.05
+        ).start()
+        self.addCleanup(follower.stop, 5)
+
+        writer._scrape = lambda: (MINORS[:1], [])
+        writer.refresh_once()
+        deadline = time.monotonic() + 5
+        while len(follower.holder.current()) != 1 and time.monotonic() < deadline:
+            time.sleep(0.02)
+        self.assertEqual(len(follower.holder.current()), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
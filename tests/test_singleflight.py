@@ -0,0 +1,174 @@
+import collections
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import catalog
+import scraper
+from deadline import Deadline, DeadlineExceeded
+from singleflight import SingleFlight
+from test_scraper import ACCOUNTING_MINOR_HTML, COMMUNICATION_MINOR_HTML
+
+INDEX_HTML = """
+<html><body><main>
+  <a href="/preview_program.php?poid=111">Accounting Minor</a>
+  <a href="/preview_program.php?poid=222">Communication Minor</a>
+</main></body></html>
+"""
+STUB_PAGES = {
+    "/content.php": INDEX_HTML,
+    "/preview_program.php?poid=111": ACCOUNTING_MINOR_HTML,
+    "/preview_program.php?poid=222": COMMUNICATION_MINOR_HTML,
+}
+
+
+class StubCatalog:
+    """Local catalog server that counts and slows down every request."""
+
+    def __init__(self, delay=0.2, delays=None):
+        self.hits = collections.Counter()
+        # Per-path delays override `delay`; tests may change them while serving.
+        self.delays = dict(delays or {})
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.hits[self.path] += 1
+                time.sleep(stub.delays.get(self.path, delay))
+                body = STUB_PAGES.get(self.path)
+                self.send_response(200 if body else 404)
+                self.end_headers()
+                self.wfile.write((body or "").encode("utf-8"))
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def run_concurrently(count, fn):
+    barrier = threading.Barrier(count)
+    results = [None] * count
+    errors = []
+
+    def worker(idx):
+        barrier.wait()
+        try:
+            results[idx] = fn()
+        except Exception as exc:  # pragma: no cover - surfaced by the assertion below
+            errors.append(exc)
+
+    threads = [threading.Thread(target=worker, args=(idx,)) for idx in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+    return results
+
+
+class SingleFlightTests(unittest.TestCase):
+    def setUp(self):
+        self.stub = StubCatalog()
+        patcher_base = patch("scraper.BASE_URL", self.stub.base_url)
+        patcher_page = patch("scraper.MINORS_PAGE", self.stub.base_url + "/content.php")
+        patcher_base.start()
+        patcher_page.start()
+        self.addCleanup(patcher_base.stop)
+        self.addCleanup(patcher_page.stop)
+        self.addCleanup(self.stub.close)
+
+    def test_concurrent_requirement_loads_fetch_each_url_once(self):
+        url = self.stub.base_url + "/preview_program.php?poid=111"
+        results = run_concurrently(8, lambda: scraper._get_requirements_from_minor_page(url))
+
+        self.assertEqual(self.stub.hits["/preview_program.php?poid=111"], 1)
+        self.assertTrue(all(result == results[0] for result in results))
+        self.assertEqual(results[0][0][0]["title"], "Required Courses (9-12 credits)")
+
+    def test_concurrent_catalog_loads_share_one_fetch_per_url(self):
+        results = run_concurrently(6, lambda: catalog.load_catalog(parse_workers=1))
+
+        self.assertEqual(dict(self.stub.hits), {path: 1 for path in STUB_PAGES})
+        self.assertEqual([minor["name"] for minor in results[0]], ["Accounting Minor", "Communication Minor"])
+        self.assertTrue(all(result is results[0] for result in results))
+
+    def test_errors_are_shared_and_key_is_released(self):
+        flights = SingleFlight()
+        calls = []
+
+        def failing():
+            calls.append(1)
+            time.sleep(0.1)
+            raise RuntimeError("boom")
+
+        def call():
+            try:
+                flights.do("key", failing)
+            except RuntimeError as exc:
+                return str(exc)
+
+        self.assertEqual(run_concurrently(5, call), ["boom"] * 5)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(flights.in_flight(), 0)
+        self.assertEqual(flights.do("key", lambda: "again"), "again")
+
+    def test_followers_retry_when_leader_is_interrupted(self):
+        flights = SingleFlight()
+        calls = []
+        leader_started = threading.Event()
+
+        def work():
+            calls.append(threading.current_thread().name)
+            if len(calls) == 1:
+                leader_started.set()
+                time.sleep(0.2)
+                raise KeyboardInterrupt
+            time.sleep(0.2)
+            return "loaded"
+
+        def leader():
+            try:
+                flights.do("key", work)
+            except KeyboardInterrupt:
+                return "interrupted"
+
+        leader_thread_result = []
+        leader_thread = threading.Thread(target=lambda: leader_thread_result.append(leader()))
+        leader_thread.start()
+        leader_started.wait()
+        followers = run_concurrently(4, lambda: flights.do("key", work))
+        leader_thread.join()
+
+        self.assertEqual(leader_thread_result, ["interrupted"])
+        self.assertEqual(followers, ["loaded"] * 4)
+        self.assertEqual(len(calls), 2)
+
+    def test_followers_give_up_at_their_own_deadline(self):
+        flights = SingleFlight()
+        release = threading.Event()
+        self.addCleanup(release.set)
+        leader = threading.Thread(target=flights.do, args=("key", lambda: release.wait(5)))
+        leader.start()
+        while not flights.in_flight():
+            time.sleep(0.01)
+
+        started = time.monotonic()
+        with self.assertRaises(DeadlineExceeded):
+            flights.do_within(Deadline(0.1), "key", lambda: "unused")
+        self.assertLess(time.monotonic() - started, 1)
+        release.set()
+        leader.join()
+
+
+if __name__ == "__main__":
+    unittest.main()
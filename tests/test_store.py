@@ -0,0 +1,135 @@
+import os
+import tempfile
+import threading
+import unittest
+
+import optimizer
+from store import CatalogStore
+
+MINORS = [
+    {
+        "name": "Computer Science Minor",
+        "link": "https://example.com/cs",
+        "sections": [
+            {
+                "title": "Required Courses",
+                "kind": "formula",
+                "required": 2,
+                "groups": [[["CS18000"]], [["CS24000"], [["CS25100", "CS25200"]]]],
+                "codes": ["CS18000", "CS24000", "CS25100", "CS25200"],
+                "notes": [],
+                "excluded_codes": [],
+            },
+            {
+                "title": "Choose two",
+                "kind": "pool",
+                "required": 2,
+                "options": ["CS25100", "CS30700", "CS35200"],
+                "children": [
+                    {
+                        "title": "Systems",
+                        "kind": "formula",
+                        "required": 1,
+                        "groups": [[["CS35200"]]],
+                        "codes": ["CS35200"],
+                        "notes": [],
+                        "excluded_codes": [],
+                    }
+                ],
+                "notes": ["Pick any two."],
+                "excluded_codes": [],
+            },
+            {"title": "Policy", "kind": "manual", "description": "See advisor.", "excluded_codes": []},
+        ],
+        "notes": ["50% of credits must come from Purdue."],
+        "restriction_text": "Not available to Computer Science students.",
+    },
+    {
+        "name": "Data Minor",
+        "link": "https://example.com/data",
+        "sections": [
+            {
+                "title": "Electives",
+                "kind": "pool",
+                "required": 1,
+                "options": ["CS25100", "STAT35000"],
+                "children": [],
+                "notes": [],
+                "excluded_codes": ["CS25100"],
+            }
+        ],
+        "notes": [],
+        "restriction_text": "",
+    },
+    {
+        "name": "History Minor",
+        "link": "https://example.com/hist",
+        "sections": [
+            {
+                "title": "Required",
+                "kind": "formula",
+                "required": 1,
+                "groups": [[["HIST10300"]]],
+                "codes": ["HIST10300"],
+                "notes": [],
+                "excluded_codes": [],
+            }
+        ],
+        "notes": [],
+        "restriction_text": "",
+    },
+]
+
+
+class CatalogStoreTests(unittest.TestCase):
+    def setUp(self):
+        self.store = CatalogStore()
+        self.store.populate(MINORS)
+        self.addCleanup(self.store.close)
+
+    def test_minors_accepting_uses_groups_options_and_exclusions(self):
+        self.assertEqual(self.store.minors_accepting("CS25100"), ["Computer Science Minor"])
+        self.assertEqual(self.store.minors_accepting("STAT35000"), ["Data Minor"])
+        self.assertEqual(self.store.minors_accepting("ENGL10600"), [])
+
+    def test_round_trip_evaluates_like_the_source_catalog(self):
+        rebuilt = self.store.minors()
+        taken = {"CS18000", "CS25100", "CS25200", "CS35200", "STAT35000", "HIST10300"}
+
+        self.assertEqual([minor["name"] for minor in rebuilt], [minor["name"] for minor in MINORS])
+        self.assertEqual(rebuilt[0]["sections"][1]["children"][0]["title"], "Systems")
+        self.assertEqual(rebuilt[0]["sections"][2]["description"], "See advisor.")
+        for source, copy in zip(MINORS, rebuilt):
+            self.assertEqual(
+                optimizer.summarize_minor(copy, taken, major="None"),
+                optimizer.summarize_minor(source, taken, major="None"),
+            )
+
+    def test_rank_minors_from_store_matches_full_scan(self):
+        for taken in ({"CS18000"}, {"STAT35000", "HIST10300"}, {"ENGL10600"}, set()):
+            for major in (None, "Computer Science"):
+                self.assertEqual(
+                    optimizer.rank_minors_from_store(self.store, taken, major),
+                    optimizer.rank_minors(MINORS, taken, major),
+                )
+
+    def test_file_store_is_shared_between_connections(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "catalog.db")
+            writer = CatalogStore(path)
+            writer.populate(MINORS)
+            reader = CatalogStore(path)
+            seen = []
+            thread = threading.Thread(target=lambda: seen.append(reader.minors_accepting("HIST10300")))
+            thread.start()
+            thread.join()
+            writer.populate(MINORS[:1])
+
+            self.assertEqual(seen, [["History Minor"]])
+            self.assertEqual(reader.minor_names(), ["Computer Science Minor"])
+            writer.close()
+            reader.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
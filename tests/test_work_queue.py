@@ -0,0 +1,185 @@
+import contextlib
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+import catalog
+import refresher
+import work_queue
+from test_store import MINORS
+from work_queue import Overloaded, WorkQueue
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+
+class WorkQueueTests(unittest.TestCase):
+    def setUp(self):
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+
+    def block(self):
+        self.release.wait(5)
+        return "blocked"
+
+    def test_rejects_beyond_max_depth_with_retry_after(self):
+        queue = WorkQueue(workers=1, max_depth=2)
+        running = queue.submit("a", 1, self.block)
+        while not running.started:
+            time.sleep(0.01)
+        queue.submit("b", 1, self.block)
+        queue.submit("c", 1, self.block)
+
+        with self.assertRaises(Overloaded) as caught:
+            queue.submit("d", 1, self.block)
+        self.assertGreater(caught.exception.retry_after, 0)
+        self.assertEqual(queue.stats()["rejected"], 1)
+
+        self.release.set()
+        self.assertEqual(running.result(5), "blocked")
+
+    def test_round_robin_across_sessions_and_positions(self):
+        queue = WorkQueue(workers=1, max_depth=10)
+        order = []
+        lock = threading.Lock()
+
+        def job(name):
+            with lock:
+                order.append(name)
+
+        running = queue.submit("blocker", 0, self.block)
+        while not running.started:
+            time.sleep(0.01)
+        greedy = [queue.submit("greedy", idx, job, f"greedy-{idx}") for idx in range(3)]
+        polite = queue.submit("polite", 0, job, "polite")
+
+        self.assertEqual([ticket.position() for ticket in greedy], [1, 3, 4])
+        self.assertEqual(polite.position(), 2)
+        self.release.set()
+        for ticket in greedy + [polite]:
+            ticket.result(5)
+        self.assertEqual(order, ["greedy-0", "polite", "greedy-1", "greedy-2"])
+        self.assertEqual(polite.position(), 0)
+
+    def test_resubmitting_the_same_job_returns_the_same_ticket(self):
+        queue = WorkQueue(workers=1, max_depth=1)
+        first = queue.submit("a", "key", self.block)
+        self.assertIs(queue.submit("a", "key", self.block), first)
+        self.release.set()
+        first.result(5)
+        self.assertEqual(queue.stats()["submitted"], 1)
+
+    def test_job_errors_are_raised_from_result(self):
+        queue = WorkQueue(workers=1)
+
+        def fail():
+            raise ValueError("boom")
+
+        with self.assertRaisesRegex(ValueError, "boom"):
+            queue.submit("a", 1, fail).result(5)
+
+
+@contextlib.contextmanager
+def overlapping_app_tests():
+    """
+    Let AppTest runs overlap on threads. AppTest installs a mock Runtime for
+    each run and clears it when the run ends, so overlapping runs would clear
+    each other's; keep answering with the last one installed. Compiling the
+    script is serialized too, since Python 3.11 can fail compiling on several
+    threads at once.
+    """
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+
+    installed = []
+    compile_lock = threading.Lock()
+    get_bytecode = ScriptCache.get_bytecode
+
+    def instance(cls):
+        if cls._instance is not None:
+            installed[:] = [cls._instance]
+        return installed[0]
+
+    def locked_get_bytecode(cache, script_path):
+        with compile_lock:
+            return get_bytecode(cache, script_path)
+
+    with patch.object(Runtime, "instance", classmethod(instance)), patch.object(
+        ScriptCache, "get_bytecode", locked_get_bytecode
+    ):
+        yield
+
+
+class AppLoadTests(unittest.TestCase):
+    """Many simulated sessions optimizing at once through the shared queue."""
+
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        snapshot = os.path.join(tmpdir.name, "snapshot.json")
+        catalog.save_snapshot(catalog.CatalogHolder().publish(MINORS, majors=["Biology"]), snapshot)
+        env = patch.dict(
+            os.environ,
+            {
+                "MINOR_OPTIMIZER_SNAPSHOT": snapshot,
+                "MINOR_OPTIMIZER_REFRESH_SECONDS": "3600",
+                "MINOR_OPTIMIZER_PROFILES": os.path.join(tmpdir.name, "none.json"),
+            },
+        )
+        env.start()
+        self.addCleanup(env.stop)
+        scrape = patch.object(refresher, "scrape_catalog", lambda **_: (MINORS, ["Biology"]))
+        scrape.start()
+        self.addCleanup(scrape.stop)
+
+    def run_session(self, courses):
+        from streamlit.testing.v1 import AppTest
+
+        app = AppTest.from_file(APP_PATH, default_timeout=30)
+        app.session_state["courses"] = [{"code": code, "sem": 1} for code in courses]
+        app.session_state["optimize"] = True
+        app.run()
+        return app
+
+    def test_concurrent_sessions_share_a_bounded_queue(self):
+        queue = WorkQueue(workers=1, max_depth=8)
+        with patch.object(work_queue, "_queue", queue), overlapping_app_tests():
+            profiles = [["CS18000", f"CS{n}00"] for n in range(250, 258)]
+            apps = [None] * len(profiles)
+
+            def session(idx):
+                apps[idx] = self.run_session(profiles[idx])
+
+            threads = [threading.Thread(target=session, args=(idx,)) for idx in range(len(profiles))]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(60)
+
+        for app in apps:
+            self.assertEqual([exc.value for exc in app.exception], [])
+            self.assertEqual([header.value for header in app.subheader], ["Recommended Minors"])
+        stats = queue.stats()
+        self.assertLessEqual(stats["max_depth_seen"], 8)
+        self.assertEqual(stats["rejected"], 0)
+
+    def test_overloaded_queue_rejects_with_retry_after(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        queue = WorkQueue(workers=1, max_depth=1)
+        running = queue.submit("other", 0, release.wait, 10)
+        while not running.started:
+            time.sleep(0.01)
+        queue.submit("other", 1, release.wait, 10)
+
+        with patch.object(work_queue, "_queue", queue):
+            app = self.run_session(["CS18000"])
+
+        self.assertEqual(len(app.error), 1)
+        self.assertIn("try again in about", app.error[0].value)
+
+
+if __name__ == "__main__":
+    unittest.main()
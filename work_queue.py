@@ -0,0 +1,185 @@
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+
+DEFAULT_WORKERS = 2
+DEFAULT_MAX_DEPTH = 32
+# Assumed job length before any job has finished, for retry-after estimates.
+_INITIAL_JOB_SECONDS = 1.0
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+class Overloaded(RuntimeError):
+    """
+    The queue is full. `retry_after` estimates in seconds when a slot frees up.
+    """
+
+    def __init__(self, retry_after):
+        super().__init__(f"work queue is full; retry after {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+class Ticket:
+    """
+    Handle for a submitted job: its place in line, and later its result.
+    """
+
+    def __init__(self, work_queue, session_id, key, fn, args, kwargs):
+        self._queue = work_queue
+        self.session_id = session_id
+        self.key = key
+        self._fn = fn
+        self._args = args
+        self._kwargs = kwargs
+        self._done = threading.Event()
+        self._result = None
+        self._error = None
+        self.started = False
+
+    def position(self):
+        """
+        Place in line among waiting jobs (1 starts next); 0 once it is running
+        or done.
+        """
+        return self._queue._position(self)
+
+    def done(self):
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        return self._done.wait(timeout)
+
+    def result(self, timeout=None):
+        if not self._done.wait(timeout):
+            raise TimeoutError("job did not finish in time")
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+    def _run(self):
+        try:
+            self._result = self._fn(*self._args, **self._kwargs)
+        except Exception as exc:
+            self._error = exc
+        finally:
+            self._done.set()
+
+
+class WorkQueue:
+    """
+    Bounded pool that every session submits optimization jobs to.
+
+    At most `workers` jobs run at once and at most `max_depth` wait; beyond
+    that `submit` raises Overloaded with a retry-after estimate. Waiting jobs
+    are scheduled round-robin across sessions, so one session queueing several
+    jobs cannot starve the others. Resubmitting a job a session already has
+    waiting or running (e.g. after a Streamlit rerun) returns the same ticket.
+    """
+
+    def __init__(self, workers=DEFAULT_WORKERS, max_depth=DEFAULT_MAX_DEPTH):
+        self.workers = workers
+        self.max_depth = max_depth
+        self._lock = threading.Condition()
+        self._waiting = OrderedDict()
+        self._tickets = {}
+        self._depth = 0
+        self._running = 0
+        self._stats = {"submitted": 0, "completed": 0, "rejected": 0, "max_depth_seen": 0}
+        self._job_seconds = None
+        self._threads = [
+            threading.Thread(target=self._work, name=f"optimize-worker-{idx}", daemon=True)
+            for idx in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, session_id, key, fn, *args, **kwargs):
+        with self._lock:
+            existing = self._tickets.get((session_id, key))
+            if existing is not None:
+                return existing
+            if self._depth >= self.max_depth:
+                self._stats["rejected"] += 1
+                raise Overloaded(self._retry_after())
+            ticket = Ticket(self, session_id, key, fn, args, kwargs)
+            self._tickets[(session_id, key)] = ticket
+            self._waiting.setdefault(session_id, deque()).append(ticket)
+            self._depth += 1
+            self._stats["submitted"] += 1
+            self._stats["max_depth_seen"] = max(self._stats["max_depth_seen"], self._depth)
+            self._lock.notify()
+            return ticket
+
+    def _retry_after(self):
+        job_seconds = self._job_seconds or _INITIAL_JOB_SECONDS
+        return job_seconds * (self._depth + self._running) / self.workers
+
+    def _next(self):
+        # Round-robin: take the oldest job of the session at the head of the
+        # rotation, then move that session to the back.
+        session_id, jobs = next(iter(self._waiting.items()))
+        ticket = jobs.popleft()
+        if jobs:
+            self._waiting.move_to_end(session_id)
+        else:
+            del self._waiting[session_id]
+        return ticket
+
+    def _position(self, ticket):
+        with self._lock:
+            if ticket.started or ticket.done():
+                return 0
+            # Replay the round-robin order until this ticket comes up.
+            sessions = [list(jobs) for jobs in self._waiting.values()]
+            position = 0
+            rounds = max((len(jobs) for jobs in sessions), default=0)
+            for turn in range(rounds):
+                for jobs in sessions:
+                    if turn < len(jobs):
+                        position += 1
+                        if jobs[turn] is ticket:
+                            return position
+            return 0
+
+    def _work(self):
+        while True:
+            with self._lock:
+                while not self._waiting:
+                    self._lock.wait()
+                ticket = self._next()
+                ticket.started = True
+                self._depth -= 1
+                self._running += 1
+            started = time.perf_counter()
+            ticket._run()
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._running -= 1
+                self._stats["completed"] += 1
+                del self._tickets[(ticket.session_id, ticket.key)]
+                # Smoothed job length keeps retry-after estimates current.
+                self._job_seconds = elapsed if self._job_seconds is None else 0.8 * self._job_seconds + 0.2 * elapsed
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update(depth=self._depth, running=self._running, workers=self.workers, max_depth=self.max_depth)
+            return stats
+
+
+def get_work_queue():
+    """
+    Return the process-wide queue, sized by MINOR_OPTIMIZER_WORKERS and
+    MINOR_OPTIMIZER_QUEUE_DEPTH.
+    """
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = WorkQueue(
+                workers=int(os.environ.get("MINOR_OPTIMIZER_WORKERS", DEFAULT_WORKERS)),
+                max_depth=int(os.environ.get("MINOR_OPTIMIZER_QUEUE_DEPTH", DEFAULT_MAX_DEPTH)),
+            )
+        return _queue